@@ -11,7 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.config import settings
 from app.database import Base
-from app.models import User, FoodLog  # Import all models
+from app.models import User, FoodLog, DailyNutritionTotal, IdempotencyKey, FoodLogTombstone  # Import all models
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
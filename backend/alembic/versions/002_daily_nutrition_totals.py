@@ -0,0 +1,49 @@
+"""Daily nutrition totals rollup
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create daily_nutrition_totals table
+    op.create_table(
+        'daily_nutrition_totals',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_calories', sa.DECIMAL(precision=12, scale=2), nullable=False, server_default='0'),
+        sa.Column('total_protein_g', sa.DECIMAL(precision=11, scale=2), nullable=False, server_default='0'),
+        sa.Column('total_carbs_g', sa.DECIMAL(precision=11, scale=2), nullable=False, server_default='0'),
+        sa.Column('total_fats_g', sa.DECIMAL(precision=11, scale=2), nullable=False, server_default='0'),
+        sa.Column('entries_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # Backfill from the existing food logs
+    op.execute(
+        """
+        INSERT INTO daily_nutrition_totals
+            (user_id, day, total_calories, total_protein_g, total_carbs_g,
+             total_fats_g, entries_count)
+        SELECT user_id, DATE(logged_at), SUM(calories), COALESCE(SUM(protein_g), 0),
+               COALESCE(SUM(carbs_g), 0), COALESCE(SUM(fats_g), 0), COUNT(id)
+        FROM food_logs
+        GROUP BY user_id, DATE(logged_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    # Drop daily_nutrition_totals table
+    op.drop_table('daily_nutrition_totals')
@@ -0,0 +1,73 @@
+"""Full-text index on food log names
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+# SQLite: contentless FTS5 table keyed by user_id * 2^32 + id, kept in sync
+# by triggers (same DDL as app.models.food_log.FOOD_LOGS_FTS_DDL)
+SQLITE_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE food_logs_fts USING fts5(
+        food_name, content='',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER food_logs_fts_insert AFTER INSERT ON food_logs BEGIN
+        INSERT INTO food_logs_fts (rowid, food_name)
+        VALUES (new.user_id * 4294967296 + new.id, new.food_name);
+    END
+    """,
+    """
+    CREATE TRIGGER food_logs_fts_delete AFTER DELETE ON food_logs BEGIN
+        INSERT INTO food_logs_fts (food_logs_fts, rowid, food_name)
+        VALUES ('delete', old.user_id * 4294967296 + old.id, old.food_name);
+    END
+    """,
+    """
+    CREATE TRIGGER food_logs_fts_update AFTER UPDATE OF food_name ON food_logs BEGIN
+        INSERT INTO food_logs_fts (food_logs_fts, rowid, food_name)
+        VALUES ('delete', old.user_id * 4294967296 + old.id, old.food_name);
+        INSERT INTO food_logs_fts (rowid, food_name)
+        VALUES (new.user_id * 4294967296 + new.id, new.food_name);
+    END
+    """,
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        # Create FTS5 table and index the existing food logs
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        op.execute(
+            """
+            INSERT INTO food_logs_fts (rowid, food_name)
+            SELECT user_id * 4294967296 + id, food_name FROM food_logs
+            """
+        )
+    else:
+        # Create FULLTEXT index on food_name
+        op.create_index('ix_food_logs_food_name_fulltext', 'food_logs', ['food_name'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        # Drop FTS5 table and its triggers
+        for trigger in ('food_logs_fts_insert', 'food_logs_fts_delete', 'food_logs_fts_update'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS food_logs_fts')
+    else:
+        # Drop FULLTEXT index
+        op.drop_index('ix_food_logs_food_name_fulltext', table_name='food_logs')
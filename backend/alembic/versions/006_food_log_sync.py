@@ -0,0 +1,39 @@
+"""Food log change feed and tombstones
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Index the change feed of food_logs
+    op.create_index('ix_food_logs_user_updated_at', 'food_logs', ['user_id', 'updated_at', 'id'], unique=False)
+
+    # Create food_log_tombstones table
+    op.create_table(
+        'food_log_tombstones',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('food_log_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_food_log_tombstones_user_deleted_at', 'food_log_tombstones', ['user_id', 'deleted_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop food_log_tombstones table and the change feed index
+    op.drop_index('ix_food_log_tombstones_user_deleted_at', table_name='food_log_tombstones')
+    op.drop_table('food_log_tombstones')
+    op.drop_index('ix_food_logs_user_updated_at', table_name='food_logs')
@@ -0,0 +1,71 @@
+"""Monthly RANGE partitioning of food_logs
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+from app.config import settings
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partitioned(bind):
+    return bind.scalar(sa.text(
+        "SELECT COUNT(*) FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'food_logs' "
+        "AND PARTITION_NAME IS NOT NULL"
+    )) > 0
+
+
+def upgrade() -> None:
+    # Opt-in (FOOD_LOGS_PARTITIONED), MySQL only
+    bind = op.get_bind()
+    if bind.dialect.name not in ('mysql', 'mariadb') or not settings.FOOD_LOGS_PARTITIONED:
+        return
+
+    # Partitioned InnoDB tables support neither foreign keys nor FULLTEXT
+    # indexes, and every unique key must include the partitioning column
+    for foreign_key in sa.inspect(bind).get_foreign_keys('food_logs'):
+        op.drop_constraint(foreign_key['name'], 'food_logs', type_='foreignkey')
+    op.drop_index('ix_food_logs_food_name_fulltext', table_name='food_logs')
+    op.execute('ALTER TABLE food_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id, logged_at)')
+
+    # One partition per month from the oldest entry to PARTITION_MONTHS_AHEAD
+    # months from now (pYYYYMM), and pmax for anything later
+    oldest = bind.scalar(sa.text('SELECT MIN(logged_at) FROM food_logs'))
+    today = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest is not None else today
+    last = _add_months(today, settings.PARTITION_MONTHS_AHEAD)
+    partitions = []
+    while month <= last:
+        partitions.append(
+            f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    partitions.append('PARTITION pmax VALUES LESS THAN (MAXVALUE)')
+    op.execute(f"ALTER TABLE food_logs PARTITION BY RANGE COLUMNS(logged_at) ({', '.join(partitions)})")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name not in ('mysql', 'mariadb') or not _partitioned(bind):
+        return
+
+    # Merge the partitions back and restore the keys and FULLTEXT index
+    op.execute('ALTER TABLE food_logs REMOVE PARTITIONING')
+    op.execute('ALTER TABLE food_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id)')
+    op.create_index('ix_food_logs_food_name_fulltext', 'food_logs', ['food_name'], mysql_prefix='FULLTEXT')
+    op.create_foreign_key(None, 'food_logs', 'users', ['user_id'], ['id'], ondelete='CASCADE')
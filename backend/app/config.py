@@ -1,6 +1,6 @@
 """Application configuration using Pydantic Settings"""
 
-from typing import List
+from typing import List, Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -19,11 +19,84 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DATABASE: str
+    # Use the asyncio engine (aiomysql) instead of the blocking pymysql one
+    DB_ASYNC: bool = False
 
     # Security
     SECRET_KEY: str = "change-me-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Verified JWT payloads kept in memory until each token's exp
+    TOKEN_CACHE_MAX_SIZE: int = 50000
+
+    # Authenticated-user identity cache (per worker)
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 30
+
+    # Per-user data version cache behind ETags (per worker)
+    DATA_VERSION_CACHE_MAX_SIZE: int = 10000
+    DATA_VERSION_CACHE_TTL_SECONDS: int = 2
+
+    # Password hashing process pool
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_DEPTH: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Idempotency-Key support for create endpoints: "memory" (per worker)
+    # or "database" (idempotency_keys table, shared by all workers)
+    IDEMPOTENCY_STORE: Literal["memory", "database"] = "memory"
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_MAX_KEYS: int = 100000
+    # How long a duplicate waits for the first request before a 409
+    IDEMPOTENCY_WAIT_SECONDS: int = 10
+
+    # Render responses with orjson instead of the default encoders
+    ORJSON_RESPONSES: bool = False
+
+    # Nutrition
+    FOOD_LOG_BULK_MAX_ITEMS: int = 5000
+    # Group commit: queue single creates and write them in one transaction
+    # once MAX_ROWS are queued or MAX_DELAY_MS after the first one
+    FOOD_LOG_GROUP_COMMIT: bool = False
+    FOOD_LOG_GROUP_COMMIT_MAX_ROWS: int = 200
+    FOOD_LOG_GROUP_COMMIT_MAX_DELAY_MS: int = 5
+    SUMMARY_MAX_DAYS: int = 731
+    TRENDS_MAX_DAYS: int = 1830
+    # Computed trends kept per user and data version (per worker)
+    TRENDS_CACHE_MAX_SIZE: int = 2000
+    TRENDS_CACHE_TTL_SECONDS: int = 600
+    # Daily targets memoized per user (per worker)
+    TARGETS_CACHE_MAX_SIZE: int = 10000
+    TARGETS_CACHE_TTL_SECONDS: int = 3600
+    # Dashboard sections cached per user and data version (per worker)
+    DASHBOARD_CACHE_MAX_SIZE: int = 10000
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    # Delta sync: rows stamped in the last SYNC_SETTLE_SECONDS wait for the
+    # next sync (longer than any write transaction); tombstones are kept
+    # for SYNC_TOMBSTONE_RETENTION_DAYS, older tokens need a full sync
+    SYNC_SETTLE_SECONDS: int = 2
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 90
+    SYNC_MAX_LIMIT: int = 1000
+    # food_logs is partitioned by month (migration 007, MySQL only; drops
+    # the FULLTEXT index, search falls back to a scan) with partitions
+    # created PARTITION_MONTHS_AHEAD months in advance
+    FOOD_LOGS_PARTITIONED: bool = False
+    PARTITION_MONTHS_AHEAD: int = 3
+    # Archive tier: months older than ARCHIVE_AFTER_MONTHS are moved to
+    # compressed files in ARCHIVE_DIR (disabled when unset); loaded month
+    # files are cached per worker
+    ARCHIVE_DIR: Optional[str] = None
+    ARCHIVE_AFTER_MONTHS: int = 24
+    ARCHIVE_CACHE_MONTHS: int = 12
+    ARCHIVE_CACHE_TTL_SECONDS: int = 3600
+    # Food name autocomplete indexes kept in memory (per worker)
+    SUGGEST_INDEX_MAX_USERS: int = 1000
+    SUGGEST_INDEX_TTL_SECONDS: int = 300
+
+    # Food catalog: CSV/JSON source, compiled into a memory-mapped index
+    # (default: the source path with an .idx suffix)
+    FOOD_CATALOG_PATH: Optional[str] = None
+    FOOD_CATALOG_INDEX_PATH: Optional[str] = None
 
     # CORS — stored as comma-separated string, parsed via property
     CORS_ORIGINS: str = "http://localhost:3000"
@@ -40,6 +113,14 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DATABASE}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Construct asyncio database URL from components"""
+        return (
+            f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}"
+            f"@{self.DB_HOST}:{self.DB_PORT}/{self.DATABASE}"
+        )
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,8 +1,11 @@
 """Database connection and session management"""
 
+from typing import Callable, Union
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
 
 # Create database engine with connection pooling
@@ -17,6 +20,26 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory, only built when DB_ASYNC is enabled so the
+# async driver is not required for the default (sync) deployment
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=5,
+        max_overflow=10,
+        echo=settings.DEBUG,
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+# Either flavour of session handed out by the database dependency
+AnySession = Union[Session, AsyncSession]
+
 # Base class for ORM models
 Base = declarative_base()
 
@@ -31,3 +54,85 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency function to get an asyncio database session.
+    Used instead of get_db when DB_ASYNC is enabled.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_session_factory() -> Callable[[], AnySession]:
+    """
+    Dependency returning the factory of new database sessions.
+
+    For endpoints that run independent queries concurrently, each on a
+    session (and pooled connection) of its own, through run_in_new_session.
+    """
+    return AsyncSessionLocal if settings.DB_ASYNC else SessionLocal
+
+
+async def run_in_session(db: AnySession, fn, *args, **kwargs):
+    """
+    Run a sync service function against either session flavour.
+
+    With an AsyncSession the function runs through ``run_sync`` so its queries
+    are awaited on the async driver; with a regular Session it runs in the
+    threadpool. Either way the event loop is never blocked on database I/O.
+
+    Args:
+        db: Sync or async database session
+        fn: Callable taking a sync Session as its first argument
+        *args: Positional arguments passed to fn
+        **kwargs: Keyword arguments passed to fn
+
+    Returns:
+        Whatever fn returns
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def release_connection(db: AnySession) -> None:
+    """
+    Return the session's connection to the pool ahead of slow non-DB work.
+
+    Objects already loaded stay readable; the session transparently checks a
+    connection out again on its next query.
+
+    Args:
+        db: Sync or async database session
+    """
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+
+async def run_in_new_session(
+    session_factory: Callable[[], AnySession], fn, *args, **kwargs
+):
+    """
+    Run a sync service function in a new session, closed afterwards.
+
+    Calls gathered with asyncio.gather each check out their own connection,
+    so their queries run concurrently.
+
+    Args:
+        session_factory: Factory from get_session_factory
+        fn: Callable taking a sync Session as its first argument
+        *args: Positional arguments passed to fn
+        **kwargs: Keyword arguments passed to fn
+
+    Returns:
+        Whatever fn returns
+    """
+    db = session_factory()
+    try:
+        return await run_in_session(db, fn, *args, **kwargs)
+    finally:
+        await release_connection(db)
@@ -1,19 +1,31 @@
 """FastAPI dependencies for dependency injection"""
 
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, Callable, Optional
+from fastapi import Depends, Header, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from jose import JWTError
 from app.config import settings
-from app.database import get_db
+from app.database import AnySession, get_async_db, get_db, get_session_factory
 from app.models.user import User
+from app.services.async_user_service import get_authenticated_user, get_data_version
+from app.utils.etag import etag_matches, make_etag
+from app.utils.security import decode_access_token
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-# Type alias for database session dependency
-DatabaseSession = Annotated[Session, Depends(get_db)]
+# Type alias for database session dependency (AsyncSession when DB_ASYNC is set)
+DatabaseSession = Annotated[
+    AnySession, Depends(get_async_db if settings.DB_ASYNC else get_db)
+]
+
+# Type alias for the factory of extra sessions, for concurrent queries
+SessionFactory = Annotated[Callable[[], AnySession], Depends(get_session_factory)]
+
+# Type alias for the optional Idempotency-Key header of create endpoints
+IdempotencyKey = Annotated[
+    Optional[str], Header(alias="Idempotency-Key", min_length=1, max_length=255)
+]
 
 # Type alias for token dependency
 Token = Annotated[str, Depends(oauth2_scheme)]
@@ -40,16 +52,14 @@ async def get_current_user(token: Token, db: DatabaseSession) -> User:
     )
 
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        payload = decode_access_token(token)
+        user_id = int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    # Served from the identity cache when hot; otherwise awaited through the
+    # session so the lookup never blocks the event loop
+    user = await get_authenticated_user(db, user_id)
     if user is None:
         raise credentials_exception
 
@@ -58,3 +68,40 @@ async def get_current_user(token: Token, db: DatabaseSession) -> User:
 
 # Type alias for current user dependency
 CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+async def check_not_modified(
+    request: Request, response: Response, current_user: CurrentUser, db: DatabaseSession
+) -> int:
+    """
+    Dependency for conditional GETs on the current user's data.
+
+    Sets the ETag of the response from the user's data version and
+    short-circuits with 304 Not Modified when If-None-Match matches it,
+    before the endpoint runs any query.
+
+    Args:
+        request: Incoming request
+        response: Response whose headers are being built
+        current_user: Current user from JWT token
+        db: Database session
+
+    Returns:
+        Current data version of the user
+
+    Raises:
+        HTTPException: 304 if the client's copy is current
+    """
+    data_version = await get_data_version(db, current_user.id)
+    etag = make_etag(current_user.id, data_version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return data_version
+
+
+# Type alias for the data version of a conditional GET
+DataVersion = Annotated[int, Depends(check_not_modified)]
@@ -1,17 +1,40 @@
 """Main FastAPI application"""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.config import settings
-from app.routes import auth, profile, nutrition
+from app.routes import auth, dashboard, profile, nutrition
+from app.services.catalog_service import close_catalog, get_catalog
+from app.utils import metrics
+from app.utils.password_pool import PasswordHashQueueFull, password_pool
+from app.utils.responses import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Map (compiling first only if the source changed) the food catalog
+    get_catalog()
+    yield
+    close_catalog()
+    password_pool.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Health Tracker API for nutrition tracking and user management",
+    lifespan=lifespan,
+    # Opt-in: an explicit response class turns off FastAPI's pydantic
+    # dump_json path for response_model routes, which is faster for them
+    default_response_class=(
+        ORJSONResponse if settings.ORJSON_RESPONSES else Default(JSONResponse)
+    ),
 )
 
 # Configure CORS
@@ -21,12 +44,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
+
+@app.exception_handler(PasswordHashQueueFull)
+async def password_hash_queue_full_handler(
+    request: Request, exc: PasswordHashQueueFull
+):
+    """Shed login/registration load fast instead of queueing behind bcrypt"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(profile.router)
 app.include_router(nutrition.router)
+app.include_router(dashboard.router)
 
 
 @app.get("/")
@@ -45,6 +83,12 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+def get_metrics():
+    """In-process performance counters"""
+    return metrics.snapshot()
+
+
 @app.get("/DEPLOY_INFO.txt")
 def deploy_info():
     """Serve deployment info for verification systems."""
@@ -2,5 +2,14 @@
 
 from app.models.user import User
 from app.models.food_log import FoodLog
+from app.models.daily_nutrition_total import DailyNutritionTotal
+from app.models.idempotency_key import IdempotencyKey
+from app.models.food_log_tombstone import FoodLogTombstone
 
-__all__ = ["User", "FoodLog"]
+__all__ = [
+    "User",
+    "FoodLog",
+    "DailyNutritionTotal",
+    "IdempotencyKey",
+    "FoodLogTombstone",
+]
@@ -0,0 +1,20 @@
+"""Daily nutrition totals rollup model"""
+
+from sqlalchemy import Column, Integer, Date, DECIMAL, ForeignKey
+from app.database import Base
+
+
+class DailyNutritionTotal(Base):
+    """Per-user, per-day sums of food_logs, maintained on every write"""
+
+    __tablename__ = "daily_nutrition_totals"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    total_calories = Column(DECIMAL(12, 2), nullable=False, default=0)
+    total_protein_g = Column(DECIMAL(11, 2), nullable=False, default=0)
+    total_carbs_g = Column(DECIMAL(11, 2), nullable=False, default=0)
+    total_fats_g = Column(DECIMAL(11, 2), nullable=False, default=0)
+    entries_count = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,16 @@
 """Food log database model"""
 
-from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey
+from sqlalchemy import (
+    DDL,
+    Column,
+    Integer,
+    String,
+    DECIMAL,
+    DateTime,
+    ForeignKey,
+    Index,
+    event,
+)
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -10,6 +20,17 @@ class FoodLog(Base):
     """Food log model for nutrition tracking"""
 
     __tablename__ = "food_logs"
+    __table_args__ = (
+        # Serves every per-user listing, summary and keyset page (InnoDB
+        # appends the primary key, so it also orders ties by id)
+        Index("ix_food_logs_user_logged_at", "user_id", "logged_at"),
+        # The change feed of GET /api/nutrition/sync
+        Index("ix_food_logs_user_updated_at", "user_id", "updated_at", "id"),
+        # Full-text search over food names (SQLite uses FOOD_LOGS_FTS_DDL)
+        Index(
+            "ix_food_logs_food_name_fulltext", "food_name", mysql_prefix="FULLTEXT"
+        ).ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(
@@ -28,3 +49,49 @@ class FoodLog(Base):
 
     # Relationships
     user = relationship("User", back_populates="food_logs")
+
+
+# SQLite full-text index: a contentless FTS5 table over food_logs.food_name,
+# kept in sync by triggers (migration 004). Its rowid is
+# user_id * FTS_USER_STRIDE + id, so one user's documents form a contiguous
+# rowid range that FTS5 seeks to instead of ranking every user's matches.
+FTS_USER_STRIDE = 2**32
+
+FOOD_LOGS_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE food_logs_fts USING fts5(
+        food_name, content='',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER food_logs_fts_insert AFTER INSERT ON food_logs BEGIN
+        INSERT INTO food_logs_fts (rowid, food_name)
+        VALUES (new.user_id * 4294967296 + new.id, new.food_name);
+    END
+    """,
+    """
+    CREATE TRIGGER food_logs_fts_delete AFTER DELETE ON food_logs BEGIN
+        INSERT INTO food_logs_fts (food_logs_fts, rowid, food_name)
+        VALUES ('delete', old.user_id * 4294967296 + old.id, old.food_name);
+    END
+    """,
+    """
+    CREATE TRIGGER food_logs_fts_update AFTER UPDATE OF food_name ON food_logs BEGIN
+        INSERT INTO food_logs_fts (food_logs_fts, rowid, food_name)
+        VALUES ('delete', old.user_id * 4294967296 + old.id, old.food_name);
+        INSERT INTO food_logs_fts (rowid, food_name)
+        VALUES (new.user_id * 4294967296 + new.id, new.food_name);
+    END
+    """,
+)
+
+for statement in FOOD_LOGS_FTS_DDL:
+    event.listen(
+        FoodLog.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    FoodLog.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS food_logs_fts").execute_if(dialect="sqlite"),
+)
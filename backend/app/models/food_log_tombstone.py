@@ -0,0 +1,24 @@
+"""Food log tombstone database model"""
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class FoodLogTombstone(Base):
+    """Record of a deleted food log, reported to syncing clients"""
+
+    __tablename__ = "food_log_tombstones"
+    __table_args__ = (
+        # The deletions feed of GET /api/nutrition/sync
+        Index("ix_food_log_tombstones_user_deleted_at", "user_id", "deleted_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    food_log_id = Column(Integer, nullable=False)
+    deleted_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,22 @@
+"""Idempotency key database model"""
+
+from sqlalchemy import BigInteger, Column, Integer, LargeBinary, String
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """First response of a write sent with an Idempotency-Key header"""
+
+    __tablename__ = "idempotency_keys"
+
+    # Who the key belongs to ("user:<id>", or the endpoint for anonymous ones)
+    scope = Column(String(64), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    # Keyed digest of the request body the response belongs to
+    fingerprint = Column(String(64), nullable=False)
+    # NULL while the first request is still running
+    status_code = Column(Integer, nullable=True)
+    media_type = Column(String(64), nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    # Unix time after which the key may be reused
+    expires_at = Column(BigInteger, nullable=False, index=True)
@@ -37,6 +37,8 @@ class User(Base):
     height_cm = Column(DECIMAL(5, 2), nullable=True)
     weight_kg = Column(DECIMAL(5, 2), nullable=True)
     activity_level = Column(Enum(ActivityLevelEnum), nullable=True)
+    # Bumped by every nutrition and profile write; drives ETags
+    data_version = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -2,10 +2,16 @@
 
 from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.dependencies import DatabaseSession, CurrentUser
+from app.dependencies import (
+    DatabaseSession,
+    CurrentUser,
+    IdempotencyKey,
+    SessionFactory,
+)
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.auth import TokenResponse
-from app.services.auth_service import register_user, login_user
+from app.services.async_auth_service import register_user, login_user
+from app.services.idempotency_service import idempotent_response
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
@@ -13,22 +19,44 @@ router = APIRouter(prefix="/api/auth", tags=["authentication"])
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-def register(user_data: UserCreate, db: DatabaseSession):
+async def register(
+    user_data: UserCreate,
+    db: DatabaseSession,
+    session_factory: SessionFactory,
+    idempotency_key: IdempotencyKey = None,
+):
     """
     Register a new user.
 
+    Retries sent with the same Idempotency-Key get the first response back
+    instead of a duplicate-email error.
+
     Args:
         user_data: User registration data
         db: Database session
+        session_factory: Factory of the key store's sessions
+        idempotency_key: Optional Idempotency-Key header
 
     Returns:
         Created user (excluding password)
     """
-    return register_user(db, user_data)
+    if idempotency_key is None:
+        return await register_user(db, user_data)
+    return await idempotent_response(
+        session_factory,
+        "register",
+        idempotency_key,
+        user_data,
+        lambda: register_user(db, user_data),
+        UserResponse,
+        status.HTTP_201_CREATED,
+    )
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: DatabaseSession = None):
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: DatabaseSession = None
+):
     """
     Login user and return JWT token.
 
@@ -39,11 +67,11 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: DatabaseSession
     Returns:
         Access token
     """
-    return login_user(db, form_data.username, form_data.password)
+    return await login_user(db, form_data.username, form_data.password)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: CurrentUser):
+async def get_current_user_info(current_user: CurrentUser):
     """
     Get current authenticated user information.
 
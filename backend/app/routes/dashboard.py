@@ -0,0 +1,40 @@
+"""Dashboard routes"""
+
+from datetime import date
+from fastapi import APIRouter, Query
+from app.database import release_connection
+from app.dependencies import CurrentUser, DatabaseSession, DataVersion, SessionFactory
+from app.schemas.dashboard import DashboardResponse
+from app.services.dashboard_service import get_dashboard
+
+router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard_page(
+    current_user: CurrentUser,
+    data_version: DataVersion,
+    db: DatabaseSession,
+    session_factory: SessionFactory,
+    date_param: date = Query(default=None, alias="date"),
+):
+    """
+    Get the whole dashboard in one response.
+
+    Answers If-None-Match with 304 while the user's data is unchanged.
+
+    Args:
+        current_user: Current user from JWT token
+        data_version: User's data version (ETag source, cache key)
+        db: Request session, released before the sections run
+        session_factory: Factory of the sessions the sections run in
+        date_param: The client's current day (default: today)
+
+    Returns:
+        Profile, targets, today's summary, recent entries and weekly totals
+    """
+    # The sections use sessions of their own; don't hold a fourth connection
+    await release_connection(db)
+    return await get_dashboard(
+        session_factory, current_user, date_param or date.today(), data_version
+    )
@@ -1,23 +1,57 @@
 """Nutrition tracking routes"""
 
-from fastapi import APIRouter, Query, status
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional, List
 from datetime import datetime, date
-from app.dependencies import DatabaseSession, CurrentUser
+from app.config import settings
+from app.dependencies import (
+    DatabaseSession,
+    CurrentUser,
+    DataVersion,
+    IdempotencyKey,
+    SessionFactory,
+    check_not_modified,
+)
 from app.schemas.food_log import (
     FoodLogCreate,
+    FoodLogBulkCreate,
+    FoodLogBulkCreateResponse,
+    FoodLogBulkUpdate,
+    FoodLogBulkDelete,
+    FoodLogBulkResult,
     FoodLogUpdate,
     FoodLogResponse,
     DailySummaryResponse,
+    RangeSummaryResponse,
+    TrendsResponse,
+    SyncResponse,
+    FoodSuggestion,
+    CatalogFoodResponse,
 )
-from app.services.nutrition_service import (
+from app.services.async_nutrition_service import (
     create_food_log,
+    create_food_log_grouped,
+    create_food_logs_bulk,
     get_food_logs,
-    get_food_log_by_id,
+    get_food_log_fields,
+    get_food_log_with_archive,
     update_food_log,
+    update_food_logs_bulk,
     delete_food_log,
+    delete_food_logs_bulk,
+    export_food_logs,
+    search_food_logs,
     get_daily_summary,
+    get_range_summary,
+    get_trends,
+    suggest_foods,
+    sync_food_logs,
 )
+from app.services import catalog_service
+from app.services.idempotency_service import idempotent_response
+from app.utils.pagination import encode_cursor
+from app.utils.responses import ORJSONResponse
 
 router = APIRouter(prefix="/api/nutrition", tags=["nutrition"])
 
@@ -25,51 +59,252 @@ router = APIRouter(prefix="/api/nutrition", tags=["nutrition"])
 @router.post(
     "/food-log", response_model=FoodLogResponse, status_code=status.HTTP_201_CREATED
 )
-def create_food_log_entry(
-    food_data: FoodLogCreate, current_user: CurrentUser, db: DatabaseSession
+async def create_food_log_entry(
+    food_data: FoodLogCreate,
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    session_factory: SessionFactory,
+    idempotency_key: IdempotencyKey = None,
 ):
     """
     Create a new food log entry.
 
+    With FOOD_LOG_GROUP_COMMIT the entry is written in a transaction shared
+    with other creates arriving within FOOD_LOG_GROUP_COMMIT_MAX_DELAY_MS.
+    Retries sent with the same Idempotency-Key get the first response back
+    instead of creating another entry.
+
     Args:
         food_data: Food log data
         current_user: Current user from JWT token
         db: Database session
+        session_factory: Factory of the group commit's and key store's sessions
+        idempotency_key: Optional Idempotency-Key header
 
     Returns:
         Created food log
     """
-    return create_food_log(db, current_user, food_data)
 
+    async def create():
+        if settings.FOOD_LOG_GROUP_COMMIT:
+            return await create_food_log_grouped(
+                session_factory, current_user, food_data
+            )
+        return await create_food_log(db, current_user, food_data)
+
+    if idempotency_key is None:
+        return await create()
+    return await idempotent_response(
+        session_factory,
+        f"user:{current_user.id}",
+        idempotency_key,
+        food_data,
+        create,
+        FoodLogResponse,
+        status.HTTP_201_CREATED,
+    )
+
+
+@router.post(
+    "/food-log/bulk",
+    response_model=FoodLogBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_food_log_entries_bulk(
+    bulk_data: FoodLogBulkCreate, current_user: CurrentUser, db: DatabaseSession
+):
+    """
+    Create many food log entries in one transaction.
+
+    Args:
+        bulk_data: Food log items and partial-failure mode
+        current_user: Current user from JWT token
+        db: Database session
+
+    Returns:
+        Generated ids aligned with the items, plus per-item errors
+    """
+    return await create_food_logs_bulk(db, current_user, bulk_data)
+
+
+@router.patch("/food-log/bulk", response_model=FoodLogBulkResult)
+async def update_food_log_entries_bulk(
+    bulk_data: FoodLogBulkUpdate, current_user: CurrentUser, db: DatabaseSession
+):
+    """
+    Apply the same changes to many food log entries.
+
+    Args:
+        bulk_data: Entries to update (ids and/or logged_at range) and changes
+        current_user: Current user from JWT token
+        db: Database session
+
+    Returns:
+        Number of entries updated
+    """
+    affected = await update_food_logs_bulk(db, current_user, bulk_data)
+    return FoodLogBulkResult(affected_count=affected)
+
+
+@router.post("/food-log/bulk-delete", response_model=FoodLogBulkResult)
+async def delete_food_log_entries_bulk(
+    bulk_data: FoodLogBulkDelete, current_user: CurrentUser, db: DatabaseSession
+):
+    """
+    Delete many food log entries.
+
+    Args:
+        bulk_data: Entries to delete (ids and/or logged_at range)
+        current_user: Current user from JWT token
+        db: Database session
+
+    Returns:
+        Number of entries deleted
+    """
+    affected = await delete_food_logs_bulk(db, current_user, bulk_data)
+    return FoodLogBulkResult(affected_count=affected)
 
-@router.get("/food-log", response_model=List[FoodLogResponse])
-def list_food_logs(
+
+@router.get(
+    "/food-log",
+    response_model=List[FoodLogResponse],
+    dependencies=[Depends(check_not_modified)],
+)
+async def list_food_logs(
     current_user: CurrentUser,
     db: DatabaseSession,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated response fields to return"
+    ),
 ):
     """
     Get list of food logs for current user.
 
+    A full page carries an X-Next-Cursor header; pass it back as `cursor`
+    to fetch the following page with an index seek instead of an offset.
+    With `fields`, only those columns are selected and returned.
+
     Args:
         current_user: Current user from JWT token
         db: Database session
-        skip: Number of records to skip
+        response: Response used to set the X-Next-Cursor header
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
         start_date: Filter by start date
         end_date: Filter by end date
+        cursor: Cursor returned with the previous page
+        fields: Comma-separated subset of the food log fields
 
     Returns:
         List of food logs
     """
-    return get_food_logs(db, current_user, skip, limit, start_date, end_date)
+    if fields:
+        rows, next_cursor = await get_food_log_fields(
+            db,
+            current_user,
+            [field.strip() for field in fields.split(",") if field.strip()],
+            skip,
+            limit,
+            start_date,
+            end_date,
+            cursor,
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        # Plain column values: bypass response model validation
+        return ORJSONResponse(rows, headers=response.headers)
+
+    food_logs = await get_food_logs(
+        db, current_user, skip, limit, start_date, end_date, cursor
+    )
+    if len(food_logs) == limit:
+        last = food_logs[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.logged_at, last.id)
+    return food_logs
+
+
+# Media types for each export format
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/food-log/export")
+async def export_food_log_history(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+):
+    """
+    Export the current user's full food log history.
+
+    Rows are streamed from a server-side cursor, so memory use does not grow
+    with the size of the history.
+
+    Args:
+        current_user: Current user from JWT token
+        db: Database session
+        export_format: "ndjson" (default) or "csv"
+        start_date: Filter by start date
+        end_date: Filter by end date
+
+    Returns:
+        Streaming NDJSON or CSV response
+    """
+    return StreamingResponse(
+        export_food_logs(db, current_user, export_format, start_date, end_date),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="food-log.{export_format}"'
+        },
+    )
+
+
+@router.get(
+    "/food-log/search",
+    response_model=List[FoodLogResponse],
+    dependencies=[Depends(check_not_modified)],
+)
+async def search_food_log_history(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Search the current user's food logs by name.
+
+    Served by the full-text index: every word of the query must start a word
+    of the food name, and hits are ranked by relevance, then newest first.
+
+    Args:
+        current_user: Current user from JWT token
+        db: Database session
+        q: Words to search for (case-insensitive)
+        skip: Number of hits to skip
+        limit: Maximum number of hits to return
+
+    Returns:
+        Matching food logs, most relevant first
+    """
+    return await search_food_logs(db, current_user, q, skip, limit)
 
 
-@router.get("/food-log/{food_log_id}", response_model=FoodLogResponse)
-def get_food_log(food_log_id: int, current_user: CurrentUser, db: DatabaseSession):
+@router.get(
+    "/food-log/{food_log_id}",
+    response_model=FoodLogResponse,
+    dependencies=[Depends(check_not_modified)],
+)
+async def get_food_log(
+    food_log_id: int, current_user: CurrentUser, db: DatabaseSession
+):
     """
     Get a specific food log entry.
 
@@ -81,11 +316,11 @@ def get_food_log(food_log_id: int, current_user: CurrentUser, db: DatabaseSessio
     Returns:
         Food log entry
     """
-    return get_food_log_by_id(db, current_user, food_log_id)
+    return await get_food_log_with_archive(db, current_user, food_log_id)
 
 
 @router.put("/food-log/{food_log_id}", response_model=FoodLogResponse)
-def update_food_log_entry(
+async def update_food_log_entry(
     food_log_id: int,
     food_data: FoodLogUpdate,
     current_user: CurrentUser,
@@ -103,11 +338,11 @@ def update_food_log_entry(
     Returns:
         Updated food log
     """
-    return update_food_log(db, current_user, food_log_id, food_data)
+    return await update_food_log(db, current_user, food_log_id, food_data)
 
 
 @router.delete("/food-log/{food_log_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_food_log_entry(
+async def delete_food_log_entry(
     food_log_id: int, current_user: CurrentUser, db: DatabaseSession
 ):
     """
@@ -118,11 +353,15 @@ def delete_food_log_entry(
         current_user: Current user from JWT token
         db: Database session
     """
-    delete_food_log(db, current_user, food_log_id)
+    await delete_food_log(db, current_user, food_log_id)
 
 
-@router.get("/daily-summary", response_model=DailySummaryResponse)
-def get_daily_nutrition_summary(
+@router.get(
+    "/daily-summary",
+    response_model=DailySummaryResponse,
+    dependencies=[Depends(check_not_modified)],
+)
+async def get_daily_nutrition_summary(
     current_user: CurrentUser,
     db: DatabaseSession,
     date_param: date = Query(default=None, alias="date"),
@@ -139,4 +378,147 @@ def get_daily_nutrition_summary(
         Daily nutrition summary
     """
     target_date = date_param or date.today()
-    return get_daily_summary(db, current_user, target_date)
+    return await get_daily_summary(db, current_user, target_date)
+
+
+@router.get(
+    "/summary",
+    response_model=RangeSummaryResponse,
+    dependencies=[Depends(check_not_modified)],
+)
+async def get_nutrition_range_summary(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    start: date,
+    end: date,
+    bucket: Literal["day", "week", "month"] = "day",
+):
+    """
+    Get nutrition totals for every day, week or month between two dates.
+
+    Args:
+        current_user: Current user from JWT token
+        db: Database session
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        bucket: Bucket size: day (default), week or month
+
+    Returns:
+        Totals per bucket, empty buckets included
+    """
+    return await get_range_summary(db, current_user, start, end, bucket)
+
+
+@router.get("/trends", response_model=TrendsResponse)
+async def get_nutrition_trends(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    data_version: DataVersion,
+    start: date,
+    end: date,
+):
+    """
+    Get rolling averages, macro split and day-over-day changes.
+
+    Args:
+        current_user: Current user from JWT token
+        db: Database session
+        data_version: Current data version of the user (ETag, cache key)
+        start: First day of the range
+        end: Last day of the range (inclusive)
+
+    Returns:
+        Per-day statistics and aggregates over the range
+    """
+    return await get_trends(db, current_user, start, end, data_version)
+
+
+@router.get("/sync", response_model=SyncResponse)
+async def sync_food_log_changes(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    since: Optional[str] = Query(None, description="next_token of the last sync"),
+    limit: int = Query(500, ge=1, le=settings.SYNC_MAX_LIMIT),
+):
+    """
+    Get the food logs created, updated or deleted since the last sync.
+
+    Args:
+        current_user: Current user from JWT token
+        db: Database session
+        since: Sync token; omit for a full sync
+        limit: Maximum number of changes and of deletions per page
+
+    Returns:
+        Changes, deleted ids, the next token and whether more pages follow
+    """
+    return await sync_food_logs(db, current_user, since, limit)
+
+
+@router.get("/foods/suggest", response_model=List[FoodSuggestion])
+async def suggest_food_names(
+    current_user: CurrentUser,
+    db: DatabaseSession,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Autocomplete food names from the current user's history.
+
+    Args:
+        current_user: Current user from JWT token
+        db: Database session
+        q: Prefix of any word of the food name (case-insensitive)
+        limit: Maximum number of suggestions
+
+    Returns:
+        Matching foods with their last-used macros, most used and recent first
+    """
+    return await suggest_foods(db, current_user, q, limit)
+
+
+@router.get("/catalog/search", response_model=List[CatalogFoodResponse])
+async def search_food_catalog(
+    current_user: CurrentUser,
+    q: str = Query(..., min_length=1, max_length=100),
+    exact: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Search the food catalog by name.
+
+    Args:
+        current_user: Current user from JWT token
+        q: Name prefix, or the full name with exact=true (case-insensitive)
+        exact: Match the whole name instead of a prefix
+        limit: Maximum number of foods
+
+    Returns:
+        Matching catalog foods with nutrients per serving
+    """
+    if exact:
+        return catalog_service.find_foods(q)[:limit]
+    return catalog_service.search_foods(q, limit)
+
+
+@router.get("/catalog/{catalog_id}", response_model=CatalogFoodResponse)
+async def get_catalog_food(catalog_id: int, current_user: CurrentUser):
+    """
+    Get a food catalog entry.
+
+    Args:
+        catalog_id: Catalog id
+        current_user: Current user from JWT token
+
+    Returns:
+        Catalog food with nutrients per serving
+
+    Raises:
+        HTTPException: If the id is not in the catalog
+    """
+    food = catalog_service.get_food(catalog_id)
+    if food is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Catalog food not found"
+        )
+    return food
@@ -1,29 +1,40 @@
 """User profile routes"""
 
-from fastapi import APIRouter
-from app.dependencies import DatabaseSession, CurrentUser
-from app.schemas.user import UserResponse, UserUpdate
-from app.services.user_service import update_user_profile
+from fastapi import APIRouter, HTTPException, status
+from app.dependencies import DatabaseSession, CurrentUser, DataVersion
+from app.schemas.user import NutritionTargets, UserResponse, UserUpdate
+from app.services import targets_service
+from app.services.async_user_service import get_user_by_id, update_user_profile
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
 
 @router.get("", response_model=UserResponse)
-def get_profile(current_user: CurrentUser):
+async def get_profile(
+    current_user: CurrentUser, data_version: DataVersion, db: DatabaseSession
+):
     """
     Get current user's profile.
 
+    Answers If-None-Match with 304 while the profile is unchanged.
+
     Args:
         current_user: Current user from JWT token
+        data_version: User's data version (ETag source)
+        db: Database session
 
     Returns:
         User profile
     """
+    # A cached identity older than the ETag's version (e.g. updated through
+    # another worker) must not be served under the new ETag
+    if current_user.data_version != data_version:
+        return await get_user_by_id(db, current_user.id)
     return current_user
 
 
 @router.put("", response_model=UserResponse)
-def update_profile(
+async def update_profile(
     user_data: UserUpdate, current_user: CurrentUser, db: DatabaseSession
 ):
     """
@@ -37,4 +48,35 @@ def update_profile(
     Returns:
         Updated user profile
     """
-    return update_user_profile(db, current_user, user_data)
+    return await update_user_profile(db, current_user, user_data)
+
+
+@router.get("/targets", response_model=NutritionTargets)
+async def get_profile_targets(
+    current_user: CurrentUser, data_version: DataVersion, db: DatabaseSession
+):
+    """
+    Get daily calorie and macro targets derived from the profile.
+
+    Args:
+        current_user: Current user from JWT token
+        data_version: User's data version (ETag source)
+        db: Database session
+
+    Returns:
+        BMR, maintenance calories and macro targets
+
+    Raises:
+        HTTPException: If age, height or weight is not set
+    """
+    user = current_user
+    if current_user.data_version != data_version:
+        user = await get_user_by_id(db, current_user.id)
+
+    targets = targets_service.get_targets(user)
+    if targets is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Set age, height and weight to get targets",
+        )
+    return targets
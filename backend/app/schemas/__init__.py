@@ -1,22 +1,54 @@
 """Pydantic schemas for request/response validation"""
 
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.schemas.user import (
+    UserCreate,
+    UserResponse,
+    UserUpdate,
+    NutritionTargets,
+)
 from app.schemas.auth import LoginRequest, TokenResponse
 from app.schemas.food_log import (
     FoodLogCreate,
+    FoodLogBulkCreate,
+    FoodLogBulkCreateResponse,
+    FoodLogBulkUpdate,
+    FoodLogBulkDelete,
+    FoodLogBulkResult,
     FoodLogUpdate,
     FoodLogResponse,
+    NutrientAmounts,
     DailySummaryResponse,
+    RangeSummaryResponse,
+    TrendDay,
+    TrendsResponse,
+    SyncResponse,
+    FoodSuggestion,
+    CatalogFoodResponse,
 )
+from app.schemas.dashboard import DashboardResponse
 
 __all__ = [
     "UserCreate",
     "UserResponse",
     "UserUpdate",
+    "NutritionTargets",
     "LoginRequest",
     "TokenResponse",
     "FoodLogCreate",
+    "FoodLogBulkCreate",
+    "FoodLogBulkCreateResponse",
+    "FoodLogBulkUpdate",
+    "FoodLogBulkDelete",
+    "FoodLogBulkResult",
     "FoodLogUpdate",
     "FoodLogResponse",
+    "NutrientAmounts",
     "DailySummaryResponse",
+    "RangeSummaryResponse",
+    "TrendDay",
+    "TrendsResponse",
+    "SyncResponse",
+    "FoodSuggestion",
+    "CatalogFoodResponse",
+    "DashboardResponse",
 ]
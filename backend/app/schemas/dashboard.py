@@ -0,0 +1,22 @@
+"""Dashboard schemas"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.food_log import (
+    DailySummaryResponse,
+    FoodLogResponse,
+    RangeSummaryResponse,
+)
+from app.schemas.user import NutritionTargets, UserResponse
+
+
+class DashboardResponse(BaseModel):
+    """Schema for everything the dashboard page renders, in one payload"""
+
+    profile: UserResponse
+    targets: Optional[NutritionTargets] = None
+    today: DailySummaryResponse
+    # Newest entries first
+    recent_entries: List[FoodLogResponse]
+    # Daily totals of the 7 days ending today
+    week: RangeSummaryResponse
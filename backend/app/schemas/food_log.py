@@ -1,9 +1,10 @@
 """Food log schemas for request/response validation"""
 
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from decimal import Decimal
+from app.config import settings
 
 
 class FoodLogBase(BaseModel):
@@ -18,9 +19,61 @@ class FoodLogBase(BaseModel):
 
 
 class FoodLogCreate(FoodLogBase):
-    """Schema for creating a food log entry"""
+    """
+    Schema for creating a food log entry.
 
-    pass
+    Either food_name and calories (plus optional macros) are given, or a
+    catalog_id whose nutrients per serving are multiplied by servings.
+    """
+
+    food_name: Optional[str] = Field(None, min_length=1, max_length=255)
+    calories: Optional[Decimal] = Field(
+        None, gt=0, description="Calories (must be positive)"
+    )
+    catalog_id: Optional[int] = Field(None, description="Food catalog id")
+    servings: Optional[Decimal] = Field(
+        None, gt=0, le=100, description="Servings of the catalog food (default 1)"
+    )
+
+    @model_validator(mode="after")
+    def require_nutrients_or_catalog(self):
+        if self.catalog_id is None:
+            if self.food_name is None or self.calories is None:
+                raise ValueError("food_name and calories are required")
+            if self.servings is not None:
+                raise ValueError("servings requires catalog_id")
+        elif self.model_fields_set & {"calories", "protein_g", "carbs_g", "fats_g"}:
+            raise ValueError("Nutrients are computed from the catalog food")
+        return self
+
+
+class FoodLogBulkCreate(BaseModel):
+    """Schema for creating many food log entries in one request"""
+
+    # Raw items, validated one by one as FoodLogCreate so that failures can be
+    # reported per item instead of rejecting the whole request body
+    items: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=settings.FOOD_LOG_BULK_MAX_ITEMS
+    )
+    allow_partial: bool = Field(
+        False, description="Store valid items and report the invalid ones"
+    )
+
+
+class FoodLogBulkItemError(BaseModel):
+    """Errors for one item of a bulk request"""
+
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class FoodLogBulkCreateResponse(BaseModel):
+    """Schema for bulk food log creation result"""
+
+    # Generated ids aligned with the request items (None where an item failed)
+    ids: List[Optional[int]]
+    created_count: int
+    errors: List[FoodLogBulkItemError] = []
 
 
 class FoodLogUpdate(BaseModel):
@@ -34,6 +87,41 @@ class FoodLogUpdate(BaseModel):
     logged_at: Optional[datetime] = None
 
 
+class FoodLogSelection(BaseModel):
+    """Selects the caller's food logs by id list and/or logged_at range"""
+
+    ids: Optional[List[int]] = Field(
+        None, min_length=1, max_length=settings.FOOD_LOG_BULK_MAX_ITEMS
+    )
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        """Refuse an empty selection, which would match every entry"""
+        if self.ids is None and self.start_date is None and self.end_date is None:
+            raise ValueError("Provide ids, start_date or end_date")
+        return self
+
+
+class FoodLogBulkUpdate(FoodLogSelection):
+    """Schema for applying the same changes to many food log entries"""
+
+    changes: FoodLogUpdate
+
+
+class FoodLogBulkDelete(FoodLogSelection):
+    """Schema for deleting many food log entries"""
+
+    pass
+
+
+class FoodLogBulkResult(BaseModel):
+    """Schema for bulk update/delete result"""
+
+    affected_count: int
+
+
 class FoodLogResponse(FoodLogBase):
     """Schema for food log response"""
 
@@ -45,6 +133,15 @@ class FoodLogResponse(FoodLogBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class NutrientAmounts(BaseModel):
+    """Schema for calories and macros relative to the daily targets"""
+
+    calories: Decimal
+    protein_g: Decimal
+    carbs_g: Decimal
+    fats_g: Decimal
+
+
 class DailySummaryResponse(BaseModel):
     """Schema for daily nutrition summary"""
 
@@ -54,3 +151,91 @@ class DailySummaryResponse(BaseModel):
     total_carbs_g: Decimal
     total_fats_g: Decimal
     entries_count: int
+    # Against the profile's daily targets; None if the profile is incomplete
+    remaining: Optional[NutrientAmounts] = None
+    percent_of_target: Optional[NutrientAmounts] = None
+
+
+class RangeSummaryResponse(BaseModel):
+    """Schema for nutrition totals over a date range, bucketed"""
+
+    start: str
+    end: str
+    bucket: str
+    # One entry per bucket, dated by the bucket's first day, empty ones zeroed
+    buckets: List[DailySummaryResponse]
+
+
+class TrendDay(BaseModel):
+    """Schema for one day of nutrition trends"""
+
+    date: str
+    entries_count: int
+    calories: float
+    protein_g: float
+    carbs_g: float
+    fats_g: float
+    # Mean calories of the logged days among the last 7/30 days
+    calories_avg_7d: Optional[float] = None
+    calories_avg_30d: Optional[float] = None
+    # Change in calories from the previous day
+    calories_change: float
+    # Share of macro energy (4/4/9 kcal per gram), None without macros
+    protein_pct: Optional[float] = None
+    carbs_pct: Optional[float] = None
+    fats_pct: Optional[float] = None
+
+
+class TrendsResponse(BaseModel):
+    """Schema for nutrition trends over a date range"""
+
+    start: str
+    end: str
+    logged_days: int
+    # Mean calories and macro split over the logged days of the range
+    avg_calories: Optional[float] = None
+    protein_pct: Optional[float] = None
+    carbs_pct: Optional[float] = None
+    fats_pct: Optional[float] = None
+    days: List[TrendDay]
+
+
+class SyncResponse(BaseModel):
+    """Schema for the food log changes since a sync token"""
+
+    # Entries created or updated since the token, oldest change first
+    changes: List[FoodLogResponse]
+    # Ids of entries deleted since the token
+    deleted_ids: List[int]
+    # Pass back as since; with has_more, immediately for the next page
+    next_token: str
+    has_more: bool
+
+
+class FoodSuggestion(BaseModel):
+    """Schema for a food name suggestion from the user's history"""
+
+    food_name: str
+    uses: int
+    last_used_at: datetime
+    # Macros of the most recent entry with this name
+    calories: Decimal
+    protein_g: Decimal
+    carbs_g: Decimal
+    fats_g: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CatalogFoodResponse(BaseModel):
+    """Schema for a food catalog entry (nutrients per serving)"""
+
+    id: int
+    name: str
+    serving: str
+    calories: Decimal
+    protein_g: Decimal
+    carbs_g: Decimal
+    fats_g: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
@@ -45,3 +45,13 @@ class UserResponse(UserBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NutritionTargets(BaseModel):
+    """Schema for daily calorie and macro targets derived from the profile"""
+
+    bmr: Decimal
+    calories: Decimal
+    protein_g: Decimal
+    carbs_g: Decimal
+    fats_g: Decimal
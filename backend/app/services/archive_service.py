@@ -0,0 +1,296 @@
+"""Archive tier: old months of food logs moved from the table to files"""
+
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+import os
+import threading
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.food_log import FoodLog
+from app.services import partition_service
+from app.services.partition_service import add_months, month_start
+from app.utils import food_log_archive, metrics
+from app.utils.cache import TTLCache
+from app.utils.food_log_archive import ArchivedMonth
+
+# Rows deleted per transaction when the month has no partition to drop
+DELETE_BATCH_SIZE = 5000
+# Rows fetched per round trip while writing a month's file
+ARCHIVE_FETCH_SIZE = 10000
+
+# Loaded month files (per worker); cleared whenever the directory changes
+loaded_months = TTLCache(
+    max_size=settings.ARCHIVE_CACHE_MONTHS,
+    ttl_seconds=settings.ARCHIVE_CACHE_TTL_SECONDS,
+)
+metrics.register("archive_months", loaded_months.stats)
+
+
+class _Listing:
+    """Archived months of ARCHIVE_DIR, re-read when its mtime changes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.key: Optional[Tuple[str, int]] = None
+        self.months: List[date] = []
+        # Smallest and largest id of each month, read on first id lookup
+        self.id_bounds: Dict[date, Tuple[int, int]] = {}
+
+
+_listing = _Listing()
+
+
+def archived_months() -> List[date]:
+    """
+    Months moved to the archive, oldest first.
+
+    One stat() per call; the directory is only listed again after a file
+    was added or replaced in it.
+    """
+    archive_dir = settings.ARCHIVE_DIR
+    if not archive_dir:
+        return []
+    try:
+        key = (archive_dir, os.stat(archive_dir).st_mtime_ns)
+    except FileNotFoundError:
+        return []
+    with _listing.lock:
+        if _listing.key != key:
+            _listing.months = food_log_archive.list_months(archive_dir)
+            _listing.id_bounds = {}
+            _listing.key = key
+            loaded_months.clear()
+        return _listing.months
+
+
+def horizon() -> Optional[datetime]:
+    """
+    Start of the hot tier: the end of the latest archived month.
+
+    Entries logged before it are read from the archive and the table is
+    only queried from it on, so reads never touch archived partitions.
+
+    Returns:
+        The horizon, or None if nothing is archived
+    """
+    months = archived_months()
+    if not months:
+        return None
+    end = add_months(months[-1], 1)
+    return datetime(end.year, end.month, end.day)
+
+
+def is_archived(logged_at: datetime) -> bool:
+    """Whether an entry logged at logged_at belongs to an archived month"""
+    bound = horizon()
+    return bound is not None and logged_at.replace(tzinfo=None) < bound
+
+
+def _path(month: date) -> str:
+    return os.path.join(settings.ARCHIVE_DIR, food_log_archive.month_file_name(month))
+
+
+def load_month(month: date) -> ArchivedMonth:
+    """A month's archive file, from the per-worker cache"""
+    archived = loaded_months.get(month)
+    if archived is None:
+        archived = ArchivedMonth(_path(month))
+        loaded_months.set(month, archived)
+    return archived
+
+
+def _naive(value: Optional[datetime]) -> Optional[datetime]:
+    return value.replace(tzinfo=None) if value is not None else None
+
+
+def _months_between(start: Optional[datetime], end: Optional[datetime]) -> List[date]:
+    """Archived months that may hold entries logged between start and end"""
+    return [
+        month
+        for month in archived_months()
+        if (start is None or month >= month_start(start))
+        and (end is None or month <= end.date())
+    ]
+
+
+def archived_food_logs(
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    before: Optional[Tuple[datetime, int]] = None,
+) -> List[dict]:
+    """
+    Get a page of a user's archived food logs, newest first.
+
+    Month files are visited newest first and only as far as the page
+    needs; within a file the user's rows are found by binary search.
+
+    Args:
+        user_id: User ID
+        skip: Number of archived entries to skip
+        limit: Maximum number of entries to return
+        start_date: Filter by start date
+        end_date: Filter by end date
+        before: Only entries before this (logged_at, id) keyset position
+
+    Returns:
+        Column values of each entry
+    """
+    start_date, end_date = _naive(start_date), _naive(end_date)
+    if before is not None:
+        before = (_naive(before[0]), before[1])
+        if end_date is None or before[0] < end_date:
+            end_date = before[0]
+
+    rows: List[dict] = []
+    for month in reversed(_months_between(start_date, end_date)):
+        archived = load_month(month)
+        positions = archived.select(user_id, start_date, end_date, before)[::-1]
+        if skip >= len(positions):
+            skip -= len(positions)
+            continue
+        rows.extend(archived.row(int(position)) for position in positions[skip:])
+        skip = 0
+        if len(rows) >= limit:
+            return rows[:limit]
+    return rows
+
+
+def get_archived_food_log(user_id: int, food_log_id: int) -> Optional[dict]:
+    """
+    Look up one archived food log of a user.
+
+    Only the months whose id range contains food_log_id are loaded.
+
+    Args:
+        user_id: Owner of the entry
+        food_log_id: Food log ID
+
+    Returns:
+        Column values of the entry, or None if it is not archived
+    """
+    for month in archived_months():
+        bounds = _listing.id_bounds.get(month)
+        if bounds is None:
+            bounds = ArchivedMonth.id_bounds(_path(month))
+            _listing.id_bounds[month] = bounds
+        if not bounds[0] <= food_log_id <= bounds[1]:
+            continue
+        archived = load_month(month)
+        positions = archived.select(user_id, food_log_id=food_log_id)
+        if len(positions):
+            return archived.row(int(positions[0]))
+    return None
+
+
+def archived_export_batches(
+    user_id: int,
+    columns: List[str],
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Iterator[List[tuple]]:
+    """
+    A user's archived food logs for an export, oldest first.
+
+    Files are read directly rather than through the cache, so an export of
+    a long history does not evict the months other requests page through.
+
+    Args:
+        user_id: User ID
+        columns: Column names of each output row
+        start_date: Filter by start date
+        end_date: Filter by end date
+
+    Yields:
+        One batch of rows per archived month with entries
+    """
+    start_date, end_date = _naive(start_date), _naive(end_date)
+    for month in _months_between(start_date, end_date):
+        archived = ArchivedMonth(_path(month))
+        positions = archived.select(user_id, start_date, end_date)
+        if len(positions):
+            yield [
+                tuple(archived.row(int(position))[column] for column in columns)
+                for position in positions
+            ]
+
+
+def archive_month(db: Session, month: date) -> int:
+    """
+    Move one month of food logs from the table to its archive file.
+
+    The file is written (atomically) before any row is removed; from then
+    on reads take the month from the file, since the horizon has moved
+    past it. The month's partition is then dropped, or, on a table without
+    it, the rows are deleted DELETE_BATCH_SIZE at a time. Daily totals and
+    sync tombstones are left alone: the entries still exist. Archived
+    entries are read-only.
+
+    Args:
+        db: Database session
+        month: First day of the month
+
+    Returns:
+        Number of entries archived
+    """
+    start = datetime(month.year, month.month, 1)
+    end = datetime.combine(add_months(month, 1), datetime.min.time())
+    in_month = [FoodLog.logged_at >= start, FoodLog.logged_at < end]
+
+    rows = db.execute(
+        select(FoodLog.__table__)
+        .where(*in_month)
+        .order_by(FoodLog.user_id, FoodLog.logged_at, FoodLog.id)
+        .execution_options(stream_results=True, yield_per=ARCHIVE_FETCH_SIZE)
+    ).mappings()
+    os.makedirs(settings.ARCHIVE_DIR, exist_ok=True)
+    count = food_log_archive.write_month(_path(month), rows)
+    db.commit()
+
+    if not partition_service.drop_partition(db, month):
+        while True:
+            ids = list(
+                db.scalars(select(FoodLog.id).where(*in_month).limit(DELETE_BATCH_SIZE))
+            )
+            if not ids:
+                break
+            db.execute(
+                delete(FoodLog)
+                .where(FoodLog.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+    return count
+
+
+def archive_old_months(db: Session, older_than_months: int) -> Dict[date, int]:
+    """
+    Archive every month that ended more than `older_than_months` ago.
+
+    Months are archived oldest first, so the horizon only moves forward.
+
+    Args:
+        db: Database session
+        older_than_months: Months, before the current one, kept in the table
+
+    Returns:
+        Entries archived per month
+    """
+    cutoff = add_months(month_start(date.today()), -older_than_months)
+    criteria = []
+    bound = horizon()
+    if bound is not None:
+        criteria.append(FoodLog.logged_at >= bound)
+    oldest = db.scalar(select(func.min(FoodLog.logged_at)).where(*criteria))
+    if isinstance(oldest, str):
+        oldest = datetime.fromisoformat(oldest)
+
+    archived = {}
+    month = month_start(oldest) if oldest is not None else cutoff
+    while month < cutoff:
+        archived[month] = archive_month(db, month)
+        month = add_months(month, 1)
+    return archived
@@ -0,0 +1,61 @@
+"""Async authentication service for registration and login"""
+
+from app.database import AnySession, release_connection, run_in_session
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.schemas.auth import TokenResponse
+from app.services import auth_service
+from app.utils.password_pool import password_pool
+
+
+async def register_user(db: AnySession, user_data: UserCreate) -> User:
+    """
+    Register a new user without blocking the event loop.
+
+    The email check and insert go through the session while bcrypt runs in
+    the dedicated password pool, off the event loop and the shared threadpool.
+
+    Args:
+        db: Database session
+        user_data: User registration data
+
+    Returns:
+        Created user
+
+    Raises:
+        HTTPException: If email already exists
+        PasswordHashQueueFull: If the password pool is saturated
+    """
+    await run_in_session(db, auth_service.ensure_email_available, user_data.email)
+    # Don't hold a pooled connection while waiting on bcrypt
+    await release_connection(db)
+    password_hash = await password_pool.hash_password(user_data.password)
+    return await run_in_session(db, auth_service.create_user, user_data, password_hash)
+
+
+async def login_user(db: AnySession, email: str, password: str) -> TokenResponse:
+    """
+    Login user and generate JWT token without blocking the event loop.
+
+    Args:
+        db: Database session
+        email: User email
+        password: Plain text password
+
+    Returns:
+        Token response with access token
+
+    Raises:
+        HTTPException: If credentials are invalid
+        PasswordHashQueueFull: If the password pool is saturated
+    """
+    user = await run_in_session(db, auth_service.get_user_by_email, email)
+    # Don't hold a pooled connection while waiting on bcrypt
+    await release_connection(db)
+
+    if not user or not await password_pool.verify_password(
+        password, user.password_hash
+    ):
+        raise auth_service.incorrect_credentials_error()
+
+    return auth_service.issue_access_token(user)
@@ -0,0 +1,257 @@
+"""Async nutrition service for food log CRUD and daily summary"""
+
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+from datetime import datetime, date
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import iterate_in_threadpool
+from app.config import settings
+from app.database import AnySession, run_in_session
+from app.models.food_log import FoodLog
+from app.models.user import User
+from app.schemas.food_log import (
+    FoodLogCreate,
+    FoodLogBulkCreate,
+    FoodLogBulkCreateResponse,
+    FoodLogBulkUpdate,
+    FoodLogBulkDelete,
+    FoodLogUpdate,
+    DailySummaryResponse,
+    RangeSummaryResponse,
+    SyncResponse,
+    TrendsResponse,
+)
+from app.services import (
+    nutrition_service,
+    search_service,
+    suggest_service,
+    sync_service,
+    trends_service,
+)
+from app.utils import metrics
+from app.utils.group_commit import GroupCommitBuffer
+
+# Single creates queued and committed together when FOOD_LOG_GROUP_COMMIT is on
+food_log_buffer = GroupCommitBuffer(
+    nutrition_service.create_food_logs_grouped,
+    max_rows=settings.FOOD_LOG_GROUP_COMMIT_MAX_ROWS,
+    max_delay_ms=settings.FOOD_LOG_GROUP_COMMIT_MAX_DELAY_MS,
+)
+metrics.register("food_log_group_commit", food_log_buffer.metrics)
+
+
+async def create_food_log(
+    db: AnySession, user: User, food_data: FoodLogCreate
+) -> FoodLog:
+    """Create a new food log entry (see nutrition_service.create_food_log)"""
+    return await run_in_session(db, nutrition_service.create_food_log, user, food_data)
+
+
+async def create_food_log_grouped(
+    session_factory: Callable[[], AnySession], user: User, food_data: FoodLogCreate
+) -> FoodLog:
+    """Create a food log entry in the next group commit (see food_log_buffer)"""
+    return await food_log_buffer.submit(session_factory, (user, food_data))
+
+
+async def create_food_logs_bulk(
+    db: AnySession, user: User, bulk_data: FoodLogBulkCreate
+) -> FoodLogBulkCreateResponse:
+    """Create many food log entries (see nutrition_service.create_food_logs_bulk)"""
+    return await run_in_session(
+        db, nutrition_service.create_food_logs_bulk, user, bulk_data
+    )
+
+
+async def get_food_logs(
+    db: AnySession,
+    user: User,
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> List[FoodLog]:
+    """Get food logs for a user (see nutrition_service.get_food_logs)"""
+    return await run_in_session(
+        db,
+        nutrition_service.get_food_logs,
+        user,
+        skip,
+        limit,
+        start_date,
+        end_date,
+        cursor,
+    )
+
+
+async def get_food_log_fields(
+    db: AnySession,
+    user: User,
+    fields: List[str],
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Get a projected page of food logs (see nutrition_service.get_food_log_fields)"""
+    return await run_in_session(
+        db,
+        nutrition_service.get_food_log_fields,
+        user,
+        fields,
+        skip,
+        limit,
+        start_date,
+        end_date,
+        cursor,
+    )
+
+
+async def get_food_log_with_archive(
+    db: AnySession, user: User, food_log_id: int
+) -> FoodLog:
+    """Get a food log by ID (see nutrition_service.get_food_log_with_archive)"""
+    return await run_in_session(
+        db, nutrition_service.get_food_log_with_archive, user, food_log_id
+    )
+
+
+async def update_food_log(
+    db: AnySession, user: User, food_log_id: int, food_data: FoodLogUpdate
+) -> FoodLog:
+    """Update a food log entry (see nutrition_service.update_food_log)"""
+    return await run_in_session(
+        db, nutrition_service.update_food_log, user, food_log_id, food_data
+    )
+
+
+async def delete_food_log(db: AnySession, user: User, food_log_id: int) -> None:
+    """Delete a food log entry (see nutrition_service.delete_food_log)"""
+    await run_in_session(db, nutrition_service.delete_food_log, user, food_log_id)
+
+
+async def update_food_logs_bulk(
+    db: AnySession, user: User, bulk_data: FoodLogBulkUpdate
+) -> int:
+    """Update many food log entries (see nutrition_service.update_food_logs_bulk)"""
+    return await run_in_session(
+        db, nutrition_service.update_food_logs_bulk, user, bulk_data
+    )
+
+
+async def delete_food_logs_bulk(
+    db: AnySession, user: User, bulk_data: FoodLogBulkDelete
+) -> int:
+    """Delete many food log entries (see nutrition_service.delete_food_logs_bulk)"""
+    return await run_in_session(
+        db, nutrition_service.delete_food_logs_bulk, user, bulk_data
+    )
+
+
+async def suggest_foods(
+    db: AnySession, user: User, query: str, limit: int = 10
+) -> List[suggest_service.FoodHistoryEntry]:
+    """
+    Suggest food names from the user's history.
+
+    A loaded index is searched on the event loop without touching the
+    database; otherwise it is built through the session first.
+
+    Args:
+        db: Database session
+        user: Current user
+        query: Prefix of any word of the food name
+        limit: Maximum number of suggestions
+
+    Returns:
+        Matching foods with their last-used macros, best first
+    """
+    index = suggest_service.get_cached_index(user.id)
+    if index is None:
+        index = await run_in_session(db, suggest_service.load_index, user.id)
+    return index.suggest(query, limit)
+
+
+async def search_food_logs(
+    db: AnySession, user: User, query: str, skip: int = 0, limit: int = 20
+) -> List[FoodLog]:
+    """Search food logs by name (see search_service.search_food_logs)"""
+    return await run_in_session(
+        db, search_service.search_food_logs, user, query, skip, limit
+    )
+
+
+async def export_food_logs(
+    db: AnySession,
+    user: User,
+    export_format: str = "ndjson",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a user's food log history (see nutrition_service.export_food_logs).
+
+    AsyncSessions stream from the async driver's server-side cursor; sync
+    sessions advance the sync generator in the threadpool one batch at a time.
+    """
+    if not isinstance(db, AsyncSession):
+        chunks = nutrition_service.export_food_logs(
+            db, user, export_format, start_date, end_date
+        )
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+        return
+
+    yield nutrition_service.export_header(export_format)
+    async for rows in iterate_in_threadpool(
+        nutrition_service.archived_export_batches(user, start_date, end_date)
+    ):
+        yield nutrition_service.format_export_rows(rows, export_format)
+    result = await db.stream(
+        nutrition_service.food_log_export_query(user, start_date, end_date)
+    )
+    async for rows in result.partitions():
+        yield nutrition_service.format_export_rows(rows, export_format)
+
+
+async def get_daily_summary(
+    db: AnySession, user: User, target_date: date
+) -> DailySummaryResponse:
+    """Get daily nutrition summary (see nutrition_service.get_daily_summary)"""
+    return await run_in_session(
+        db, nutrition_service.get_daily_summary, user, target_date
+    )
+
+
+async def get_range_summary(
+    db: AnySession, user: User, start: date, end: date, bucket: str = "day"
+) -> RangeSummaryResponse:
+    """Get bucketed totals for a range (see nutrition_service.get_range_summary)"""
+    return await run_in_session(
+        db, nutrition_service.get_range_summary, user, start, end, bucket
+    )
+
+
+async def sync_food_logs(
+    db: AnySession, user: User, since: Optional[str], limit: int
+) -> SyncResponse:
+    """Get food log changes since a token (see sync_service.sync_food_logs)"""
+    return await run_in_session(db, sync_service.sync_food_logs, user, since, limit)
+
+
+async def get_trends(
+    db: AnySession, user: User, start: date, end: date, data_version: int
+) -> TrendsResponse:
+    """
+    Get nutrition trends (see trends_service.get_trends).
+
+    Trends cached at the user's current data version are returned from the
+    event loop without touching the database.
+    """
+    trends = trends_service.get_cached_trends(user.id, data_version, start, end)
+    if trends is None:
+        trends = await run_in_session(
+            db, trends_service.get_trends, user, start, end, data_version
+        )
+    return trends
@@ -0,0 +1,77 @@
+"""Async user service for profile management"""
+
+from typing import Optional
+from app.database import AnySession, run_in_session
+from app.models.user import User
+from app.schemas.user import UserUpdate
+from app.services import user_service
+
+
+async def get_user_by_id(db: AnySession, user_id: int) -> Optional[User]:
+    """
+    Get user by ID.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
+    Returns:
+        User instance
+    """
+    return await run_in_session(db, user_service.get_user_by_id, user_id)
+
+
+async def get_authenticated_user(db: AnySession, user_id: int) -> Optional[User]:
+    """
+    Get the user for an authenticated request.
+
+    Cache hits are answered on the event loop without touching the database;
+    misses load the row through the session and populate the cache.
+
+    Args:
+        db: Database session
+        user_id: User ID from the access token
+
+    Returns:
+        Detached User instance, or None if the user does not exist
+    """
+    user = user_service.get_cached_user(user_id)
+    if user is not None:
+        return user
+    return await run_in_session(db, user_service.load_authenticated_user, user_id)
+
+
+async def get_data_version(db: AnySession, user_id: int) -> int:
+    """
+    Get a user's data version for conditional requests.
+
+    Cache hits are answered on the event loop without touching the database.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
+    Returns:
+        Current data version
+    """
+    version = user_service.get_cached_data_version(user_id)
+    if version is not None:
+        return version
+    return await run_in_session(db, user_service.load_data_version, user_id)
+
+
+async def update_user_profile(
+    db: AnySession, user: User, user_data: UserUpdate
+) -> User:
+    """
+    Update user profile.
+
+    Args:
+        db: Database session
+        user: User instance to update
+        user_data: New profile data
+
+    Returns:
+        Updated user instance
+    """
+    return await run_in_session(db, user_service.update_user_profile, user, user_data)
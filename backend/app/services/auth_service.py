@@ -6,34 +6,56 @@ from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.schemas.auth import TokenResponse
+from app.services.user_service import invalidate_cached_user
 from app.utils.security import hash_password, verify_password, create_access_token
 
 
-def register_user(db: Session, user_data: UserCreate) -> User:
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """
-    Register a new user.
+    Get user by email address.
 
     Args:
         db: Database session
-        user_data: User registration data
+        email: User email
 
     Returns:
-        Created user
+        User if found, None otherwise
+    """
+    return db.query(User).filter(User.email == email).first()
+
+
+def ensure_email_available(db: Session, email: str) -> None:
+    """
+    Ensure no user is registered with the given email.
+
+    Args:
+        db: Database session
+        email: Email to check
 
     Raises:
         HTTPException: If email already exists
     """
-    # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    if get_user_by_email(db, email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    # Create new user with hashed password
+
+def create_user(db: Session, user_data: UserCreate, password_hash: str) -> User:
+    """
+    Persist a new user with an already hashed password.
+
+    Args:
+        db: Database session
+        user_data: User registration data
+        password_hash: Bcrypt hash of the user's password
+
+    Returns:
+        Created user
+    """
     user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=password_hash,
         name=user_data.name,
         age=user_data.age,
         gender=user_data.gender,
@@ -45,10 +67,32 @@ def register_user(db: Session, user_data: UserCreate) -> User:
     db.add(user)
     db.commit()
     db.refresh(user)
+    invalidate_cached_user(user.id)
 
     return user
 
 
+def register_user(db: Session, user_data: UserCreate) -> User:
+    """
+    Register a new user.
+
+    Args:
+        db: Database session
+        user_data: User registration data
+
+    Returns:
+        Created user
+
+    Raises:
+        HTTPException: If email already exists
+    """
+    # Check if email already exists
+    ensure_email_available(db, user_data.email)
+
+    # Create new user with hashed password
+    return create_user(db, user_data, hash_password(user_data.password))
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user by email and password.
@@ -61,7 +105,7 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     Returns:
         User if authentication successful, None otherwise
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = get_user_by_email(db, email)
 
     if not user:
         return None
@@ -90,12 +134,30 @@ def login_user(db: Session, email: str, password: str) -> TokenResponse:
     user = authenticate_user(db, email, password)
 
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise incorrect_credentials_error()
+
+    return issue_access_token(user)
+
+
+def incorrect_credentials_error() -> HTTPException:
+    """Build the 401 raised for a failed login"""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 
+def issue_access_token(user: User) -> TokenResponse:
+    """
+    Generate a JWT access token for an authenticated user.
+
+    Args:
+        user: Authenticated user
+
+    Returns:
+        Token response with access token
+    """
     # Create access token with user ID as subject
     access_token = create_access_token(data={"sub": str(user.id)})
 
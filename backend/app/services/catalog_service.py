@@ -0,0 +1,109 @@
+"""Food catalog lookups and server-side macro computation"""
+
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional
+import threading
+from app.config import settings
+from app.utils.catalog_index import CatalogFood, CatalogIndex, open_catalog
+
+CENT = Decimal("0.01")
+
+_catalog: Optional[CatalogIndex] = None
+_catalog_lock = threading.Lock()
+
+
+def _index_path() -> Optional[str]:
+    """Configured index path, defaulting to the source path with .idx"""
+    if settings.FOOD_CATALOG_INDEX_PATH:
+        return settings.FOOD_CATALOG_INDEX_PATH
+    if settings.FOOD_CATALOG_PATH:
+        return str(Path(settings.FOOD_CATALOG_PATH).with_suffix(".idx"))
+    return None
+
+
+def get_catalog() -> Optional[CatalogIndex]:
+    """
+    Get the food catalog, opening (and if stale, compiling) it on first use.
+
+    Returns:
+        The catalog index, or None if no catalog is configured
+    """
+    global _catalog
+    if _catalog is None:
+        index_path = _index_path()
+        if index_path is None:
+            return None
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = open_catalog(settings.FOOD_CATALOG_PATH, index_path)
+    return _catalog
+
+
+def close_catalog() -> None:
+    """Unmap the catalog (it is reopened on next use)"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is not None:
+            _catalog.close()
+            _catalog = None
+
+
+def get_food(catalog_id: int) -> Optional[CatalogFood]:
+    """
+    Look up a catalog food by id.
+
+    Args:
+        catalog_id: Catalog id
+
+    Returns:
+        The food, or None if it is unknown or no catalog is configured
+    """
+    catalog = get_catalog()
+    return catalog.get(catalog_id) if catalog is not None else None
+
+
+def search_foods(query: str, limit: int = 20) -> List[CatalogFood]:
+    """
+    Find catalog foods by name prefix.
+
+    Args:
+        query: Name prefix (case-insensitive)
+        limit: Maximum number of foods
+
+    Returns:
+        Matching foods in name order
+    """
+    catalog = get_catalog()
+    return catalog.search(query, limit) if catalog is not None else []
+
+
+def find_foods(name: str) -> List[CatalogFood]:
+    """
+    Find catalog foods by exact name.
+
+    Args:
+        name: Food name (case-insensitive)
+
+    Returns:
+        Foods with that name
+    """
+    catalog = get_catalog()
+    return catalog.find(name) if catalog is not None else []
+
+
+def food_log_nutrients(food: CatalogFood, servings: Decimal) -> dict:
+    """
+    Nutrient values of a food log entry for a number of servings.
+
+    Args:
+        food: Catalog food
+        servings: Number of servings eaten
+
+    Returns:
+        calories, protein_g, carbs_g and fats_g rounded to two decimals
+    """
+    return {
+        field: (getattr(food, field) * servings).quantize(CENT)
+        for field in ("calories", "protein_g", "carbs_g", "fats_g")
+    }
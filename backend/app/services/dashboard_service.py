@@ -0,0 +1,91 @@
+"""Dashboard composed from independent sections queried concurrently"""
+
+from datetime import date, timedelta
+from typing import Callable, List
+import asyncio
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import AnySession, run_in_new_session
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse
+from app.schemas.food_log import FoodLogResponse
+from app.schemas.user import UserResponse
+from app.services import nutrition_service, targets_service
+from app.utils import metrics
+from app.utils.cache import TTLCache
+
+# Number of newest food log entries shown
+DASHBOARD_RECENT_ENTRIES = 10
+# Days of daily totals shown, ending today
+DASHBOARD_WEEK_DAYS = 7
+
+# Computed sections keyed by (user id, data version, section, day); a write
+# bumps the version, so entries are never stale and old ones age out LRU
+dashboard_cache = TTLCache(
+    max_size=settings.DASHBOARD_CACHE_MAX_SIZE,
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+)
+metrics.register("dashboard_cache", dashboard_cache.stats)
+
+
+def _recent_entries(db: Session, user: User, limit: int) -> List[FoodLogResponse]:
+    """Newest entries, converted while their session is still open"""
+    return [
+        FoodLogResponse.model_validate(food_log)
+        for food_log in nutrition_service.get_food_logs(db, user, 0, limit)
+    ]
+
+
+async def get_dashboard(
+    session_factory: Callable[[], AnySession],
+    user: User,
+    today: date,
+    data_version: int,
+) -> DashboardResponse:
+    """
+    Gather everything the dashboard renders.
+
+    Each section is cached under the user's data version. Sections that are
+    not cached are computed concurrently, each in a session of its own so
+    their queries run on separate pooled connections. The profile and
+    targets come from the current user without a query.
+
+    Args:
+        session_factory: Factory of new database sessions
+        user: Current user
+        today: The client's current day
+        data_version: Current data version of the user (cache key)
+
+    Returns:
+        Profile, targets, today's summary, recent entries and weekly totals
+    """
+    sections = {
+        "today": (nutrition_service.get_daily_summary, user, today),
+        "recent_entries": (_recent_entries, user, DASHBOARD_RECENT_ENTRIES),
+        "week": (
+            nutrition_service.get_range_summary,
+            user,
+            today - timedelta(days=DASHBOARD_WEEK_DAYS - 1),
+            today,
+        ),
+    }
+
+    results = {}
+    for name in sections:
+        cached = dashboard_cache.get((user.id, data_version, name, today))
+        if cached is not None:
+            results[name] = cached
+
+    missing = [name for name in sections if name not in results]
+    computed = await asyncio.gather(
+        *(run_in_new_session(session_factory, *sections[name]) for name in missing)
+    )
+    for name, section in zip(missing, computed):
+        dashboard_cache.set((user.id, data_version, name, today), section)
+        results[name] = section
+
+    return DashboardResponse(
+        profile=UserResponse.model_validate(user),
+        targets=targets_service.get_targets(user),
+        **results,
+    )
@@ -0,0 +1,349 @@
+"""Idempotency-Key support: replay the first response of a retried write"""
+
+from typing import Awaitable, Callable, NamedTuple, Optional, Type
+import asyncio
+import hashlib
+import hmac
+import time
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import AnySession, run_in_new_session
+from app.models.idempotency_key import IdempotencyKey
+from app.utils import metrics
+from app.utils.cache import TTLCache
+
+# Seconds between looks at a key whose first request is still running
+POLL_INTERVAL_SECONDS = 0.02
+# Marks a replayed response
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class StoredResponse(NamedTuple):
+    """A key's record; status_code is None until the first request finishes"""
+
+    fingerprint: str
+    status_code: Optional[int] = None
+    media_type: Optional[str] = None
+    body: Optional[bytes] = None
+
+
+SessionFactoryType = Callable[[], AnySession]
+
+
+class MemoryIdempotencyStore:
+    """Keys in a bounded per-worker TTL cache"""
+
+    def __init__(self, max_keys: int, ttl_seconds: int):
+        self.cache = TTLCache(max_size=max_keys, ttl_seconds=ttl_seconds)
+
+    async def claim(
+        self,
+        session_factory: SessionFactoryType,
+        scope: str,
+        key: str,
+        fingerprint: str,
+    ) -> bool:
+        """Take a free key for a first request; False if it is taken"""
+        # No await between the check and the set: atomic on the event loop
+        if self.cache.get((scope, key)) is not None:
+            return False
+        self.cache.set((scope, key), StoredResponse(fingerprint))
+        return True
+
+    async def get(
+        self, session_factory: SessionFactoryType, scope: str, key: str
+    ) -> Optional[StoredResponse]:
+        """Record of a key, or None if it is free"""
+        return self.cache.get((scope, key))
+
+    async def complete(
+        self,
+        session_factory: SessionFactoryType,
+        scope: str,
+        key: str,
+        response: StoredResponse,
+    ) -> None:
+        """Store the first request's response"""
+        self.cache.set((scope, key), response)
+
+    async def release(
+        self, session_factory: SessionFactoryType, scope: str, key: str
+    ) -> None:
+        """Free a key whose first request failed"""
+        self.cache.invalidate((scope, key))
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+def _claim_row(
+    db: Session, scope: str, key: str, fingerprint: str, ttl_seconds: int
+) -> bool:
+    """Insert a pending row, first dropping an expired one for the same key"""
+    now = int(time.time())
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at <= now,
+        )
+    )
+    db.add(
+        IdempotencyKey(
+            scope=scope,
+            key=key,
+            fingerprint=fingerprint,
+            expires_at=now + ttl_seconds,
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+
+def _get_row(db: Session, scope: str, key: str) -> Optional[StoredResponse]:
+    """Unexpired record of a key"""
+    row = db.execute(
+        select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.status_code,
+            IdempotencyKey.media_type,
+            IdempotencyKey.body,
+        ).where(
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > int(time.time()),
+        )
+    ).first()
+    return StoredResponse(*row) if row is not None else None
+
+
+def _complete_row(db: Session, scope: str, key: str, response: StoredResponse) -> None:
+    """Store the response on the pending row"""
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+        .values(
+            status_code=response.status_code,
+            media_type=response.media_type,
+            body=response.body,
+        )
+    )
+    db.commit()
+
+
+def _delete_row(db: Session, scope: str, key: str) -> None:
+    """Drop a key's row"""
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.scope == scope, IdempotencyKey.key == key
+        )
+    )
+    db.commit()
+
+
+def purge_expired_keys(db: Session) -> int:
+    """
+    Delete expired idempotency_keys rows.
+
+    Expired keys are never replayed and are replaced on reuse, so this only
+    reclaims space.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of rows deleted
+    """
+    result = db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= int(time.time()))
+    )
+    db.commit()
+    return result.rowcount
+
+
+class DatabaseIdempotencyStore:
+    """
+    Keys in the idempotency_keys table, shared by every worker.
+
+    The first request claims its key by inserting a pending row; the primary
+    key makes concurrent claims of the same key fail in every other worker.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    async def claim(
+        self,
+        session_factory: SessionFactoryType,
+        scope: str,
+        key: str,
+        fingerprint: str,
+    ) -> bool:
+        """Take a free key for a first request; False if it is taken"""
+        return await run_in_new_session(
+            session_factory, _claim_row, scope, key, fingerprint, self.ttl_seconds
+        )
+
+    async def get(
+        self, session_factory: SessionFactoryType, scope: str, key: str
+    ) -> Optional[StoredResponse]:
+        """Record of a key, or None if it is free"""
+        return await run_in_new_session(session_factory, _get_row, scope, key)
+
+    async def complete(
+        self,
+        session_factory: SessionFactoryType,
+        scope: str,
+        key: str,
+        response: StoredResponse,
+    ) -> None:
+        """Store the first request's response"""
+        await run_in_new_session(session_factory, _complete_row, scope, key, response)
+
+    async def release(
+        self, session_factory: SessionFactoryType, scope: str, key: str
+    ) -> None:
+        """Free a key whose first request failed"""
+        await run_in_new_session(session_factory, _delete_row, scope, key)
+
+    def stats(self) -> dict:
+        return {}
+
+
+# Store selected by IDEMPOTENCY_STORE
+idempotency_store = (
+    DatabaseIdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS)
+    if settings.IDEMPOTENCY_STORE == "database"
+    else MemoryIdempotencyStore(
+        settings.IDEMPOTENCY_MAX_KEYS, settings.IDEMPOTENCY_TTL_SECONDS
+    )
+)
+
+# Outcomes of requests sent with a key
+counters = {"executed": 0, "replayed": 0, "waited": 0, "conflicts": 0}
+
+
+def _metrics() -> dict:
+    return {**counters, "store": idempotency_store.stats()}
+
+
+metrics.register("idempotency", _metrics)
+
+
+def fingerprint(payload: BaseModel) -> str:
+    """
+    Digest of a validated request body.
+
+    Keyed with SECRET_KEY, since bodies may contain passwords.
+
+    Args:
+        payload: Request body model
+
+    Returns:
+        Hex HMAC-SHA256 of the body's JSON
+    """
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        payload.model_dump_json(warnings=False).encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def _replay(stored: StoredResponse, request_fingerprint: str) -> Response:
+    """The stored response, unless the key was sent with another body"""
+    if not hmac.compare_digest(stored.fingerprint, request_fingerprint):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request",
+        )
+    counters["replayed"] += 1
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type=stored.media_type,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+async def idempotent_response(
+    session_factory: SessionFactoryType,
+    scope: str,
+    key: str,
+    payload: BaseModel,
+    run: Callable[[], Awaitable],
+    response_model: Type[BaseModel],
+    status_code: int,
+) -> Response:
+    """
+    Run a write once per idempotency key and replay its response afterwards.
+
+    The first request with a key claims it, runs the write and stores the
+    rendered response for IDEMPOTENCY_TTL_SECONDS. Later requests with the
+    key get the stored bytes back without running anything. Requests
+    arriving while the first one runs wait for it, up to
+    IDEMPOTENCY_WAIT_SECONDS. If the write raises, the key is freed and the
+    error is not stored, so a retry runs the write again.
+
+    Args:
+        session_factory: Factory from get_session_factory (database store)
+        scope: Owner of the key, e.g. "user:<id>"
+        key: Idempotency-Key header value
+        payload: Validated request body, compared on replay
+        run: Performs the write and returns its result
+        response_model: Model the result is rendered with
+        status_code: Status code of a successful write
+
+    Returns:
+        The write's response, or the stored one
+
+    Raises:
+        HTTPException: 422 if the key was used with another body, 409 if its
+            first request is still running after the wait
+    """
+    request_fingerprint = fingerprint(payload)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    waited = False
+    while not await idempotency_store.claim(
+        session_factory, scope, key, request_fingerprint
+    ):
+        stored = await idempotency_store.get(session_factory, scope, key)
+        if stored is not None and stored.status_code is not None:
+            counters["waited"] += waited
+            return _replay(stored, request_fingerprint)
+        # Still running (or freed and about to be claimed again)
+        if time.monotonic() >= deadline:
+            counters["conflicts"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        waited = True
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    try:
+        result = await run()
+    except BaseException:
+        await idempotency_store.release(session_factory, scope, key)
+        raise
+
+    counters["executed"] += 1
+    stored = StoredResponse(
+        fingerprint=request_fingerprint,
+        status_code=status_code,
+        media_type="application/json",
+        body=response_model.model_validate(result).model_dump_json().encode(),
+    )
+    await idempotency_store.complete(session_factory, scope, key, stored)
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type=stored.media_type,
+    )
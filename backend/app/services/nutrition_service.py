@@ -1,19 +1,110 @@
 """Nutrition service for food log CRUD and daily summary"""
 
-from typing import List, Optional
-from datetime import datetime, date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, date, timedelta
 from decimal import Decimal
+import csv
+import io
+import json
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import Select, delete, func, insert, or_, select, update
+from sqlalchemy.exc import DBAPIError
 from fastapi import HTTPException, status
+from app.config import settings
 from app.models.food_log import FoodLog
 from app.models.user import User
-from app.schemas.food_log import FoodLogCreate, FoodLogUpdate, DailySummaryResponse
+from app.schemas.food_log import (
+    FoodLogCreate,
+    FoodLogBulkCreate,
+    FoodLogBulkCreateResponse,
+    FoodLogBulkItemError,
+    FoodLogBulkUpdate,
+    FoodLogBulkDelete,
+    FoodLogSelection,
+    FoodLogUpdate,
+    FoodLogResponse,
+    NutrientAmounts,
+    DailySummaryResponse,
+    RangeSummaryResponse,
+)
+from app.services import (
+    archive_service,
+    catalog_service,
+    rollup_service,
+    suggest_service,
+    sync_service,
+    targets_service,
+)
+from app.services.user_service import bump_data_version
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def _check_not_archived(logged_at: datetime) -> None:
+    """
+    Refuse to write an entry into an archived month.
+
+    Raises:
+        HTTPException: If logged_at is before the archive horizon
+    """
+    if archive_service.is_archived(logged_at):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=(
+                "Entries logged before "
+                f"{archive_service.horizon().date().isoformat()} are archived"
+            ),
+        )
+
+
+def _food_log_values(user: User, food_data: FoodLogCreate) -> dict:
+    """
+    Column values for a new food log row.
+
+    Entries referencing the food catalog get their name (unless given) and
+    nutrients from the catalog food, scaled by the number of servings.
+
+    Raises:
+        HTTPException: If catalog_id is not in the catalog, or logged_at is
+            in an archived month
+    """
+    _check_not_archived(food_data.logged_at)
+    values = {
+        "user_id": user.id,
+        "food_name": food_data.food_name,
+        "calories": food_data.calories,
+        "protein_g": food_data.protein_g or 0,
+        "carbs_g": food_data.carbs_g or 0,
+        "fats_g": food_data.fats_g or 0,
+        "logged_at": food_data.logged_at,
+    }
+
+    if food_data.catalog_id is not None:
+        food = catalog_service.get_food(food_data.catalog_id)
+        if food is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown catalog_id {food_data.catalog_id}",
+            )
+        values.update(
+            catalog_service.food_log_nutrients(food, food_data.servings or Decimal(1))
+        )
+        values["food_name"] = food_data.food_name or food.name
+
+    return values
+
+
+def _rollup_values(food_log: FoodLog) -> dict:
+    """Column values of a loaded food log that feed the daily rollup"""
+    return {
+        column.key: getattr(food_log, column.key)
+        for _, column in rollup_service.TOTAL_COLUMNS
+    }
 
 
 def create_food_log(db: Session, user: User, food_data: FoodLogCreate) -> FoodLog:
     """
-    Create a new food log entry.
+    Create a new food log entry and add it to its day's rollup.
 
     Args:
         db: Database session
@@ -23,23 +114,288 @@ def create_food_log(db: Session, user: User, food_data: FoodLogCreate) -> FoodLo
     Returns:
         Created food log
     """
-    food_log = FoodLog(
-        user_id=user.id,
-        food_name=food_data.food_name,
-        calories=food_data.calories,
-        protein_g=food_data.protein_g or 0,
-        carbs_g=food_data.carbs_g or 0,
-        fats_g=food_data.fats_g or 0,
-        logged_at=food_data.logged_at,
-    )
+    values = _food_log_values(user, food_data)
+    food_log = FoodLog(**values)
 
     db.add(food_log)
+    rollup_service.apply_delta(
+        db, user.id, values["logged_at"].date(), rollup_service.entry_totals(values)
+    )
+    bump_data_version(db, user.id)
     db.commit()
+    suggest_service.record_food_logs(user.id, [values])
     db.refresh(food_log)
 
     return food_log
 
 
+def _insert_food_log_rows(db: Session, rows: List[dict]) -> List[int]:
+    """
+    Insert food log rows as one batched statement and return their ids.
+
+    Uses a multi-row INSERT ... RETURNING where the dialect supports it
+    (SQLite, MariaDB); otherwise falls back to an ORM flush, which still
+    runs inside the caller's single transaction.
+    """
+    dialect = db.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = db.execute(
+            insert(FoodLog).returning(FoodLog.id, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.scalars())
+
+    food_logs = [FoodLog(**row) for row in rows]
+    db.add_all(food_logs)
+    db.flush()
+    return [food_log.id for food_log in food_logs]
+
+
+def _insert_rows_individually(
+    db: Session, indexed_rows: List[tuple]
+) -> Tuple[dict, List[FoodLogBulkItemError]]:
+    """Insert rows one savepoint at a time, isolating the ones the DB rejects"""
+    ids, errors = {}, []
+    for index, row in indexed_rows:
+        try:
+            with db.begin_nested():
+                ids[index] = _insert_food_log_rows(db, [row])[0]
+        except DBAPIError as exc:
+            errors.append(
+                FoodLogBulkItemError(
+                    index=index,
+                    errors=[{"type": "database_error", "msg": str(exc.orig)}],
+                )
+            )
+    return ids, errors
+
+
+def create_food_logs_bulk(
+    db: Session, user: User, bulk_data: FoodLogBulkCreate
+) -> FoodLogBulkCreateResponse:
+    """
+    Create many food log entries in a single transaction.
+
+    All items are validated in one pass and the valid ones are written with
+    one batched INSERT and one commit. Unless allow_partial is set, any
+    invalid item rejects the whole batch.
+
+    Args:
+        db: Database session
+        user: Current user
+        bulk_data: Raw items and partial-failure mode
+
+    Returns:
+        Generated ids aligned with the request items, plus per-item errors
+
+    Raises:
+        HTTPException: If any item is invalid and allow_partial is not set
+    """
+    indexed_rows, errors = [], []
+    for index, item in enumerate(bulk_data.items):
+        try:
+            food_data = FoodLogCreate.model_validate(item)
+            indexed_rows.append((index, _food_log_values(user, food_data)))
+        except ValidationError as exc:
+            errors.append(
+                FoodLogBulkItemError(
+                    index=index,
+                    errors=exc.errors(
+                        include_url=False, include_context=False, include_input=False
+                    ),
+                )
+            )
+        except HTTPException as exc:
+            errors.append(
+                FoodLogBulkItemError(
+                    index=index, errors=[{"type": "value_error", "msg": exc.detail}]
+                )
+            )
+
+    if errors and not bulk_data.allow_partial:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors],
+        )
+
+    ids = {}
+    if indexed_rows:
+        try:
+            with db.begin_nested():
+                generated = _insert_food_log_rows(db, [row for _, row in indexed_rows])
+            ids = dict(zip((index for index, _ in indexed_rows), generated))
+        except DBAPIError:
+            if not bulk_data.allow_partial:
+                db.rollback()
+                raise
+            # Something in the batch was refused by the database: find out
+            # which rows, without giving up on the rest
+            ids, db_errors = _insert_rows_individually(db, indexed_rows)
+            errors.extend(db_errors)
+        rollup_service.apply_deltas(
+            db,
+            user.id,
+            (
+                (row["logged_at"].date(), rollup_service.entry_totals(row))
+                for index, row in indexed_rows
+                if index in ids
+            ),
+        )
+        bump_data_version(db, user.id)
+        db.commit()
+        suggest_service.record_food_logs(
+            user.id, (row for index, row in indexed_rows if index in ids)
+        )
+
+    return FoodLogBulkCreateResponse(
+        ids=[ids.get(index) for index in range(len(bulk_data.items))],
+        created_count=len(ids),
+        errors=sorted(errors, key=lambda error: error.index),
+    )
+
+
+def create_food_logs_grouped(
+    db: Session, entries: List[Tuple[User, FoodLogCreate]]
+) -> List[Union[FoodLog, Exception]]:
+    """
+    Create the queued entries of a group commit, possibly of many users.
+
+    The rows are written with the bulk create's batched INSERT; each user's
+    rollup, data version and suggestion index are updated as a single
+    create would, and everything is committed at once. An entry that fails
+    on its own (unknown catalog_id, row refused by the database) gets its
+    error back without failing the others.
+
+    Args:
+        db: Database session
+        entries: User and food log data of each queued create
+
+    Returns:
+        The created food log, or the error, of each entry in order
+    """
+    results: List[Union[FoodLog, Exception]] = [None] * len(entries)
+    indexed_rows = []
+    for index, (user, food_data) in enumerate(entries):
+        try:
+            indexed_rows.append((index, _food_log_values(user, food_data)))
+        except HTTPException as exc:
+            results[index] = exc
+
+    if not indexed_rows:
+        return results
+
+    ids = {}
+    try:
+        with db.begin_nested():
+            generated = _insert_food_log_rows(db, [row for _, row in indexed_rows])
+        ids = dict(zip((index for index, _ in indexed_rows), generated))
+    except DBAPIError:
+        # Only the rows the database refuses fail their callers
+        for index, row in indexed_rows:
+            try:
+                with db.begin_nested():
+                    ids[index] = _insert_food_log_rows(db, [row])[0]
+            except DBAPIError as exc:
+                results[index] = exc
+
+    per_user: Dict[int, List[dict]] = {}
+    for index, row in indexed_rows:
+        if index in ids:
+            per_user.setdefault(row["user_id"], []).append(row)
+    for user_id, rows in per_user.items():
+        rollup_service.apply_deltas(
+            db,
+            user_id,
+            (
+                (row["logged_at"].date(), rollup_service.entry_totals(row))
+                for row in rows
+            ),
+        )
+        bump_data_version(db, user_id)
+    db.commit()
+    for user_id, rows in per_user.items():
+        suggest_service.record_food_logs(user_id, rows)
+
+    created = db.scalars(select(FoodLog).where(FoodLog.id.in_(ids.values())))
+    by_id = {food_log.id: food_log for food_log in created}
+    for index, food_log_id in ids.items():
+        results[index] = by_id[food_log_id]
+    return results
+
+
+def _decode_listing_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Keyset position of a listing cursor, if any"""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def _listing_criteria(
+    user: User,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    position: Optional[Tuple[datetime, int]],
+    horizon: Optional[datetime],
+) -> list:
+    """WHERE clauses of a food log listing page, over the hot tier"""
+    criteria = [FoodLog.user_id == user.id]
+
+    if start_date:
+        criteria.append(FoodLog.logged_at >= start_date)
+
+    if end_date:
+        criteria.append(FoodLog.logged_at <= end_date)
+
+    if position:
+        last_logged_at, last_id = position
+        # The redundant logged_at <= bound gives the planner a range to seek
+        # on; the OR alone would make it walk the index from the newest entry
+        criteria += [
+            FoodLog.logged_at <= last_logged_at,
+            or_(FoodLog.logged_at < last_logged_at, FoodLog.id < last_id),
+        ]
+
+    if horizon:
+        # Older entries are read from the archive; the bound also prunes the
+        # query to the partitions after it
+        criteria.append(FoodLog.logged_at >= horizon)
+
+    return criteria
+
+
+def _archived_page(
+    db: Session,
+    user: User,
+    criteria: list,
+    hot_count: int,
+    skip: int,
+    limit: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    position: Optional[Tuple[datetime, int]],
+) -> List[dict]:
+    """
+    Archived entries continuing a listing page the hot tier could not fill.
+
+    When the hot query returned nothing, part of the offset may have been
+    spent on hot rows: the archive skips what is left after counting them.
+    """
+    if hot_count == limit:
+        return []
+    if hot_count == 0 and skip:
+        skip -= db.scalar(select(func.count()).select_from(FoodLog).where(*criteria))
+    else:
+        skip = 0
+    return archive_service.archived_food_logs(
+        user.id, skip, limit - hot_count, start_date, end_date, position
+    )
+
+
 def get_food_logs(
     db: Session,
     user: User,
@@ -47,10 +403,17 @@ def get_food_logs(
     limit: int = 100,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
 ) -> List[FoodLog]:
     """
     Get food logs for a user with optional date filtering.
 
+    Entries are ordered newest first by (logged_at, id). When a cursor from a
+    previous page is given, the page seeks directly past it on the
+    (user_id, logged_at) index instead of scanning and discarding skipped
+    rows, and skip is ignored. Entries of archived months follow the ones in
+    the table, read from the archive files (as detached FoodLog instances).
+
     Args:
         db: Database session
         user: Current user
@@ -58,19 +421,126 @@ def get_food_logs(
         limit: Maximum number of records to return
         start_date: Filter by start date
         end_date: Filter by end date
+        cursor: Keyset cursor of the last entry of the previous page
 
     Returns:
         List of food logs
+
+    Raises:
+        HTTPException: If the cursor is malformed
     """
-    query = db.query(FoodLog).filter(FoodLog.user_id == user.id)
+    position = _decode_listing_cursor(cursor)
+    if position:
+        skip = 0
+    horizon = archive_service.horizon()
+    criteria = _listing_criteria(user, start_date, end_date, position, horizon)
 
-    if start_date:
-        query = query.filter(FoodLog.logged_at >= start_date)
+    food_logs = (
+        db.query(FoodLog)
+        .filter(*criteria)
+        .order_by(FoodLog.logged_at.desc(), FoodLog.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    if horizon:
+        archived = _archived_page(
+            db,
+            user,
+            criteria,
+            len(food_logs),
+            skip,
+            limit,
+            start_date,
+            end_date,
+            position,
+        )
+        food_logs += [FoodLog(**row) for row in archived]
+    return food_logs
+
+
+# Fields a listing can be projected to with ?fields=, in response order
+LISTING_FIELDS = tuple(FoodLogResponse.model_fields)
 
-    if end_date:
-        query = query.filter(FoodLog.logged_at <= end_date)
 
-    return query.order_by(FoodLog.logged_at.desc()).offset(skip).limit(limit).all()
+def get_food_log_fields(
+    db: Session,
+    user: User,
+    fields: List[str],
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Get a page of food logs projected to a subset of fields.
+
+    Same filtering, ordering, paging and archive as get_food_logs, but only the
+    requested columns are selected through a Core select and each row
+    becomes a plain dict of column values (for ORJSONResponse), without ORM
+    instances or response model validation.
+
+    Args:
+        db: Database session
+        user: Current user
+        fields: Response field names to include
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        start_date: Filter by start date
+        end_date: Filter by end date
+        cursor: Keyset cursor of the last entry of the previous page
+
+    Returns:
+        Rows as dicts, and the cursor of the next page if this one is full
+
+    Raises:
+        HTTPException: If a field is unknown or the cursor is malformed
+    """
+    unknown = [field for field in fields if field not in LISTING_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+
+    position = _decode_listing_cursor(cursor)
+    if position:
+        skip = 0
+    horizon = archive_service.horizon()
+    criteria = _listing_criteria(user, start_date, end_date, position, horizon)
+
+    # The paging key always comes last, for the next cursor
+    columns = [FoodLog.__table__.c[field] for field in fields]
+    rows = db.execute(
+        select(*columns, FoodLog.logged_at, FoodLog.id)
+        .where(*criteria)
+        .order_by(FoodLog.logged_at.desc(), FoodLog.id.desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    if horizon:
+        archived = _archived_page(
+            db,
+            user,
+            criteria,
+            len(rows),
+            skip,
+            limit,
+            start_date,
+            end_date,
+            position,
+        )
+        rows += [
+            tuple(row[field] for field in fields) + (row["logged_at"], row["id"])
+            for row in archived
+        ]
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+
+    return [dict(zip(fields, row)) for row in rows], next_cursor
 
 
 def get_food_log_by_id(db: Session, user: User, food_log_id: int) -> FoodLog:
@@ -102,11 +572,43 @@ def get_food_log_by_id(db: Session, user: User, food_log_id: int) -> FoodLog:
     return food_log
 
 
+def get_food_log_with_archive(db: Session, user: User, food_log_id: int) -> FoodLog:
+    """
+    Get a specific food log by ID, looking in the archive if it is not in
+    the table.
+
+    Args:
+        db: Database session
+        user: Current user
+        food_log_id: Food log ID
+
+    Returns:
+        Food log instance (detached if archived)
+
+    Raises:
+        HTTPException: If food log not found or doesn't belong to user
+    """
+    food_log = (
+        db.query(FoodLog)
+        .filter(FoodLog.id == food_log_id, FoodLog.user_id == user.id)
+        .first()
+    )
+    if food_log:
+        return food_log
+
+    archived = archive_service.get_archived_food_log(user.id, food_log_id)
+    if archived is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Food log not found"
+        )
+    return FoodLog(**archived)
+
+
 def update_food_log(
     db: Session, user: User, food_log_id: int, food_data: FoodLogUpdate
 ) -> FoodLog:
     """
-    Update a food log entry.
+    Update a food log entry and move its contribution in the daily rollup.
 
     Args:
         db: Database session
@@ -118,17 +620,37 @@ def update_food_log(
         Updated food log
 
     Raises:
-        HTTPException: If food log not found or doesn't belong to user
+        HTTPException: If food log not found or doesn't belong to user, or
+            would be moved into an archived month
     """
     food_log = get_food_log_by_id(db, user, food_log_id)
+    old_day = food_log.logged_at.date()
+    old_totals = rollup_service.entry_totals(_rollup_values(food_log))
 
     # Update only provided fields
     update_data = food_data.model_dump(exclude_unset=True)
+    if update_data.get("logged_at"):
+        _check_not_archived(update_data["logged_at"])
 
     for field, value in update_data.items():
         setattr(food_log, field, value)
 
+    # Take the old values out of the old day and add the new ones to the
+    # (possibly different) new day
+    rollup_service.apply_deltas(
+        db,
+        user.id,
+        [
+            (old_day, rollup_service.negate(old_totals)),
+            (
+                food_log.logged_at.date(),
+                rollup_service.entry_totals(_rollup_values(food_log)),
+            ),
+        ],
+    )
+    bump_data_version(db, user.id)
     db.commit()
+    suggest_service.invalidate_index(user.id)
     db.refresh(food_log)
 
     return food_log
@@ -136,7 +658,8 @@ def update_food_log(
 
 def delete_food_log(db: Session, user: User, food_log_id: int) -> None:
     """
-    Delete a food log entry.
+    Delete a food log entry, remove it from its day's rollup and leave a
+    tombstone for syncing clients.
 
     Args:
         db: Database session
@@ -147,8 +670,286 @@ def delete_food_log(db: Session, user: User, food_log_id: int) -> None:
         HTTPException: If food log not found or doesn't belong to user
     """
     food_log = get_food_log_by_id(db, user, food_log_id)
+    rollup_service.apply_delta(
+        db,
+        user.id,
+        food_log.logged_at.date(),
+        rollup_service.negate(rollup_service.entry_totals(_rollup_values(food_log))),
+    )
     db.delete(food_log)
+    sync_service.record_tombstone(db, user.id, food_log.id)
+    bump_data_version(db, user.id)
     db.commit()
+    suggest_service.invalidate_index(user.id)
+
+
+def _selection_criteria(user: User, selection: FoodLogSelection) -> list:
+    """WHERE clauses for a bulk selection, always scoped to the user"""
+    criteria = [FoodLog.user_id == user.id]
+
+    if selection.ids is not None:
+        criteria.append(FoodLog.id.in_(selection.ids))
+
+    if selection.start_date:
+        criteria.append(FoodLog.logged_at >= selection.start_date)
+
+    if selection.end_date:
+        criteria.append(FoodLog.logged_at <= selection.end_date)
+
+    return criteria
+
+
+def update_food_logs_bulk(db: Session, user: User, bulk_data: FoodLogBulkUpdate) -> int:
+    """
+    Apply the same changes to many food log entries.
+
+    Runs as one set-based UPDATE without loading the rows; the rollup rows
+    of every day the selection touched are then recomputed in the same
+    transaction.
+
+    Args:
+        db: Database session
+        user: Current user
+        bulk_data: Selection and the fields to change
+
+    Returns:
+        Number of entries updated
+
+    Raises:
+        HTTPException: If the entries would be moved into an archived month
+    """
+    update_data = bulk_data.changes.model_dump(exclude_unset=True)
+    if not update_data:
+        return 0
+
+    criteria = _selection_criteria(user, bulk_data)
+    days = rollup_service.affected_days(db, criteria)
+    if update_data.get("logged_at"):
+        _check_not_archived(update_data["logged_at"])
+        days.append(update_data["logged_at"].date())
+
+    result = db.execute(
+        update(FoodLog)
+        .where(*criteria)
+        .values(**update_data)
+        .execution_options(synchronize_session=False)
+    )
+    rollup_service.refresh_days(db, user.id, days)
+    bump_data_version(db, user.id)
+    db.commit()
+    suggest_service.invalidate_index(user.id)
+
+    return result.rowcount
+
+
+def delete_food_logs_bulk(db: Session, user: User, bulk_data: FoodLogBulkDelete) -> int:
+    """
+    Delete many food log entries.
+
+    Runs as one set-based DELETE without loading the rows, after copying
+    their ids to the sync tombstones; the rollup rows of the affected days
+    are then recomputed in the same transaction.
+
+    Args:
+        db: Database session
+        user: Current user
+        bulk_data: Selection of entries to delete
+
+    Returns:
+        Number of entries deleted
+    """
+    criteria = _selection_criteria(user, bulk_data)
+    days = rollup_service.affected_days(db, criteria)
+
+    sync_service.record_tombstones(db, criteria)
+    result = db.execute(
+        delete(FoodLog).where(*criteria).execution_options(synchronize_session=False)
+    )
+    rollup_service.refresh_days(db, user.id, days)
+    bump_data_version(db, user.id)
+    db.commit()
+    suggest_service.invalidate_index(user.id)
+
+    return result.rowcount
+
+
+def suggest_foods(
+    db: Session, user: User, query: str, limit: int = 10
+) -> List[suggest_service.FoodHistoryEntry]:
+    """
+    Suggest food names from the user's history.
+
+    Served from the user's in-memory prefix index, built on first use with
+    one query and then kept current by the write paths.
+
+    Args:
+        db: Database session
+        user: Current user
+        query: Prefix of any word of the food name
+        limit: Maximum number of suggestions
+
+    Returns:
+        Matching foods with their last-used macros, best first
+    """
+    index = suggest_service.get_cached_index(user.id)
+    if index is None:
+        index = suggest_service.load_index(db, user.id)
+    return index.suggest(query, limit)
+
+
+# Columns written by the export, in output order
+EXPORT_COLUMNS = (
+    FoodLog.id,
+    FoodLog.food_name,
+    FoodLog.calories,
+    FoodLog.protein_g,
+    FoodLog.carbs_g,
+    FoodLog.fats_g,
+    FoodLog.logged_at,
+    FoodLog.created_at,
+    FoodLog.updated_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+# Rows fetched from the server-side cursor per round trip / output chunk
+EXPORT_BATCH_SIZE = 1000
+
+
+def food_log_export_query(
+    user: User,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Select:
+    """
+    Build the streaming export query for a user's history.
+
+    Selects plain columns (no ORM entities) oldest first, with server-side
+    cursor options so rows are fetched in batches instead of all at once.
+    Only the hot tier is selected; see archived_export_batches.
+
+    Args:
+        user: Current user
+        start_date: Filter by start date
+        end_date: Filter by end date
+
+    Returns:
+        Select statement for the export
+    """
+    query = select(*EXPORT_COLUMNS).where(FoodLog.user_id == user.id)
+
+    horizon = archive_service.horizon()
+    if horizon:
+        query = query.where(FoodLog.logged_at >= horizon)
+
+    if start_date:
+        query = query.where(FoodLog.logged_at >= start_date)
+
+    if end_date:
+        query = query.where(FoodLog.logged_at <= end_date)
+
+    return query.order_by(FoodLog.logged_at, FoodLog.id).execution_options(
+        stream_results=True, yield_per=EXPORT_BATCH_SIZE
+    )
+
+
+def archived_export_batches(
+    user: User,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Iterator[List[tuple]]:
+    """
+    Rows of the archived months of an export, which precede the hot rows.
+
+    Args:
+        user: Current user
+        start_date: Filter by start date
+        end_date: Filter by end date
+
+    Yields:
+        Batches of rows in EXPORT_COLUMNS order, oldest first
+    """
+    return archive_service.archived_export_batches(
+        user.id, EXPORT_FIELDS, start_date, end_date
+    )
+
+
+def _export_value(value):
+    """Render a column value the way the JSON API does"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_header(export_format: str) -> str:
+    """Leading chunk of an export (the CSV header row)"""
+    if export_format != "csv":
+        return ""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue()
+
+
+def format_export_rows(rows: Iterable, export_format: str) -> str:
+    """
+    Render a batch of export rows as NDJSON lines or CSV records.
+
+    Args:
+        rows: Rows from food_log_export_query
+        export_format: "ndjson" or "csv"
+
+    Returns:
+        Encoded chunk
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_export_value(value) for value in row])
+        return buffer.getvalue()
+
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_export_value, row)))) + "\n"
+        for row in rows
+    )
+
+
+def export_food_logs(
+    db: Session,
+    user: User,
+    export_format: str = "ndjson",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Iterator[str]:
+    """
+    Stream a user's food log history in constant memory.
+
+    Args:
+        db: Database session
+        user: Current user
+        export_format: "ndjson" or "csv"
+        start_date: Filter by start date
+        end_date: Filter by end date
+
+    Yields:
+        Encoded chunks of at most EXPORT_BATCH_SIZE rows
+    """
+    yield export_header(export_format)
+
+    for rows in archived_export_batches(user, start_date, end_date):
+        yield format_export_rows(rows, export_format)
+
+    result = db.execute(food_log_export_query(user, start_date, end_date))
+    for rows in result.partitions():
+        yield format_export_rows(rows, export_format)
+
+
+# Totals columns of a summary, in DailySummaryResponse field order
+SUMMARY_FIELDS = ("total_calories", "total_protein_g", "total_carbs_g", "total_fats_g")
+# NutrientAmounts fields matching SUMMARY_FIELDS
+TARGET_FIELDS = ("calories", "protein_g", "carbs_g", "fats_g")
+PERCENT = Decimal("0.1")
 
 
 def get_daily_summary(
@@ -157,39 +958,121 @@ def get_daily_summary(
     """
     Get daily nutrition summary for a specific date.
 
+    Reads the day's single row of the daily_nutrition_totals rollup instead
+    of aggregating the raw entries. Progress against the daily targets comes
+    from the memoized targets of the user's profile, without a query.
+
     Args:
         db: Database session
         user: Current user
         target_date: Date to get summary for
 
     Returns:
-        Daily summary with totals
+        Daily summary with totals and, for a complete profile, progress
     """
-    # Query for all food logs on the target date
-    start_datetime = datetime.combine(target_date, datetime.min.time())
-    end_datetime = datetime.combine(target_date, datetime.max.time())
+    totals = rollup_service.get_day_totals(db, user.id, target_date)
+    if totals is None:
+        totals = (Decimal(0),) * len(SUMMARY_FIELDS) + (0,)
 
-    summary = (
-        db.query(
-            func.sum(FoodLog.calories).label("total_calories"),
-            func.sum(FoodLog.protein_g).label("total_protein"),
-            func.sum(FoodLog.carbs_g).label("total_carbs"),
-            func.sum(FoodLog.fats_g).label("total_fats"),
-            func.count(FoodLog.id).label("entries_count"),
+    summary = DailySummaryResponse(
+        date=target_date.isoformat(),
+        **dict(zip(SUMMARY_FIELDS, totals)),
+        entries_count=totals[-1],
+    )
+
+    targets = targets_service.get_targets(user)
+    if targets is not None:
+        goals = [getattr(targets, field) for field in TARGET_FIELDS]
+        summary.remaining = NutrientAmounts(
+            **{
+                field: goal - total
+                for field, goal, total in zip(TARGET_FIELDS, goals, totals)
+            }
         )
-        .filter(
-            FoodLog.user_id == user.id,
-            FoodLog.logged_at >= start_datetime,
-            FoodLog.logged_at <= end_datetime,
+        summary.percent_of_target = NutrientAmounts(
+            **{
+                field: (total * 100 / goal).quantize(PERCENT) if goal else Decimal(0)
+                for field, goal, total in zip(TARGET_FIELDS, goals, totals)
+            }
         )
-        .first()
-    )
+    return summary
 
-    return DailySummaryResponse(
-        date=target_date.isoformat(),
-        total_calories=summary.total_calories or Decimal(0),
-        total_protein_g=summary.total_protein or Decimal(0),
-        total_carbs_g=summary.total_carbs or Decimal(0),
-        total_fats_g=summary.total_fats or Decimal(0),
-        entries_count=summary.entries_count or 0,
+
+def _bucket_start(day: date, bucket: str) -> date:
+    """First day of the day/week (ISO, Monday)/month bucket containing day"""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, bucket: str) -> date:
+    """First day of the bucket following the one starting at start"""
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def get_range_summary(
+    db: Session, user: User, start: date, end: date, bucket: str = "day"
+) -> RangeSummaryResponse:
+    """
+    Get nutrition totals for every day, week or month in a date range.
+
+    The per-day rows of the daily_nutrition_totals rollup are read with one
+    primary-key range scan; bucketing into weeks/months and zero-filling
+    empty buckets happen in Python.
+
+    Args:
+        db: Database session
+        user: Current user
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        bucket: "day", "week" or "month"
+
+    Returns:
+        Totals per bucket, in date order
+
+    Raises:
+        HTTPException: If the range is inverted or too long
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="end is before start"
+        )
+    if (end - start).days + 1 > settings.SUMMARY_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range is limited to {settings.SUMMARY_MAX_DAYS} days",
+        )
+
+    days = rollup_service.get_range_totals(db, user.id, start, end)
+
+    # Zero-filled buckets covering the whole range
+    totals = {}
+    bucket_start = _bucket_start(start, bucket)
+    while bucket_start <= end:
+        totals[bucket_start] = [Decimal(0)] * len(SUMMARY_FIELDS) + [0]
+        bucket_start = _next_bucket(bucket_start, bucket)
+
+    for day, day_totals in days.items():
+        bucket_totals = totals[_bucket_start(day, bucket)]
+        for i, value in enumerate(day_totals):
+            bucket_totals[i] += value
+
+    return RangeSummaryResponse(
+        start=start.isoformat(),
+        end=end.isoformat(),
+        bucket=bucket,
+        buckets=[
+            DailySummaryResponse(
+                date=bucket_day.isoformat(),
+                **dict(zip(SUMMARY_FIELDS, values)),
+                entries_count=values[-1],
+            )
+            for bucket_day, values in totals.items()
+        ],
     )
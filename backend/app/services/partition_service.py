@@ -0,0 +1,125 @@
+"""Monthly RANGE partitions of food_logs on MySQL (migration 007)"""
+
+from datetime import date
+from typing import List, Optional
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Partitions are named pYYYYMM and hold the entries logged in that month;
+# pmax catches anything past the last monthly partition
+MAX_PARTITION = "pmax"
+PARTITION_NAME = re.compile(r"^p(\d{4})(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing value"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) month"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of a month's partition"""
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def partition_definition(month: date) -> str:
+    """PARTITION clause of a month's partition"""
+    return (
+        f"PARTITION {partition_name(month)} "
+        f"VALUES LESS THAN ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month of a pYYYYMM partition, None for any other name"""
+    match = PARTITION_NAME.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def list_partitions(db: Session) -> List[str]:
+    """
+    Partitions of food_logs, oldest first.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Partition names; empty if the table is not partitioned (or not on
+        MySQL)
+    """
+    if db.get_bind().dialect.name not in ("mysql", "mariadb"):
+        return []
+    return list(
+        db.scalars(
+            text(
+                "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'food_logs' "
+                "AND PARTITION_NAME IS NOT NULL "
+                "ORDER BY PARTITION_ORDINAL_POSITION"
+            )
+        )
+    )
+
+
+def ensure_future_partitions(db: Session, months_ahead: int) -> List[str]:
+    """
+    Create the monthly partitions up to `months_ahead` months from now.
+
+    New partitions are split off pmax, which only holds entries logged
+    past the last monthly partition, so this normally moves no rows.
+
+    Args:
+        db: Database session
+        months_ahead: Months after the current one that need a partition
+
+    Returns:
+        Names of the partitions created
+    """
+    months = [month for month in map(partition_month, list_partitions(db)) if month]
+    if not months:
+        return []
+
+    last = add_months(month_start(date.today()), months_ahead)
+    new_months = []
+    month = add_months(max(months), 1)
+    while month <= last:
+        new_months.append(month)
+        month = add_months(month, 1)
+    if not new_months:
+        return []
+
+    definitions = ", ".join(map(partition_definition, new_months))
+    db.execute(
+        text(
+            f"ALTER TABLE food_logs REORGANIZE PARTITION {MAX_PARTITION} INTO "
+            f"({definitions}, PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE))"
+        )
+    )
+    db.commit()
+    return [partition_name(month) for month in new_months]
+
+
+def drop_partition(db: Session, month: date) -> bool:
+    """
+    Drop a month's partition and every row in it, without a row-by-row
+    DELETE.
+
+    Args:
+        db: Database session
+        month: First day of the month
+
+    Returns:
+        False if the month has no partition
+    """
+    name = partition_name(month)
+    if name not in list_partitions(db):
+        return False
+    db.execute(text(f"ALTER TABLE food_logs DROP PARTITION {name}"))
+    db.commit()
+    return True
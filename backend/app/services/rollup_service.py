@@ -0,0 +1,317 @@
+"""Maintenance of the daily_nutrition_totals rollup table"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models.daily_nutrition_total import DailyNutritionTotal
+from app.models.food_log import FoodLog
+from app.models.user import User
+
+# Rollup sum columns and the food_logs columns they total
+TOTAL_COLUMNS = (
+    ("total_calories", FoodLog.calories),
+    ("total_protein_g", FoodLog.protein_g),
+    ("total_carbs_g", FoodLog.carbs_g),
+    ("total_fats_g", FoodLog.fats_g),
+)
+
+# Per-day totals: sums in TOTAL_COLUMNS order followed by the entries count
+DayTotals = Tuple[Decimal, Decimal, Decimal, Decimal, int]
+
+CENT = Decimal("0.01")
+
+
+def _as_date(value) -> date:
+    """Normalise a DATE() result (a date on MySQL, a string on SQLite)"""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _totals(sums: Iterable, count: int) -> DayTotals:
+    """Build DayTotals, rounding sums to the columns' two decimal places"""
+    return tuple(Decimal(value or 0).quantize(CENT) for value in sums) + (count,)
+
+
+def entry_totals(values: Mapping) -> DayTotals:
+    """
+    Contribution of a single food log to its day.
+
+    Args:
+        values: Food log column values keyed by column name
+
+    Returns:
+        The entry's nutrients and a count of one
+    """
+    return _totals((values[column.key] for _, column in TOTAL_COLUMNS), 1)
+
+
+def negate(totals: DayTotals) -> DayTotals:
+    """Totals to subtract when an entry leaves a day"""
+    return tuple(-value for value in totals)
+
+
+def apply_delta(db: Session, user_id: int, day: date, totals: DayTotals) -> None:
+    """
+    Add (or with negated totals, subtract) an amount to one rollup row.
+
+    Runs as a single atomic upsert in the caller's transaction, so concurrent
+    writers to the same day never lose each other's increments.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        day: Day to adjust
+        totals: Sums and entry count to add
+    """
+    values = dict(zip([name for name, _ in TOTAL_COLUMNS], totals[:-1]))
+    values["entries_count"] = totals[-1]
+    increments = {
+        name: getattr(DailyNutritionTotal, name) + value
+        for name, value in values.items()
+    }
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(DailyNutritionTotal).values(
+            user_id=user_id, day=day, **values
+        )
+        db.execute(stmt.on_duplicate_key_update(**increments))
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(DailyNutritionTotal).values(
+            user_id=user_id, day=day, **values
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "day"], set_=increments
+            )
+        )
+    else:
+        result = db.execute(
+            update(DailyNutritionTotal)
+            .where(
+                DailyNutritionTotal.user_id == user_id,
+                DailyNutritionTotal.day == day,
+            )
+            .values(**increments)
+        )
+        if result.rowcount == 0:
+            db.execute(
+                insert(DailyNutritionTotal).values(user_id=user_id, day=day, **values)
+            )
+
+
+def apply_deltas(
+    db: Session, user_id: int, changes: Iterable[Tuple[date, DayTotals]]
+) -> None:
+    """
+    Fold many (day, totals) changes together and apply one upsert per day.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        changes: Day and totals pairs, possibly repeating days
+    """
+    per_day: Dict[date, list] = {}
+    for day, totals in changes:
+        current = per_day.setdefault(day, [0] * len(totals))
+        for i, value in enumerate(totals):
+            current[i] += value
+
+    for day, totals in sorted(per_day.items()):
+        apply_delta(db, user_id, day, tuple(totals))
+
+
+def _aggregate_days(
+    db: Session, user_id: int, start: date, end: date
+) -> Dict[date, DayTotals]:
+    """Totals per day computed from the raw food_logs rows of a day range"""
+    day = func.date(FoodLog.logged_at)
+    rows = db.execute(
+        select(
+            day,
+            *[func.coalesce(func.sum(column), 0) for _, column in TOTAL_COLUMNS],
+            func.count(FoodLog.id),
+        )
+        .where(
+            FoodLog.user_id == user_id,
+            FoodLog.logged_at >= datetime.combine(start, datetime.min.time()),
+            FoodLog.logged_at <= datetime.combine(end, datetime.max.time()),
+        )
+        .group_by(day)
+    )
+    return {_as_date(row_day): _totals(sums, count) for row_day, *sums, count in rows}
+
+
+def affected_days(db: Session, criteria: list) -> List[date]:
+    """
+    Days touched by the food logs matching a WHERE clause.
+
+    Args:
+        db: Database session
+        criteria: Clauses on FoodLog, as used by bulk operations
+
+    Returns:
+        Distinct days of the matching entries
+    """
+    day = func.date(FoodLog.logged_at)
+    return [
+        _as_date(value) for value in db.scalars(select(day).where(*criteria).distinct())
+    ]
+
+
+def refresh_days(db: Session, user_id: int, days: Iterable[date]) -> None:
+    """
+    Recompute the rollup rows of specific days from the raw food_logs.
+
+    Used after set-based bulk writes and to repair drift. Runs in the
+    caller's transaction.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        days: Days to recompute
+    """
+    days = sorted(set(days))
+    if not days:
+        return
+
+    fresh = _aggregate_days(db, user_id, days[0], days[-1])
+    db.execute(
+        delete(DailyNutritionTotal).where(
+            DailyNutritionTotal.user_id == user_id, DailyNutritionTotal.day.in_(days)
+        )
+    )
+    rows = [_row(user_id, day, fresh[day]) for day in days if day in fresh]
+    if rows:
+        db.execute(insert(DailyNutritionTotal), rows)
+
+
+def _row(user_id: int, day: date, totals: DayTotals) -> dict:
+    """Rollup row values for a day"""
+    row = dict(zip([name for name, _ in TOTAL_COLUMNS], totals[:-1]))
+    row.update(user_id=user_id, day=day, entries_count=totals[-1])
+    return row
+
+
+def get_day_totals(db: Session, user_id: int, day: date) -> Optional[DayTotals]:
+    """
+    Read the rollup row of one day.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        day: Day to read
+
+    Returns:
+        Totals for the day, or None if nothing is logged on it
+    """
+    return get_range_totals(db, user_id, day, day).get(day)
+
+
+def get_range_totals(
+    db: Session, user_id: int, start: date, end: date
+) -> Dict[date, DayTotals]:
+    """
+    Read the rollup rows of a day range.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        start: First day (inclusive)
+        end: Last day (inclusive)
+
+    Returns:
+        Totals keyed by day, for days that have entries
+    """
+    rows = db.execute(
+        select(
+            DailyNutritionTotal.day,
+            *[getattr(DailyNutritionTotal, name) for name, _ in TOTAL_COLUMNS],
+            DailyNutritionTotal.entries_count,
+        ).where(
+            DailyNutritionTotal.user_id == user_id,
+            DailyNutritionTotal.day >= start,
+            DailyNutritionTotal.day <= end,
+        )
+    )
+    return {day: _totals(sums, count) for day, *sums, count in rows}
+
+
+def backfill_daily_totals(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild the rollup from food_logs, one user per transaction.
+
+    Args:
+        db: Database session
+        user_id: Only rebuild this user (default: every user)
+
+    Returns:
+        Number of users rebuilt
+    """
+    user_ids = [user_id] if user_id is not None else list(db.scalars(select(User.id)))
+    day = func.date(FoodLog.logged_at)
+
+    for uid in user_ids:
+        db.execute(
+            delete(DailyNutritionTotal).where(DailyNutritionTotal.user_id == uid)
+        )
+        db.execute(
+            insert(DailyNutritionTotal).from_select(
+                ["user_id", "day"]
+                + [name for name, _ in TOTAL_COLUMNS]
+                + ["entries_count"],
+                select(
+                    FoodLog.user_id,
+                    day,
+                    *[
+                        func.coalesce(func.sum(column), 0)
+                        for _, column in TOTAL_COLUMNS
+                    ],
+                    func.count(FoodLog.id),
+                )
+                .where(FoodLog.user_id == uid)
+                .group_by(FoodLog.user_id, day),
+            )
+        )
+        db.commit()
+
+    return len(user_ids)
+
+
+def check_daily_totals(
+    db: Session, user_id: Optional[int] = None, repair: bool = False
+) -> List[Tuple[int, date]]:
+    """
+    Compare the rollup with food_logs and optionally repair drifted days.
+
+    Args:
+        db: Database session
+        user_id: Only check this user (default: every user)
+        repair: Recompute the drifted days
+
+    Returns:
+        (user_id, day) pairs whose rollup row disagreed with food_logs
+    """
+    user_ids = [user_id] if user_id is not None else list(db.scalars(select(User.id)))
+    drifted = []
+
+    for uid in user_ids:
+        stored = get_range_totals(db, uid, date.min, date.max)
+        stored = {day: totals for day, totals in stored.items() if totals[-1]}
+        actual = _aggregate_days(db, uid, date.min, date.max)
+
+        days = [
+            day
+            for day in sorted(set(stored) | set(actual))
+            if stored.get(day) != actual.get(day)
+        ]
+        drifted.extend((uid, day) for day in days)
+
+        if repair and days:
+            refresh_days(db, uid, days)
+            db.commit()
+
+    return drifted
@@ -0,0 +1,122 @@
+"""Full-text search over a user's food log history"""
+
+from typing import List
+import re
+from sqlalchemy import and_, column, select, table, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.food_log import FTS_USER_STRIDE, FoodLog
+from app.models.user import User
+
+# Words of a query; anything else (operators, quotes) is dropped so user input
+# never reaches the MySQL boolean or FTS5 query syntax
+WORD = re.compile(r"\w+")
+MAX_TERMS = 8
+
+food_logs_fts = table("food_logs_fts", column("rowid"), column("rank"))
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    Split a search query into lowercase words.
+
+    Args:
+        query: Free text query
+
+    Returns:
+        At most MAX_TERMS words
+    """
+    return WORD.findall(query.lower())[:MAX_TERMS]
+
+
+def _mysql_search(user: User, terms: List[str]):
+    """Ranked select over the FULLTEXT index"""
+    against = " ".join(f"+{term}" for term in terms) + "*"
+    score = match(FoodLog.food_name, against=against).in_boolean_mode()
+    return (
+        select(FoodLog).where(FoodLog.user_id == user.id, score).order_by(score.desc())
+    )
+
+
+def _sqlite_search(user: User, terms: List[str]):
+    """Ranked select over the FTS5 table"""
+    fts_query = " ".join(f'"{term}"' for term in terms) + "*"
+    first_rowid = user.id * FTS_USER_STRIDE
+    # The rowid range lets FTS5 seek to the user's documents, so only their
+    # matches are ranked
+    hits = (
+        select(
+            (food_logs_fts.c.rowid - first_rowid).label("id"),
+            food_logs_fts.c.rank,
+        )
+        .where(
+            text("food_logs_fts MATCH :fts_query").bindparams(fts_query=fts_query),
+            food_logs_fts.c.rowid.between(
+                first_rowid, first_rowid + FTS_USER_STRIDE - 1
+            ),
+        )
+        .subquery()
+    )
+    # FTS5 rank is bm25, lower is better
+    return (
+        select(FoodLog)
+        .join(hits, hits.c.id == FoodLog.id)
+        .where(FoodLog.user_id == user.id)
+        .order_by(hits.c.rank)
+    )
+
+
+def _fallback_search(user: User, terms: List[str]):
+    """Substring match for dialects without a full-text index (scans)"""
+    return select(FoodLog).where(
+        FoodLog.user_id == user.id,
+        and_(*(FoodLog.food_name.ilike(f"%{term}%") for term in terms)),
+    )
+
+
+def search_food_logs(
+    db: Session, user: User, query: str, skip: int = 0, limit: int = 20
+) -> List[FoodLog]:
+    """
+    Search a user's food logs by name through the full-text index.
+
+    Every word of the query must be a word of the food name, except the last
+    one which may be the start of a word (search as you type; prefix terms
+    in the middle of a query would make the index merge the postings of
+    every matching word, for all users). On MySQL the
+    FULLTEXT index on food_name answers the match and its relevance ranks
+    the hits (a partitioned food_logs has no FULLTEXT index and is scanned
+    per user instead); on SQLite the food_logs_fts FTS5 table does the same
+    with bm25, restricted to the user's rowid range. Ties are broken newest
+    first.
+
+    Args:
+        db: Database session
+        user: Current user
+        query: Free text query
+        skip: Number of hits to skip
+        limit: Maximum number of hits to return
+
+    Returns:
+        Matching food logs, most relevant first
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("mysql", "mariadb") and not settings.FOOD_LOGS_PARTITIONED:
+        statement = _mysql_search(user, terms)
+    elif dialect == "sqlite":
+        statement = _sqlite_search(user, terms)
+    else:
+        statement = _fallback_search(user, terms)
+
+    return list(
+        db.scalars(
+            statement.order_by(FoodLog.logged_at.desc(), FoodLog.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+    )
@@ -0,0 +1,243 @@
+"""Food name autocomplete from a per-user in-memory prefix index"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+import threading
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.food_log import FoodLog
+from app.utils import metrics
+from app.utils.cache import TTLCache
+
+# Days after which a food's last use counts half as much in the ranking
+RECENCY_HALF_LIFE_DAYS = 14
+
+
+@dataclass
+class FoodHistoryEntry:
+    """A distinct food name of a user with its usage and last-used macros"""
+
+    food_name: str
+    uses: int
+    last_used_at: datetime
+    calories: Decimal
+    protein_g: Decimal
+    carbs_g: Decimal
+    fats_g: Decimal
+
+
+def _naive(value: datetime) -> datetime:
+    """Drop the offset the way the logged_at column does when storing it"""
+    return value.replace(tzinfo=None)
+
+
+class FoodHistoryIndex:
+    """
+    Distinct food names of one user, searchable by word prefix.
+
+    Every word start of every name ("greek yogurt" -> "greek yogurt",
+    "yogurt") is kept in a sorted array, so a prefix query is a binary search
+    followed by a short scan of the matching range.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, FoodHistoryEntry] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._latest = datetime.min
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _words(name_key: str) -> Iterable[str]:
+        """Every suffix of the name starting at a word boundary"""
+        words = name_key.split()
+        return {" ".join(words[i:]) for i in range(len(words))}
+
+    def add(self, entry: FoodHistoryEntry) -> None:
+        """
+        Record one or more uses of a food name.
+
+        Args:
+            entry: Name, number of uses, and the macros of the given use
+        """
+        name_key = " ".join(entry.food_name.lower().split())
+        with self._lock:
+            self._latest = max(self._latest, entry.last_used_at)
+            current = self._entries.get(name_key)
+            if current is None:
+                self._entries[name_key] = entry
+                for word in self._words(name_key):
+                    insort(self._keys, (word, name_key))
+                return
+
+            current.uses += entry.uses
+            if entry.last_used_at >= current.last_used_at:
+                current.food_name = entry.food_name
+                current.last_used_at = entry.last_used_at
+                current.calories = entry.calories
+                current.protein_g = entry.protein_g
+                current.carbs_g = entry.carbs_g
+                current.fats_g = entry.fats_g
+
+    def suggest(self, prefix: str, limit: int) -> List[FoodHistoryEntry]:
+        """
+        Find the names having a word that starts with prefix.
+
+        Args:
+            prefix: Query text (case-insensitive)
+            limit: Maximum number of suggestions
+
+        Returns:
+            Matching entries, most frequently and recently used first
+        """
+        prefix = " ".join(prefix.lower().split())
+        with self._lock:
+            matches = {}
+            i = bisect_left(self._keys, (prefix, ""))
+            while i < len(self._keys) and self._keys[i][0].startswith(prefix):
+                name_key = self._keys[i][1]
+                matches[name_key] = self._entries[name_key]
+                i += 1
+            latest = self._latest
+
+        def score(entry: FoodHistoryEntry) -> float:
+            age_days = (latest - entry.last_used_at).total_seconds() / 86400
+            return entry.uses * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+        return heapq.nlargest(
+            limit,
+            matches.values(),
+            key=lambda entry: (score(entry), entry.last_used_at),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Loaded indexes keyed by user id, evicted least-recently-used across users.
+# Writes in other workers are picked up when the index expires.
+suggest_indexes = TTLCache(
+    max_size=settings.SUGGEST_INDEX_MAX_USERS,
+    ttl_seconds=settings.SUGGEST_INDEX_TTL_SECONDS,
+)
+metrics.register("suggest_index", suggest_indexes.stats)
+
+# Users whose index is being built, mapped to whether a write raced the build
+_building: Dict[int, bool] = {}
+_building_lock = threading.Lock()
+
+
+def _entry(values, uses: int = 1) -> FoodHistoryEntry:
+    """History entry from a food log row or column-value mapping"""
+    get = values.get if isinstance(values, dict) else values._mapping.get
+    return FoodHistoryEntry(
+        food_name=get("food_name"),
+        uses=uses,
+        last_used_at=_naive(get("logged_at")),
+        calories=get("calories"),
+        protein_g=get("protein_g") or Decimal(0),
+        carbs_g=get("carbs_g") or Decimal(0),
+        fats_g=get("fats_g") or Decimal(0),
+    )
+
+
+def get_cached_index(user_id: int) -> Optional[FoodHistoryIndex]:
+    """
+    Get a user's index if it is loaded.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        The index, or None if it has to be built
+    """
+    return suggest_indexes.get(user_id)
+
+
+def load_index(db: Session, user_id: int) -> FoodHistoryIndex:
+    """
+    Build a user's index from food_logs and cache it.
+
+    One query returns each distinct name with its use count and its most
+    recent row, ranked by a window function instead of reading the history.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
+    Returns:
+        The new index
+    """
+    with _building_lock:
+        _building[user_id] = False
+
+    latest = (
+        select(
+            FoodLog.food_name,
+            FoodLog.calories,
+            FoodLog.protein_g,
+            FoodLog.carbs_g,
+            FoodLog.fats_g,
+            FoodLog.logged_at,
+            func.count().over(partition_by=FoodLog.food_name).label("uses"),
+            func.row_number()
+            .over(
+                partition_by=FoodLog.food_name,
+                order_by=(FoodLog.logged_at.desc(), FoodLog.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(FoodLog.user_id == user_id)
+        .subquery()
+    )
+
+    index = FoodHistoryIndex()
+    try:
+        for row in db.execute(select(latest).where(latest.c.position == 1)):
+            index.add(_entry(row, row.uses))
+    finally:
+        with _building_lock:
+            raced = _building.pop(user_id, True)
+
+    # A write committed while the query ran may be missing; serve this index
+    # once but build again next time
+    if not raced:
+        suggest_indexes.set(user_id, index)
+    return index
+
+
+def _mark_raced(user_id: int) -> None:
+    """Flag a concurrent build of the user's index as possibly stale"""
+    with _building_lock:
+        if user_id in _building:
+            _building[user_id] = True
+
+
+def record_food_logs(user_id: int, rows: Iterable[dict]) -> None:
+    """
+    Add newly committed food logs to a user's index, if it is loaded.
+
+    Args:
+        user_id: User ID
+        rows: Column values of the new food logs
+    """
+    _mark_raced(user_id)
+    index = suggest_indexes.get(user_id)
+    if index is not None:
+        for row in rows:
+            index.add(_entry(row))
+
+
+def invalidate_index(user_id: int) -> None:
+    """
+    Drop a user's index after food logs were changed or deleted.
+
+    Args:
+        user_id: User ID
+    """
+    _mark_raced(user_id)
+    suggest_indexes.invalidate(user_id)
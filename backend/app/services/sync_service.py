@@ -0,0 +1,201 @@
+"""Delta sync of food logs: change feed plus deletion tombstones"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, delete, func, insert, literal, or_, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.food_log import FoodLog
+from app.models.food_log_tombstone import FoodLogTombstone
+from app.models.user import User
+from app.schemas.food_log import FoodLogResponse, SyncResponse
+from app.utils.pagination import FeedPosition, decode_sync_token, encode_sync_token
+
+# Timestamps compared against updated_at / deleted_at. Those are written by
+# the database's CURRENT_TIMESTAMP, which SQLite stores without fractional
+# seconds, so bound values must use the same text format to compare right
+FEED_TIMESTAMP = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            "%(year)04d-%(month)02d-%(day)02d " "%(hour)02d:%(minute)02d:%(second)02d"
+        )
+    ),
+    "sqlite",
+)
+
+
+def record_tombstone(db: Session, user_id: int, food_log_id: int) -> None:
+    """
+    Record the deletion of one food log in the caller's transaction.
+
+    Args:
+        db: Database session
+        user_id: Owner of the entry
+        food_log_id: Deleted entry's id
+    """
+    db.add(FoodLogTombstone(user_id=user_id, food_log_id=food_log_id))
+
+
+def record_tombstones(db: Session, criteria: list) -> None:
+    """
+    Record the deletion of every food log matching criteria.
+
+    Must run before the DELETE, in the same transaction; the rows are
+    copied with one INSERT ... SELECT without being loaded.
+
+    Args:
+        db: Database session
+        criteria: WHERE clauses of the DELETE
+    """
+    db.execute(
+        insert(FoodLogTombstone).from_select(
+            ["user_id", "food_log_id"],
+            select(FoodLog.user_id, FoodLog.id).where(*criteria),
+        )
+    )
+
+
+def _after(column, id_column, position: Optional[FeedPosition]) -> list:
+    """Keyset clauses for rows past a (timestamp, id) position, if any"""
+    if position is None:
+        return []
+    timestamp = literal(position[0], FEED_TIMESTAMP)
+    return [
+        column >= timestamp,
+        or_(column > timestamp, id_column > position[1]),
+    ]
+
+
+def _settled_before(db: Session) -> datetime:
+    """
+    Upper bound of the feeds for this sync, in the database's clock.
+
+    Rows stamped in the current second, or in the last SYNC_SETTLE_SECONDS,
+    are left for the next sync: transactions still running may yet commit
+    rows with those timestamps, and a token must never move past them.
+    """
+    now = db.scalar(select(func.now()))
+    if isinstance(now, str):
+        now = datetime.fromisoformat(now)
+    return now.replace(microsecond=0) - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+
+
+def _feed_page(db: Session, query, column, id_column, limit: int) -> Tuple[list, bool]:
+    """Rows of a feed in (timestamp, id) order, and whether more follow"""
+    rows = db.execute(query.order_by(column, id_column).limit(limit + 1)).all()
+    return rows[:limit], len(rows) > limit
+
+
+def sync_food_logs(
+    db: Session, user: User, since: Optional[str], limit: int
+) -> SyncResponse:
+    """
+    Get the food logs created, updated or deleted since a sync token.
+
+    Changes are read from the (user_id, updated_at, id) index and deletions
+    from the tombstones' (user_id, deleted_at, id) index, each seeking past
+    the token's position, so a sync costs in proportion to what changed.
+    Without a token the whole history is sent, paged; deletions before it
+    are skipped. Once both feeds are caught up, the token moves to the
+    settle bound (see _settled_before).
+
+    Args:
+        db: Database session
+        user: Current user
+        since: next_token of the previous sync, or None for a full sync
+        limit: Maximum number of changes and of deletions returned
+
+    Returns:
+        Changes, deleted ids and the token for the next sync
+
+    Raises:
+        HTTPException: 400 if the token is malformed, 410 if it is older
+            than the tombstone retention and a full sync is needed
+    """
+    settled = _settled_before(db)
+    if since is None:
+        changes_after, deletions_after = None, (settled, 0)
+    else:
+        try:
+            changes_after, deletions_after = decode_sync_token(since)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token"
+            )
+        retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if deletions_after[0] < settled - retention:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync token expired, a full sync is required",
+            )
+
+    settled_bound = literal(settled, FEED_TIMESTAMP)
+    food_logs, more_changes = _feed_page(
+        db,
+        select(FoodLog).where(
+            FoodLog.user_id == user.id,
+            FoodLog.updated_at < settled_bound,
+            *_after(FoodLog.updated_at, FoodLog.id, changes_after),
+        ),
+        FoodLog.updated_at,
+        FoodLog.id,
+        limit,
+    )
+    tombstones, more_deletions = _feed_page(
+        db,
+        select(
+            FoodLogTombstone.deleted_at,
+            FoodLogTombstone.id,
+            FoodLogTombstone.food_log_id,
+        ).where(
+            FoodLogTombstone.user_id == user.id,
+            FoodLogTombstone.deleted_at < settled_bound,
+            *_after(FoodLogTombstone.deleted_at, FoodLogTombstone.id, deletions_after),
+        ),
+        FoodLogTombstone.deleted_at,
+        FoodLogTombstone.id,
+        limit,
+    )
+
+    changes: List[FoodLog] = [row[0] for row in food_logs]
+    if more_changes:
+        changes_after = (changes[-1].updated_at, changes[-1].id)
+    else:
+        changes_after = (settled, 0)
+    if more_deletions:
+        deletions_after = (tombstones[-1].deleted_at, tombstones[-1].id)
+    else:
+        deletions_after = (settled, 0)
+
+    return SyncResponse(
+        changes=[FoodLogResponse.model_validate(food_log) for food_log in changes],
+        deleted_ids=[tombstone.food_log_id for tombstone in tombstones],
+        next_token=encode_sync_token(changes_after, deletions_after),
+        has_more=more_changes or more_deletions,
+    )
+
+
+def prune_tombstones(db: Session) -> int:
+    """
+    Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS.
+
+    Clients whose token is older than that get 410 and sync in full.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of tombstones deleted
+    """
+    horizon = _settled_before(db) - timedelta(
+        days=settings.SYNC_TOMBSTONE_RETENTION_DAYS
+    )
+    result = db.execute(
+        delete(FoodLogTombstone).where(
+            FoodLogTombstone.deleted_at < literal(horizon, FEED_TIMESTAMP)
+        )
+    )
+    db.commit()
+    return result.rowcount
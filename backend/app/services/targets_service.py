@@ -0,0 +1,127 @@
+"""Daily calorie and macro targets derived from the user's profile"""
+
+from decimal import Decimal
+from typing import Optional
+from app.config import settings
+from app.models.user import User
+from app.schemas.user import NutritionTargets
+from app.utils import metrics
+from app.utils.cache import TTLCache
+
+# Mifflin-St Jeor sex constants; "other" and unset use their midpoint
+BMR_SEX_OFFSET = {"male": 5, "female": -161}
+BMR_DEFAULT_OFFSET = -78
+# TDEE multipliers per activity level (unset counts as low)
+ACTIVITY_FACTORS = {"low": 1.2, "medium": 1.55, "high": 1.725}
+# Protein per kg of body weight, and share of calories from fat
+PROTEIN_G_PER_KG = 1.6
+FAT_CALORIE_SHARE = 0.3
+
+CENT = Decimal("0.01")
+
+# Targets keyed by user id, stored with the profile values they were derived
+# from so an outdated identity never returns another profile's targets
+targets_cache = TTLCache(
+    max_size=settings.TARGETS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TARGETS_CACHE_TTL_SECONDS,
+)
+metrics.register("targets_cache", targets_cache.stats)
+
+
+def _enum_value(value) -> Optional[str]:
+    """Plain string of an enum column value"""
+    return getattr(value, "value", value)
+
+
+def _profile_key(user: User) -> tuple:
+    """Profile values the targets depend on"""
+    return (
+        user.age,
+        _enum_value(user.gender),
+        user.height_cm,
+        user.weight_kg,
+        _enum_value(user.activity_level),
+    )
+
+
+def compute_targets(
+    age: Optional[int],
+    gender: Optional[str],
+    height_cm: Optional[Decimal],
+    weight_kg: Optional[Decimal],
+    activity_level: Optional[str],
+) -> Optional[NutritionTargets]:
+    """
+    Compute daily targets with the Mifflin-St Jeor equation.
+
+    Maintenance calories are the BMR times the activity factor. Protein is
+    set per kg of body weight, fat as a share of calories, and carbs take
+    the remaining calories.
+
+    Args:
+        age: Age in years
+        gender: "male", "female", "other" or None
+        height_cm: Height in centimetres
+        weight_kg: Weight in kilograms
+        activity_level: "low", "medium", "high" or None
+
+    Returns:
+        Targets, or None unless age, height and weight are all set
+    """
+    if not (age and height_cm and weight_kg):
+        return None
+
+    weight = float(weight_kg)
+    bmr = (
+        10 * weight
+        + 6.25 * float(height_cm)
+        - 5 * age
+        + BMR_SEX_OFFSET.get(gender, BMR_DEFAULT_OFFSET)
+    )
+    tdee = bmr * ACTIVITY_FACTORS.get(activity_level, ACTIVITY_FACTORS["low"])
+    protein_g = PROTEIN_G_PER_KG * weight
+    fats_g = tdee * FAT_CALORIE_SHARE / 9
+    carbs_g = max(tdee - protein_g * 4 - fats_g * 9, 0) / 4
+
+    def amount(value: float) -> Decimal:
+        return Decimal(value).quantize(CENT)
+
+    return NutritionTargets(
+        bmr=amount(bmr),
+        calories=amount(tdee),
+        protein_g=amount(protein_g),
+        carbs_g=amount(carbs_g),
+        fats_g=amount(fats_g),
+    )
+
+
+def get_targets(user: User) -> Optional[NutritionTargets]:
+    """
+    Get a user's daily targets, memoized per user.
+
+    Needs no query: the profile fields are read from the user instance.
+
+    Args:
+        user: User whose profile to use
+
+    Returns:
+        Targets, or None if the profile is incomplete
+    """
+    profile = _profile_key(user)
+    cached = targets_cache.get(user.id)
+    if cached is not None and cached[0] == profile:
+        return cached[1]
+
+    targets = compute_targets(*profile)
+    targets_cache.set(user.id, (profile, targets))
+    return targets
+
+
+def invalidate_targets(user_id: int) -> None:
+    """
+    Drop a user's memoized targets after a profile change.
+
+    Args:
+        user_id: User ID
+    """
+    targets_cache.invalidate(user_id)
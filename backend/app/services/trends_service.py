@@ -0,0 +1,214 @@
+"""Nutrition trend analytics computed with NumPy over the daily rollup"""
+
+from datetime import date, timedelta
+from typing import List, Optional
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import Float, select, type_coerce
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.daily_nutrition_total import DailyNutritionTotal
+from app.models.user import User
+from app.schemas.food_log import TrendsResponse
+from app.utils import metrics
+from app.utils.cache import TTLCache
+
+# Rolling average windows, in days
+TREND_WINDOWS = (7, 30)
+# Energy per gram of protein, carbs and fats
+MACRO_KCAL = np.array([4.0, 4.0, 9.0])
+MACRO_PCT_FIELDS = ("protein_pct", "carbs_pct", "fats_pct")
+# TrendDay fields in the order compute_trends produces them
+TREND_DAY_FIELDS = (
+    "date",
+    "entries_count",
+    "calories",
+    "protein_g",
+    "carbs_g",
+    "fats_g",
+    "calories_avg_7d",
+    "calories_avg_30d",
+    "calories_change",
+    *MACRO_PCT_FIELDS,
+)
+
+# Computed trends keyed by (user id, data version, start, end); a write bumps
+# the version, so entries are never stale and old ones age out LRU
+trends_cache = TTLCache(
+    max_size=settings.TRENDS_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TRENDS_CACHE_TTL_SECONDS,
+)
+metrics.register("trends_cache", trends_cache.stats)
+
+
+def _load_days(db: Session, user_id: int, first: date, end: date) -> np.ndarray:
+    """
+    Dense per-day totals from the rollup, one query for the whole window.
+
+    Returns:
+        Array of shape (days, 5): calories, protein, carbs, fats, entries
+    """
+    # Read the sums as floats: NumPy needs them so, and it skips building a
+    # Decimal per value
+    rows = db.execute(
+        select(
+            DailyNutritionTotal.day,
+            *(
+                type_coerce(getattr(DailyNutritionTotal, f"total_{name}"), Float)
+                for name in ("calories", "protein_g", "carbs_g", "fats_g")
+            ),
+            DailyNutritionTotal.entries_count,
+        ).where(
+            DailyNutritionTotal.user_id == user_id,
+            DailyNutritionTotal.day >= first,
+            DailyNutritionTotal.day <= end,
+        )
+    ).all()
+
+    dense = np.zeros(((end - first).days + 1, 5))
+    if rows:
+        offsets = np.fromiter(
+            (row[0].toordinal() for row in rows), dtype=np.int64, count=len(rows)
+        )
+        dense[offsets - first.toordinal()] = np.array(
+            [row[1:] for row in rows], dtype=float
+        )
+    return dense
+
+
+def _rolling_mean(values: np.ndarray, logged: np.ndarray, window: int) -> np.ndarray:
+    """Mean of values over the logged days of each trailing window (NaN if none)"""
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    counts = np.cumsum(np.concatenate(([0], logged)))
+    window_sums = sums[window:] - sums[:-window]
+    window_counts = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return window_sums / window_counts
+
+
+def _macro_split(grams: np.ndarray) -> np.ndarray:
+    """Percent of macro energy per row of (protein, carbs, fats) grams"""
+    kcal = grams * MACRO_KCAL
+    total = kcal.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return kcal / total * 100
+
+
+def _optional(values: np.ndarray) -> List[Optional[float]]:
+    """Round to 2 decimals and turn NaN into None"""
+    return [None if value != value else value for value in np.round(values, 2).tolist()]
+
+
+def compute_trends(
+    start: date, end: date, days: np.ndarray, lookback: int
+) -> TrendsResponse:
+    """
+    Compute trends from dense per-day totals.
+
+    Args:
+        start: First day reported
+        end: Last day reported
+        days: Per-day totals from lookback days before start through end
+        lookback: Number of leading rows that only feed the rolling windows
+
+    Returns:
+        Per-day statistics and range aggregates
+    """
+    logged = days[:, 4] > 0
+    calories = days[:, 0]
+    averages = {
+        window: _rolling_mean(calories, logged, window)[lookback - window + 1 :]
+        for window in TREND_WINDOWS
+    }
+    changes = np.diff(calories)[lookback - 1 :]
+
+    reported = days[lookback:]
+    reported_logged = logged[lookback:]
+    splits = _macro_split(reported[:, 1:4])
+    range_split = _macro_split(reported[:, 1:4].sum(axis=0))
+    logged_days = int(reported_logged.sum())
+
+    columns = zip(
+        ((start + timedelta(days=i)).isoformat() for i in range(len(reported))),
+        reported[:, 4].astype(int).tolist(),
+        *np.round(reported[:, :4], 2).T.tolist(),
+        _optional(averages[7]),
+        _optional(averages[30]),
+        np.round(changes, 2).tolist(),
+        *(_optional(column) for column in splits.T),
+    )
+    # One validation of plain dicts instead of a model instance per day
+    return TrendsResponse.model_validate(
+        {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "logged_days": logged_days,
+            "avg_calories": (
+                round(float(reported[reported_logged, 0].mean()), 2)
+                if logged_days
+                else None
+            ),
+            **dict(zip(MACRO_PCT_FIELDS, _optional(range_split))),
+            "days": [dict(zip(TREND_DAY_FIELDS, values)) for values in columns],
+        }
+    )
+
+
+def get_cached_trends(
+    user_id: int, data_version: int, start: date, end: date
+) -> Optional[TrendsResponse]:
+    """
+    Get trends computed at the user's current data version, if cached.
+
+    Args:
+        user_id: User ID
+        data_version: Current data version of the user
+        start: First day of the range
+        end: Last day of the range
+
+    Returns:
+        The cached trends, or None
+    """
+    return trends_cache.get((user_id, data_version, start, end))
+
+
+def get_trends(
+    db: Session, user: User, start: date, end: date, data_version: int
+) -> TrendsResponse:
+    """
+    Get rolling averages, macro split and day-over-day changes for a range.
+
+    The daily_nutrition_totals rows of the range, plus the days before it
+    that the 30-day window needs, are read with one query into a dense
+    NumPy array; every statistic is then computed with array operations.
+    Rolling averages only count days with entries, so unlogged days do not
+    drag them down. The result is cached under the user's data version.
+
+    Args:
+        db: Database session
+        user: Current user
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        data_version: Current data version of the user (cache key)
+
+    Returns:
+        Per-day statistics and range aggregates
+
+    Raises:
+        HTTPException: If the range is inverted or too long
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="end is before start"
+        )
+    if (end - start).days + 1 > settings.TRENDS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range is limited to {settings.TRENDS_MAX_DAYS} days",
+        )
+
+    lookback = max(TREND_WINDOWS)
+    days = _load_days(db, user.id, start - timedelta(days=lookback), end)
+    trends = compute_trends(start, end, days, lookback)
+    trends_cache.set((user.id, data_version, start, end), trends)
+    return trends
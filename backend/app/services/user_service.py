@@ -1,8 +1,34 @@
 """User service for profile management"""
 
+from typing import Optional
+from sqlalchemy import event, select, update
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models.user import User
 from app.schemas.user import UserUpdate
+from app.services import targets_service
+from app.utils import metrics
+from app.utils.cache import TTLCache
+
+# Detached User objects for authentication, keyed by user id. Each worker has
+# its own copy, so writes in another worker are seen after at most the TTL.
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+metrics.register("user_cache", user_cache.stats)
+
+# Per-user data versions behind ETags, keyed by user id. Commits in this
+# worker invalidate entries immediately; other workers' writes are seen after
+# at most the TTL.
+data_version_cache = TTLCache(
+    max_size=settings.DATA_VERSION_CACHE_MAX_SIZE,
+    ttl_seconds=settings.DATA_VERSION_CACHE_TTL_SECONDS,
+)
+metrics.register("data_version_cache", data_version_cache.stats)
+
+# Session.info key collecting the users whose version a transaction bumped
+_BUMPED_USERS = "bumped_data_versions"
 
 
 def get_user_by_id(db: Session, user_id: int) -> User:
@@ -19,6 +45,114 @@ def get_user_by_id(db: Session, user_id: int) -> User:
     return db.query(User).filter(User.id == user_id).first()
 
 
+def get_cached_user(user_id: int) -> Optional[User]:
+    """
+    Get an authenticated user from the identity cache.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Detached User instance, or None on a cache miss
+    """
+    return user_cache.get(user_id)
+
+
+def load_authenticated_user(db: Session, user_id: int) -> Optional[User]:
+    """
+    Load a user for authentication and populate the identity cache.
+
+    The instance is detached from the session so that commits made later in
+    the request cannot expire the copy shared through the cache.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
+    Returns:
+        Detached User instance, or None if the user does not exist
+    """
+    user = get_user_by_id(db, user_id)
+    if user is not None:
+        db.expunge(user)
+        user_cache.set(user.id, user)
+    return user
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """
+    Drop a user from the identity cache after their row changes.
+
+    Args:
+        user_id: User ID
+    """
+    user_cache.invalidate(user_id)
+
+
+def get_cached_data_version(user_id: int) -> Optional[int]:
+    """
+    Get a user's data version from the cache.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Data version, or None on a cache miss
+    """
+    return data_version_cache.get(user_id)
+
+
+def load_data_version(db: Session, user_id: int) -> int:
+    """
+    Read a user's data version and populate the cache.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
+    Returns:
+        Current data version (0 if the user does not exist)
+    """
+    version = db.scalar(select(User.data_version).where(User.id == user_id)) or 0
+    data_version_cache.set(user_id, version)
+    return version
+
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    """
+    Increment a user's data version in the caller's transaction.
+
+    Must be called by every write to the user's nutrition or profile data,
+    before the commit. The cached version is dropped once the transaction
+    commits.
+
+    Args:
+        db: Database session
+        user_id: User ID
+    """
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        # Keep updated_at as the profile's own modification time
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.info.setdefault(_BUMPED_USERS, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_bumped_versions(session: Session) -> None:
+    """Drop cached versions only after the bump is visible to other sessions"""
+    for user_id in session.info.pop(_BUMPED_USERS, ()):
+        data_version_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bumped_versions(session: Session) -> None:
+    """Forget bumps that were rolled back"""
+    session.info.pop(_BUMPED_USERS, None)
+
+
 def update_user_profile(db: Session, user: User, user_data: UserUpdate) -> User:
     """
     Update user profile.
@@ -31,13 +165,19 @@ def update_user_profile(db: Session, user: User, user_data: UserUpdate) -> User:
     Returns:
         Updated user instance
     """
+    # The authenticated user is a detached cached copy; update the row itself
+    db_user = db.get(User, user.id)
+
     # Update only provided fields
     update_data = user_data.model_dump(exclude_unset=True)
 
     for field, value in update_data.items():
-        setattr(user, field, value)
+        setattr(db_user, field, value)
 
+    bump_data_version(db, db_user.id)
     db.commit()
-    db.refresh(user)
+    db.refresh(db_user)
+    invalidate_cached_user(db_user.id)
+    targets_service.invalidate_targets(db_user.id)
 
-    return user
+    return db_user
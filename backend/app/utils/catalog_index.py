@@ -0,0 +1,360 @@
+"""Compact binary food catalog index, read through mmap"""
+
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Union
+import bisect
+import csv
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+# File layout (little-endian):
+#   header
+#   records    one fixed-size RECORD per food, ordered by catalog id
+#   by_name    u32 record positions, ordered by normalised name then id
+#   strings    UTF-8 names, normalised names and serving descriptions
+MAGIC = b"FCAT"
+FORMAT_VERSION = 1
+# magic, version, food count, source size, source mtime_ns,
+# records offset, by_name offset, strings offset
+HEADER = struct.Struct("<4sHIQqIII")
+# id, (offset, length) of name, normalised name and serving description,
+# then calories, protein, carbs and fats in hundredths
+RECORD = struct.Struct("<IIHIHIHiiii")
+POSITION = struct.Struct("<I")
+
+CENT = Decimal("0.01")
+NUTRIENT_FIELDS = ("calories", "protein_g", "carbs_g", "fats_g")
+SourcePath = Union[str, Path]
+
+
+class CatalogFormatError(ValueError):
+    """The catalog source or index file is malformed"""
+
+
+@dataclass(frozen=True)
+class CatalogFood:
+    """One catalog food with its nutrients per serving"""
+
+    id: int
+    name: str
+    serving: str
+    calories: Decimal
+    protein_g: Decimal
+    carbs_g: Decimal
+    fats_g: Decimal
+
+
+def normalize_name(name: str) -> str:
+    """Key used for name lookup and prefix search"""
+    return " ".join(name.lower().split())
+
+
+def _source_stamp(source_path: SourcePath) -> tuple:
+    """(size, mtime_ns) identifying the version of a source file"""
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _read_source(source_path: SourcePath) -> List[dict]:
+    """Raw rows of a CSV file or a JSON array of objects"""
+    path = Path(source_path)
+    with open(path, newline="", encoding="utf-8") as source:
+        if path.suffix.lower() == ".json":
+            rows = json.load(source)
+            if not isinstance(rows, list):
+                raise CatalogFormatError("JSON catalog must be an array of objects")
+            return rows
+        return list(csv.DictReader(source))
+
+
+def _parse_food(line: int, row: dict) -> CatalogFood:
+    """Validate one source row"""
+    try:
+        nutrients = {
+            field: Decimal(str(row.get(field) or 0)).quantize(CENT)
+            for field in NUTRIENT_FIELDS
+        }
+        food = CatalogFood(
+            id=int(row["id"]),
+            name=str(row["name"]).strip(),
+            serving=str(row.get("serving") or "").strip(),
+            **nutrients,
+        )
+    except (KeyError, TypeError, ValueError, InvalidOperation) as exc:
+        raise CatalogFormatError(f"Invalid catalog row {line}: {exc!r}") from exc
+
+    if not food.name or food.id < 0 or any(v < 0 for v in nutrients.values()):
+        raise CatalogFormatError(f"Invalid catalog row {line}")
+    return food
+
+
+def compile_catalog(source_path: SourcePath, index_path: SourcePath) -> int:
+    """
+    Compile a CSV/JSON catalog into the binary index format.
+
+    Source rows need `id`, `name` and optionally `serving`, `calories`,
+    `protein_g`, `carbs_g`, `fats_g` (per serving). The index is written to
+    a temporary file and renamed into place, so readers never see a partial
+    file and concurrent compiles are harmless.
+
+    Args:
+        source_path: CSV or JSON catalog file
+        index_path: Binary index to write
+
+    Returns:
+        Number of foods compiled
+
+    Raises:
+        CatalogFormatError: If a row is invalid or an id is repeated
+    """
+    stamp = _source_stamp(source_path)
+    foods = sorted(
+        (_parse_food(i, row) for i, row in enumerate(_read_source(source_path), 1)),
+        key=lambda food: food.id,
+    )
+    for previous, food in zip(foods, foods[1:]):
+        if previous.id == food.id:
+            raise CatalogFormatError(f"Duplicate catalog id {food.id}")
+
+    strings = bytearray()
+
+    def add_string(value: str) -> tuple:
+        """Append to the string blob, returning (offset, length)"""
+        encoded = value.encode("utf-8")[:65535]
+        strings.extend(encoded)
+        return len(strings) - len(encoded), len(encoded)
+
+    records = bytearray()
+    for food in foods:
+        records += RECORD.pack(
+            food.id,
+            *add_string(food.name),
+            *add_string(normalize_name(food.name)),
+            *add_string(food.serving),
+            *(int(getattr(food, field) / CENT) for field in NUTRIENT_FIELDS),
+        )
+    by_name = sorted(
+        range(len(foods)), key=lambda i: (normalize_name(foods[i].name), foods[i].id)
+    )
+
+    records_offset = HEADER.size
+    by_name_offset = records_offset + len(records)
+    strings_offset = by_name_offset + POSITION.size * len(foods)
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        len(foods),
+        *stamp,
+        records_offset,
+        by_name_offset,
+        strings_offset,
+    )
+
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(header)
+            out.write(records)
+            out.write(b"".join(POSITION.pack(i) for i in by_name))
+            out.write(strings)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return len(foods)
+
+
+class _NameKeys(Sequence):
+    """Normalised names in by_name order, decoded on demand for bisect"""
+
+    def __init__(self, index: "CatalogIndex"):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, position: int) -> str:
+        return self._index._key(self._index._by_name(position))
+
+
+class CatalogIndex:
+    """
+    Read-only view of a compiled catalog.
+
+    The file is memory-mapped, so its pages live in the OS page cache and
+    are shared by every worker process that opens it; lookups decode only
+    the records they touch.
+    """
+
+    def __init__(self, index_path: SourcePath):
+        with open(index_path, "rb") as index_file:
+            try:
+                self._map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise CatalogFormatError("Empty catalog index") from exc
+        try:
+            (
+                magic,
+                version,
+                self._count,
+                size,
+                mtime_ns,
+                self._records_offset,
+                self._by_name_offset,
+                self._strings_offset,
+            ) = HEADER.unpack_from(self._map, 0)
+        except struct.error as exc:
+            self._map.close()
+            raise CatalogFormatError("Truncated catalog index") from exc
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise CatalogFormatError("Not a catalog index of this version")
+        self.source_stamp = (size, mtime_ns)
+        self._keys = _NameKeys(self)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Unmap the file"""
+        self._map.close()
+
+    def _record(self, position: int) -> tuple:
+        """Raw RECORD fields of the food at a position in id order"""
+        return RECORD.unpack_from(
+            self._map, self._records_offset + position * RECORD.size
+        )
+
+    def _by_name(self, position: int) -> int:
+        """Record position of the food at a position in name order"""
+        return POSITION.unpack_from(
+            self._map, self._by_name_offset + position * POSITION.size
+        )[0]
+
+    def _string(self, offset: int, length: int) -> str:
+        """Decode a string from the blob"""
+        start = self._strings_offset + offset
+        return self._map[start : start + length].decode("utf-8")
+
+    def _key(self, position: int) -> str:
+        """Normalised name of a record"""
+        record = self._record(position)
+        return self._string(record[3], record[4])
+
+    def _food(self, position: int) -> CatalogFood:
+        """Decode a record"""
+        record = self._record(position)
+        return CatalogFood(
+            id=record[0],
+            name=self._string(record[1], record[2]),
+            serving=self._string(record[5], record[6]),
+            **{
+                field: Decimal(value).scaleb(-2)
+                for field, value in zip(NUTRIENT_FIELDS, record[7:])
+            },
+        )
+
+    def get(self, catalog_id: int) -> Optional[CatalogFood]:
+        """
+        Look up a food by catalog id (binary search over the records).
+
+        Args:
+            catalog_id: Catalog id
+
+        Returns:
+            The food, or None if the id is unknown
+        """
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle)[0] < catalog_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._record(low)[0] == catalog_id:
+            return self._food(low)
+        return None
+
+    def _matching(self, prefix: str) -> Iterable[int]:
+        """Record positions whose normalised name starts with prefix"""
+        position = bisect.bisect_left(self._keys, prefix)
+        while position < self._count:
+            record_position = self._by_name(position)
+            if not self._key(record_position).startswith(prefix):
+                return
+            yield record_position
+            position += 1
+
+    def find(self, name: str) -> List[CatalogFood]:
+        """
+        Look up foods by exact name (case and spacing insensitive).
+
+        Args:
+            name: Food name
+
+        Returns:
+            Foods with that name, by catalog id
+        """
+        key = normalize_name(name)
+        return [
+            self._food(position)
+            for position in self._matching(key)
+            if self._key(position) == key
+        ]
+
+    def search(self, prefix: str, limit: int = 20) -> List[CatalogFood]:
+        """
+        Find foods whose name starts with prefix.
+
+        Args:
+            prefix: Name prefix (case and spacing insensitive)
+            limit: Maximum number of foods
+
+        Returns:
+            Matching foods in name order
+        """
+        foods = []
+        for position in self._matching(normalize_name(prefix)):
+            if len(foods) == limit:
+                break
+            foods.append(self._food(position))
+        return foods
+
+
+def open_catalog(
+    source_path: Optional[SourcePath], index_path: SourcePath
+) -> CatalogIndex:
+    """
+    Open a compiled catalog, compiling it first only if it is missing or
+    was built from a different version of the source file.
+
+    Args:
+        source_path: CSV or JSON catalog file (None to use the index as is)
+        index_path: Binary index file
+
+    Returns:
+        The opened index
+    """
+    if source_path is None or not os.path.exists(source_path):
+        return CatalogIndex(index_path)
+
+    if os.path.exists(index_path):
+        try:
+            index = CatalogIndex(index_path)
+        except CatalogFormatError:
+            index = None
+        if index is not None:
+            if index.source_stamp == _source_stamp(source_path):
+                return index
+            index.close()
+
+    compile_catalog(source_path, index_path)
+    return CatalogIndex(index_path)
@@ -0,0 +1,43 @@
+"""ETag helpers for conditional GETs"""
+
+from typing import Optional
+
+
+def make_etag(user_id: int, data_version: int) -> str:
+    """
+    Build the validator for a user's data at a given version.
+
+    The user id is part of the tag so that a browser shared between accounts
+    never revalidates one user's cached response with another user's version.
+
+    Args:
+        user_id: User ID
+        data_version: User's current data version
+
+    Returns:
+        Weak ETag header value
+    """
+    return f'W/"{user_id}-{data_version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match: Raw If-None-Match header, if any
+        etag: Current ETag
+
+    Returns:
+        True if the client's cached copy is still current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,192 @@
+"""Compressed columnar archive files of one month of food logs"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+import os
+import re
+import numpy as np
+
+# One np.savez_compressed file per month, rows ordered by (user_id,
+# logged_at, id). Columns:
+#   id, user_id                       int64
+#   calories, protein_g, carbs_g,     int64 hundredths (exact decimals)
+#   fats_g
+#   logged_at, created_at, updated_at int64 microseconds since the epoch of
+#                                     the stored (naive) value; NULL_TIME if
+#                                     NULL
+#   name_offsets, names               UTF-8 food names, concatenated, and
+#                                     the start of each (len(rows) + 1)
+FORMAT_VERSION = 1
+NUTRIENT_FIELDS = ("calories", "protein_g", "carbs_g", "fats_g")
+TIME_FIELDS = ("logged_at", "created_at", "updated_at")
+NULL_TIME = np.iinfo(np.int64).min
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+FILE_PATTERN = re.compile(r"^food_logs_(\d{4})_(\d{2})\.npz$")
+ArchivePath = Union[str, Path]
+
+
+def month_file_name(month: date) -> str:
+    """File name of a month's archive"""
+    return f"food_logs_{month.year:04d}_{month.month:02d}.npz"
+
+
+def list_months(archive_dir: ArchivePath) -> List[date]:
+    """
+    Months archived in a directory.
+
+    Args:
+        archive_dir: Archive directory
+
+    Returns:
+        First day of every archived month, oldest first
+    """
+    try:
+        names = os.listdir(archive_dir)
+    except FileNotFoundError:
+        return []
+    months = []
+    for name in names:
+        match = FILE_PATTERN.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def _micros(value: Optional[datetime]) -> int:
+    """Stored representation of a timestamp"""
+    if value is None:
+        return NULL_TIME
+    return (value.replace(tzinfo=None) - EPOCH) // MICROSECOND
+
+
+def _datetime(value: int) -> Optional[datetime]:
+    """Timestamp from its stored representation"""
+    if value == NULL_TIME:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+def write_month(path: ArchivePath, rows: Iterable[dict]) -> int:
+    """
+    Write rows of food logs to a month's archive file.
+
+    Args:
+        path: File to write (replaced atomically)
+        rows: Food log column values, ordered by (user_id, logged_at, id)
+
+    Returns:
+        Number of rows written
+    """
+    columns = {name: [] for name in ("id", "user_id", *NUTRIENT_FIELDS, *TIME_FIELDS)}
+    names = bytearray()
+    offsets = [0]
+    for row in rows:
+        columns["id"].append(row["id"])
+        columns["user_id"].append(row["user_id"])
+        for name in NUTRIENT_FIELDS:
+            columns[name].append(int(Decimal(row[name] or 0).scaleb(2)))
+        for name in TIME_FIELDS:
+            columns[name].append(_micros(row[name]))
+        names += row["food_name"].encode()
+        offsets.append(len(names))
+
+    arrays = {
+        name: np.array(values, dtype=np.int64) for name, values in columns.items()
+    }
+    arrays["name_offsets"] = np.array(offsets, dtype=np.int64)
+    arrays["names"] = np.frombuffer(bytes(names), dtype=np.uint8)
+    arrays["version"] = np.array([FORMAT_VERSION], dtype=np.int64)
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(columns["id"])
+
+
+class ArchivedMonth:
+    """A month's archive file loaded into memory"""
+
+    def __init__(self, path: ArchivePath):
+        with np.load(path) as data:
+            self.columns = {name: data[name] for name in data.files}
+        self._names = self.columns.pop("names").tobytes()
+        self._offsets = self.columns.pop("name_offsets")
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    @staticmethod
+    def id_bounds(path: ArchivePath) -> Tuple[int, int]:
+        """Smallest and largest id in a month's file, reading only that column"""
+        with np.load(path) as data:
+            ids = data["id"]
+        if not len(ids):
+            return 0, -1
+        return int(ids.min()), int(ids.max())
+
+    def user_range(self, user_id: int) -> Tuple[int, int]:
+        """Start and end positions of one user's rows"""
+        user_ids = self.columns["user_id"]
+        return (
+            int(np.searchsorted(user_ids, user_id, side="left")),
+            int(np.searchsorted(user_ids, user_id, side="right")),
+        )
+
+    def select(
+        self,
+        user_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        food_log_id: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Positions of a user's rows matching the filters, oldest first.
+
+        Args:
+            user_id: User ID
+            start: Minimum logged_at
+            end: Maximum logged_at
+            before: Only rows before this (logged_at, id) position
+            food_log_id: Only the row with this id
+
+        Returns:
+            Row positions
+        """
+        lo, hi = self.user_range(user_id)
+        positions = np.arange(lo, hi)
+        logged_at = self.columns["logged_at"][lo:hi]
+        mask = np.ones(hi - lo, dtype=bool)
+        if start is not None:
+            mask &= logged_at >= _micros(start)
+        if end is not None:
+            mask &= logged_at <= _micros(end)
+        if before is not None:
+            bound = _micros(before[0])
+            ids = self.columns["id"][lo:hi]
+            mask &= (logged_at < bound) | ((logged_at == bound) & (ids < before[1]))
+        if food_log_id is not None:
+            mask &= self.columns["id"][lo:hi] == food_log_id
+        return positions[mask]
+
+    def row(self, position: int) -> dict:
+        """Column values of one row, as read from the database"""
+        values = {
+            "id": int(self.columns["id"][position]),
+            "user_id": int(self.columns["user_id"][position]),
+            "food_name": self._names[
+                self._offsets[position] : self._offsets[position + 1]
+            ].decode(),
+        }
+        for name in NUTRIENT_FIELDS:
+            values[name] = Decimal(int(self.columns[name][position])).scaleb(-2)
+        for name in TIME_FIELDS:
+            values[name] = _datetime(int(self.columns[name][position]))
+        return values
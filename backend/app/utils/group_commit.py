@@ -0,0 +1,129 @@
+"""Group commit: concurrent single-row writes flushed as one transaction"""
+
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import time
+from app.database import AnySession, run_in_new_session
+from app.utils import metrics
+
+
+class _Batch:
+    """Items waiting for the same flush, with the futures of their callers"""
+
+    def __init__(self, session_factory: Callable[[], AnySession]):
+        self.session_factory = session_factory
+        self.items: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.opened_at = time.perf_counter()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class GroupCommitBuffer:
+    """
+    Queue writes and flush them together every max_delay_ms or max_rows.
+
+    Each flush runs ``flush_fn(db, items)`` in a session of its own, so one
+    transaction (one commit and fsync) covers the whole batch. flush_fn
+    returns one result per item; an item's result may be an exception, which
+    is raised to that item's caller only. If the flush itself fails, every
+    caller of the batch gets the error.
+
+    A batch is flushed at most max_delay_ms after its first item arrived.
+    Flushes do not wait for each other: a new batch opens as soon as the
+    previous one is handed off, so slow commits never add to the delay.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[Any, List[Any]], List[Any]],
+        max_rows: int,
+        max_delay_ms: float,
+    ):
+        self.flush_fn = flush_fn
+        self.max_rows = max_rows
+        self.max_delay_ms = max_delay_ms
+        self.queue_wait = metrics.LatencyRecorder()
+        self.flush_time = metrics.LatencyRecorder()
+        self.batches = 0
+        self.rows = 0
+        self.failed_batches = 0
+        # Open batch per event loop: futures belong to the loop they wait on
+        self._open: Dict[asyncio.AbstractEventLoop, _Batch] = {}
+        self._tasks = set()
+
+    async def submit(self, session_factory: Callable[[], AnySession], item: Any):
+        """
+        Queue an item for the next flush and wait for its result.
+
+        Args:
+            session_factory: Factory from get_session_factory, used if the
+                item opens a new batch
+            item: Argument for flush_fn
+
+        Returns:
+            The item's result from flush_fn
+
+        Raises:
+            Exception: The item's own error, or the error of the whole flush
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._open.get(loop)
+        if batch is None:
+            batch = self._open[loop] = _Batch(session_factory)
+            batch.timer = loop.call_later(
+                self.max_delay_ms / 1000, self._hand_off, loop, batch
+            )
+
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self.max_rows:
+            self._hand_off(loop, batch)
+
+        return await future
+
+    def _hand_off(self, loop: asyncio.AbstractEventLoop, batch: _Batch) -> None:
+        """Close a batch to new items and start flushing it"""
+        if self._open.get(loop) is not batch:
+            return
+        del self._open[loop]
+        batch.timer.cancel()
+        task = loop.create_task(self._flush(batch))
+        # Keep a reference until done: the loop only holds tasks weakly
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: _Batch) -> None:
+        """Write a batch and hand each caller its result"""
+        started = time.perf_counter()
+        self.queue_wait.observe((started - batch.opened_at) * 1000)
+        try:
+            results = await run_in_new_session(
+                batch.session_factory, self.flush_fn, batch.items
+            )
+        except Exception as exc:
+            self.failed_batches += 1
+            results = [exc] * len(batch.items)
+        self.flush_time.observe((time.perf_counter() - started) * 1000)
+        self.batches += 1
+        self.rows += len(batch.items)
+
+        for future, result in zip(batch.futures, results):
+            # A caller that went away (cancelled request) has no one to tell
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def metrics(self) -> dict:
+        """Batch counts, average batch size, queue wait and flush times"""
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "avg_batch_rows": round(self.rows / self.batches, 2) if self.batches else 0,
+            "failed_batches": self.failed_batches,
+            "queue_wait": self.queue_wait.snapshot(),
+            "flush_time": self.flush_time.snapshot(),
+        }
@@ -0,0 +1,67 @@
+"""In-process metrics registry exposed by the /metrics endpoint"""
+
+from collections import deque
+from typing import Callable, Dict
+import threading
+
+# Registered snapshot providers, keyed by section name
+_providers: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, provider: Callable[[], dict]) -> None:
+    """
+    Register a metrics provider.
+
+    Args:
+        name: Section name in the metrics snapshot
+        provider: Callable returning a JSON-serialisable dict
+    """
+    _providers[name] = provider
+
+
+def snapshot() -> dict:
+    """
+    Collect the current value of every registered provider.
+
+    Returns:
+        Mapping of section name to metrics dict
+    """
+    return {name: provider() for name, provider in _providers.items()}
+
+
+class LatencyRecorder:
+    """Thread-safe count/sum/max plus percentiles over a window of recent samples"""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Record one sample in milliseconds"""
+        with self._lock:
+            self._recent.append(value_ms)
+            self.count += 1
+            self.total_ms += value_ms
+            self.max_ms = max(self.max_ms, value_ms)
+
+    def snapshot(self) -> dict:
+        """Summary of the recorded samples"""
+        with self._lock:
+            recent = sorted(self._recent)
+            count, total, peak = self.count, self.total_ms, self.max_ms
+
+        def pct(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+        return {
+            "count": count,
+            "avg_ms": round(total / count, 3) if count else 0.0,
+            "p50_ms": round(pct(0.50), 3),
+            "p99_ms": round(pct(0.99), 3),
+            "max_ms": round(peak, 3),
+        }
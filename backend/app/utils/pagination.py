@@ -0,0 +1,92 @@
+"""Opaque keyset pagination cursors"""
+
+from datetime import datetime
+from typing import Tuple
+import base64
+import json
+
+
+def encode_cursor(logged_at: datetime, row_id: int) -> str:
+    """
+    Encode the (logged_at, id) position of the last row of a page.
+
+    Args:
+        logged_at: logged_at of the last row returned
+        row_id: id of the last row returned
+
+    Returns:
+        URL-safe opaque cursor string
+    """
+    raw = json.dumps({"t": logged_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        (logged_at, id) position to continue after
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), int(data["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+# (timestamp, id) position in a change feed
+FeedPosition = Tuple[datetime, int]
+
+
+def encode_sync_token(changes: FeedPosition, deletions: FeedPosition) -> str:
+    """
+    Encode how far a client has synced the change and deletion feeds.
+
+    Args:
+        changes: (updated_at, id) of the last change sent
+        deletions: (deleted_at, id) of the last tombstone sent
+
+    Returns:
+        URL-safe opaque sync token
+    """
+    raw = json.dumps(
+        {
+            "c": [changes[0].isoformat(), changes[1]],
+            "d": [deletions[0].isoformat(), deletions[1]],
+        },
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[FeedPosition, FeedPosition]:
+    """
+    Decode a token produced by encode_sync_token.
+
+    Args:
+        token: Opaque sync token
+
+    Returns:
+        (changes, deletions) positions to continue after
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        positions = []
+        for name in ("c", "d"):
+            timestamp, row_id = data[name]
+            positions.append((datetime.fromisoformat(timestamp), int(row_id)))
+        return positions[0], positions[1]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid sync token") from exc
@@ -0,0 +1,131 @@
+"""Dedicated process pool for bcrypt password hashing and verification"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+import asyncio
+import multiprocessing
+import threading
+import time
+from app.config import settings
+from app.utils import metrics
+from app.utils.security import hash_password, verify_password
+
+
+class PasswordHashQueueFull(Exception):
+    """Raised when the password pool has no free worker or queue slot"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+def _timed_call(fn, *args):
+    """Run fn in the worker, returning the wall-clock time it started"""
+    return time.time(), fn(*args)
+
+
+class PasswordHashPool:
+    """
+    Bounded process pool for bcrypt work.
+
+    Keeps password hashing off the shared threadpool (and out of the GIL) so
+    login and registration bursts cannot starve other routes. At most
+    ``workers + queue_depth`` jobs are admitted; beyond that callers get
+    PasswordHashQueueFull immediately instead of queueing unboundedly.
+    """
+
+    def __init__(self, workers: int, queue_depth: int, retry_after: int = 1):
+        self.workers = workers
+        self.capacity = workers + queue_depth
+        self.retry_after = retry_after
+        self.queue_wait = metrics.LatencyRecorder()
+        self.rejected = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use"""
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that is running an event loop
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reserve(self) -> None:
+        """Claim a slot or fail fast when the pool is saturated"""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise PasswordHashQueueFull(self.retry_after)
+            self._in_flight += 1
+
+    def _release(self, _future: Optional[Future] = None) -> None:
+        """Return a slot once a job has finished"""
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn, *args):
+        """
+        Run fn(*args) in a worker process.
+
+        Args:
+            fn: Picklable module-level function
+            *args: Arguments passed to fn
+
+        Returns:
+            Result of fn
+
+        Raises:
+            PasswordHashQueueFull: If every worker and queue slot is taken
+        """
+        self._reserve()
+        submitted_at = time.time()
+        try:
+            future = self._get_executor().submit(_timed_call, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Released from the future itself so a cancelled request still frees it
+        future.add_done_callback(self._release)
+
+        started_at, result = await asyncio.wrap_future(future)
+        self.queue_wait.observe(max(0.0, started_at - submitted_at) * 1000)
+        return result
+
+    async def hash_password(self, password: str) -> str:
+        """Hash a password using bcrypt in the pool"""
+        return await self.run(hash_password, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash in the pool"""
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def metrics(self) -> dict:
+        """Pool occupancy, rejections and queue wait times"""
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+        }
+
+
+# Global password pool instance
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_depth=settings.PASSWORD_HASH_QUEUE_DEPTH,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
+metrics.register("password_hashing", password_pool.metrics)
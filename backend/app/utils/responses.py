@@ -0,0 +1,30 @@
+"""orjson-based JSON response class"""
+
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+import orjson
+
+# UTC datetimes as "...Z", the way pydantic writes them
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def _encode_default(value: Any) -> Any:
+    """Encode the types orjson does not handle natively"""
+    # Decimals travel as strings keeping their scale ("95.50"), as in pydantic
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Produces the same bytes as the pydantic/stdlib encoders for this API's
+    payloads: compact separators, Decimals as strings, datetimes in ISO 8601
+    with UTC as "Z". Content may hold Decimal and datetime values directly.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_encode_default, option=ORJSON_OPTIONS)
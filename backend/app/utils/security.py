@@ -2,13 +2,26 @@
 
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
+import time
 from passlib.context import CryptContext
 from jose import jwt
 from app.config import settings
+from app.utils import metrics
+from app.utils.cache import TTLCache
 
 # Password hashing context with bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified token payloads keyed by SHA-256 of the token, each kept until the
+# token's own exp. Tied to the signing key it was verified with.
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+_token_cache_signing_key = (settings.SECRET_KEY, settings.ALGORITHM)
+metrics.register("token_cache", token_cache.stats)
+
 
 def hash_password(password: str) -> str:
     """
@@ -63,3 +76,42 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     )
 
     return encoded_jwt
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a JWT access token and return its claims.
+
+    Verified payloads are cached until the token expires, so repeat requests
+    with the same token skip signature verification. The cache is dropped
+    whenever SECRET_KEY or ALGORITHM changes.
+
+    Args:
+        token: Encoded JWT token
+
+    Returns:
+        Decoded token payload
+
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    global _token_cache_signing_key
+
+    signing_key = (settings.SECRET_KEY, settings.ALGORITHM)
+    if signing_key != _token_cache_signing_key:
+        token_cache.clear()
+        _token_cache_signing_key = signing_key
+
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(digest)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    # Only tokens with an expiry are cached, and never beyond it
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > time.time():
+        token_cache.set(digest, payload, ttl=exp - time.time())
+
+    return payload
@@ -0,0 +1,145 @@
+"""
+Concurrency benchmark: sync Session vs AsyncSession data layer.
+
+Fires authenticated requests at the app in-process with a fixed number of
+concurrent clients and reports p50/p99 latency for each mode side by side.
+Both modes run against the same SQLite file (pysqlite vs aiosqlite).
+
+Usage (from backend/):
+    python benchmarks/bench_db_modes.py --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+from app.main import app  # noqa: E402
+from app.database import Base, get_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.utils.security import create_access_token  # noqa: E402
+
+ENDPOINTS = ["/api/auth/me", "/api/nutrition/daily-summary?date=2026-01-25"]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def setup_database(path):
+    """Create the schema and a single user, returning its bearer token"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="bench@example.com", password_hash="x")
+    session.add(user)
+    session.commit()
+    token = create_access_token(data={"sub": str(user.id)})
+    session.close()
+    engine.dispose()
+    return token
+
+
+def sync_override(path):
+    """get_db override handing out blocking pysqlite sessions"""
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return override_get_db
+
+
+def async_override(path):
+    """get_db override handing out aiosqlite AsyncSessions"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as db:
+            yield db
+
+    return override_get_db
+
+
+async def run_load(token, total, concurrency):
+    """Issue `total` requests with `concurrency` workers, returning latencies"""
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    remaining = iter(range(total))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker():
+            for i in remaining:
+                start = time.perf_counter()
+                response = await client.get(
+                    ENDPOINTS[i % len(ENDPOINTS)], headers=headers
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        token = setup_database(path)
+
+        results = {}
+        for mode, override in (("sync", sync_override), ("async", async_override)):
+            app.dependency_overrides[get_db] = override(path)
+            start = time.perf_counter()
+            latencies = asyncio.run(run_load(token, args.requests, args.concurrency))
+            elapsed = time.perf_counter() - start
+            results[mode] = (latencies, elapsed)
+            app.dependency_overrides.clear()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'mode':<8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'req/s':>10}")
+    for mode, (latencies, elapsed) in results.items():
+        print(
+            f"{mode:<8}"
+            f"{statistics.median(latencies):>10.2f}"
+            f"{percentile(latencies, 99):>10.2f}"
+            f"{max(latencies):>10.2f}"
+            f"{len(latencies) / elapsed:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
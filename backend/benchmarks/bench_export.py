@@ -0,0 +1,70 @@
+"""
+Export memory benchmark: RSS while streaming a large food-log history.
+
+Loads one user with `--rows` entries into a SQLite file, then drains
+nutrition_service.export_food_logs and samples the process RSS every batch.
+A constant-memory export shows RSS growth that does not scale with rows.
+
+Usage (from backend/):
+    python benchmarks/bench_export.py --rows 1000000 --format ndjson
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.nutrition_service import export_food_logs  # noqa: E402
+from bench_pagination import load_rows  # noqa: E402
+
+
+def rss_mb():
+    """Current resident set size in MiB (Linux)"""
+    with open("/proc/self/statm") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        user = User(email="bench@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        load_rows(session, user.id, args.rows)
+        session.refresh(user)
+        session.expunge_all()
+
+        baseline = peak = rss_mb()
+        exported_bytes = 0
+        start = time.perf_counter()
+        for chunk in export_food_logs(session, user, args.format):
+            exported_bytes += len(chunk)
+            peak = max(peak, rss_mb())
+        elapsed = time.perf_counter() - start
+
+    print(f"{args.rows} rows exported as {args.format} in {elapsed:.1f}s")
+    print(f"output {exported_bytes / 2**20:.1f} MiB")
+    print(f"RSS before {baseline:.1f} MiB, peak {peak:.1f} MiB")
+    print(f"RSS growth {peak - baseline:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Food search benchmark: full-text index vs substring scan.
+
+Loads `--rows` food logs spread over `--users` users into a SQLite file
+(with the FTS5 index the models create) and times one user's searches
+through search_service.search_food_logs against the LIKE '%word%' query
+used for databases without a full-text index.
+
+Most entries reuse a few hundred common names, the rest come from a long
+tail of rarely eaten foods. The scan can stop early on common words (any
+recent entry matches, but unranked) and has to read the user's whole
+history for rare ones ("when did I last eat ..."); the indexed search only
+touches rows containing the words, so it stays fast for both.
+
+Loading 10M rows takes several minutes and about 2 GB of disk.
+
+Usage (from backend/):
+    python benchmarks/bench_food_search.py --rows 10000000 --users 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models.food_log import FoodLog  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import search_service  # noqa: E402
+from bench_pagination import time_call  # noqa: E402
+
+STYLES = ["", "Grilled", "Spicy", "Baked", "Homemade", "Fried", "Steamed", "Raw"]
+FOODS = [
+    "Paneer Tikka", "Chicken Curry", "Greek Yogurt", "Apple", "Banana Bread",
+    "Oatmeal", "Dal Makhani", "Salmon", "Brown Rice", "Egg Omelette",
+    "Masala Dosa", "Caesar Salad", "Peanut Butter Toast", "Lentil Soup",
+    "Quinoa Bowl", "Chocolate Milk", "Idli Sambar", "Beef Burrito",
+    "Tofu Stir Fry", "Mango Lassi",
+]  # fmt: skip
+SIDES = ["", "with Rice", "with Naan", "with Salad", "with Fries"]
+SYLLABLES = ["ka", "ri", "mo", "ta", "lu", "pe", "zo", "ne", "bi", "sa", "do", "ve"]
+TAIL_NAMES = 50000
+TAIL_SHARE = 0.1
+
+
+def tail_name(i):
+    """Deterministic made-up name of the i-th rare food"""
+    word = "".join(SYLLABLES[(i // 12**k) % 12] for k in range(5))
+    return f"{word.capitalize()} Stew"
+
+
+def load_rows(session, user_ids, rows, seed=1):
+    """Insert `rows` entries with names drawn from a small vocabulary"""
+    rng = random.Random(seed)
+    names = [
+        " ".join(part for part in (style, food, side) if part)
+        for style in STYLES
+        for food in FOODS
+        for side in SIDES
+    ]
+    start = datetime(2026, 1, 1)
+    batch = []
+    for i in range(rows):
+        if rng.random() < TAIL_SHARE:
+            food_name = tail_name(rng.randrange(TAIL_NAMES))
+        else:
+            food_name = rng.choice(names)
+        batch.append(
+            {
+                "user_id": user_ids[i % len(user_ids)],
+                "food_name": food_name,
+                "calories": 100 + i % 400,
+                "logged_at": start - timedelta(minutes=i),
+            }
+        )
+        if len(batch) == 50000:
+            session.execute(insert(FoodLog), batch)
+            session.commit()
+            batch = []
+    if batch:
+        session.execute(insert(FoodLog), batch)
+    session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--queries", default="paneer,grilled salmon,mango las,masala dosa with naa"
+    )
+    parser.add_argument("--rare", type=int, default=3, help="rare-food queries")
+    args = parser.parse_args()
+    queries = args.queries.split(",")
+    queries += [tail_name(i * 7919).split()[0].lower() for i in range(args.rare)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        users = [
+            User(email=f"bench{i}@example.com", password_hash="x")
+            for i in range(args.users)
+        ]
+        session.add_all(users)
+        session.commit()
+        load_rows(session, [user.id for user in users], args.rows)
+        user = users[0]
+        session.refresh(user)
+
+        def scan(query):
+            terms = search_service.search_terms(query)
+            statement = search_service._fallback_search(user, terms)
+            return list(
+                session.scalars(
+                    statement.order_by(
+                        FoodLog.logged_at.desc(), FoodLog.id.desc()
+                    ).limit(args.limit)
+                )
+            )
+
+        print(f"{args.rows} rows over {args.users} users, limit {args.limit}")
+        print(f"{'query':<20}{'fts ms':>10}{'scan ms':>10}")
+        for query in queries:
+            fts_ms = time_call(
+                lambda: search_service.search_food_logs(
+                    session, user, query, 0, args.limit
+                ),
+                args.repeat,
+            )
+            scan_ms = time_call(lambda: scan(query), args.repeat)
+            session.expunge_all()
+            print(f"{query:<20}{fts_ms:>10.2f}{scan_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Group commit benchmark: one transaction per create vs batched creates.
+
+Runs `--creates` single food-log creates from `--concurrency` concurrent
+clients (spread over `--users` users) against a SQLite file, where every
+commit is a journal write and fsync:
+
+- single: nutrition_service.create_food_log, one commit per entry
+- group: the group commit buffer, one commit per batch of queued entries
+
+and reports throughput, p50/p99 latency and the average batch size.
+
+Usage (from backend/):
+    python benchmarks/bench_group_commit.py --creates 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.database import Base, run_in_new_session  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.food_log import FoodLogCreate  # noqa: E402
+from app.services import nutrition_service  # noqa: E402
+from app.services.async_nutrition_service import (  # noqa: E402
+    create_food_log_grouped,
+    food_log_buffer,
+)
+from bench_db_modes import percentile  # noqa: E402
+
+
+async def run_load(factory, users, total, concurrency, grouped):
+    """Issue `total` creates with `concurrency` workers, returning latencies"""
+    latencies = []
+    remaining = iter(range(total))
+
+    async def worker():
+        for i in remaining:
+            user = users[i % len(users)]
+            food_data = FoodLogCreate(
+                food_name=f"Meal {i % 50}",
+                calories=100 + i % 400,
+                logged_at=datetime(2026, 1, 1 + i % 28, 12),
+            )
+            start = time.perf_counter()
+            if grouped:
+                await create_food_log_grouped(factory, user, food_data)
+            else:
+                await run_in_new_session(
+                    factory, nutrition_service.create_food_log, user, food_data
+                )
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--creates", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.creates} creates, {args.concurrency} concurrent clients")
+    print(f"{'mode':<8}{'rows/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'batch':>8}")
+    for grouped in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(
+                f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                connect_args={"check_same_thread": False, "timeout": 60},
+            )
+            Base.metadata.create_all(bind=engine)
+            factory = sessionmaker(autoflush=False, bind=engine)
+            session = factory()
+            users = [
+                User(email=f"bench{i}@example.com", password_hash="x")
+                for i in range(args.users)
+            ]
+            session.add_all(users)
+            session.commit()
+            for user in users:
+                session.refresh(user)
+            session.close()
+
+            batches, rows = food_log_buffer.batches, food_log_buffer.rows
+            start = time.perf_counter()
+            latencies = asyncio.run(
+                run_load(factory, users, args.creates, args.concurrency, grouped)
+            )
+            elapsed = time.perf_counter() - start
+            batch = (
+                (food_log_buffer.rows - rows) / (food_log_buffer.batches - batches)
+                if grouped
+                else 1
+            )
+            engine.dispose()
+
+        print(
+            f"{'group' if grouped else 'single':<8}"
+            f"{args.creates / elapsed:>10.0f}"
+            f"{percentile(latencies, 50):>10.2f}"
+            f"{percentile(latencies, 99):>10.2f}"
+            f"{batch:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Serialization benchmark: response encoders over 100-row list payloads.
+
+Times what each response path does after the endpoint returns, for lists of
+FoodLogResponse and DailySummaryResponse built from attribute objects (as
+ORM rows are):
+
+- pydantic: validate + dump_json, FastAPI's path for response_model routes
+  with the default response class
+- stdlib: validate + dump to JSON-ready Python + JSONResponse
+- orjson: validate + dump to JSON-ready Python + ORJSONResponse, the path
+  taken when ORJSON_RESPONSES makes it the app default
+- orjson-raw: ORJSONResponse over plain dicts of column values, as the
+  ?fields= listing returns
+
+Usage (from backend/):
+    python benchmarks/bench_json_responses.py --rows 100 --iterations 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from app.schemas.food_log import DailySummaryResponse, FoodLogResponse  # noqa: E402
+from app.utils.responses import ORJSONResponse  # noqa: E402
+
+
+def food_log_rows(count):
+    """Attribute objects shaped like FoodLog rows"""
+    start = datetime(2026, 1, 25, 12, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i,
+            user_id=1,
+            food_name=f"Food {i}",
+            calories=Decimal("95.50"),
+            protein_g=Decimal("1.20"),
+            carbs_g=Decimal("25.00"),
+            fats_g=Decimal("0.30"),
+            logged_at=start - timedelta(minutes=5 * i),
+            created_at=start,
+            updated_at=start,
+        )
+        for i in range(count)
+    ]
+
+
+def summary_rows(count):
+    """Attribute objects shaped like daily summaries"""
+    return [
+        SimpleNamespace(
+            date=f"2026-01-{1 + i % 28:02d}",
+            total_calories=Decimal("2100.50"),
+            total_protein_g=Decimal("120.00"),
+            total_carbs_g=Decimal("250.25"),
+            total_fats_g=Decimal("70.10"),
+            entries_count=5,
+        )
+        for i in range(count)
+    ]
+
+
+def per_call_us(fn, iterations):
+    """Average microseconds per fn() call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def encoders(model, rows):
+    """The response paths to compare, as zero-argument callables"""
+    adapter = TypeAdapter(List[model])
+
+    def validated():
+        return adapter.validate_python(rows, from_attributes=True)
+
+    raw = [vars(row) for row in rows]
+    return {
+        "pydantic": lambda: adapter.dump_json(validated()),
+        "stdlib": lambda: JSONResponse(adapter.dump_python(validated(), mode="json")),
+        "orjson": lambda: ORJSONResponse(adapter.dump_python(validated(), mode="json")),
+        "orjson-raw": lambda: ORJSONResponse(raw),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    payloads = {
+        "FoodLogResponse": (FoodLogResponse, food_log_rows(args.rows)),
+        "DailySummaryResponse": (DailySummaryResponse, summary_rows(args.rows)),
+    }
+
+    print(f"{args.rows}-row lists, {args.iterations} iterations, us/payload")
+    print(f"{'model':<22}{'encoder':<12}{'us':>10}")
+    for name, (model, rows) in payloads.items():
+        for encoder, fn in encoders(model, rows).items():
+            print(f"{name:<22}{encoder:<12}{per_call_us(fn, args.iterations):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
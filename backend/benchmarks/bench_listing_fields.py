@@ -0,0 +1,97 @@
+"""
+Listing benchmark: ORM + response model vs projected Core rows (?fields=).
+
+Loads one user with `--rows` food logs into a SQLite file and serializes the
+newest `--limit` entries repeatedly, the way each listing path does:
+
+- full: get_food_logs (ORM instances) validated and dumped as
+  List[FoodLogResponse], which is what FastAPI does for the response model
+- fields: get_food_log_fields (Core select of the requested columns) dumped
+  with ORJSONResponse
+
+Usage (from backend/):
+    python benchmarks/bench_listing_fields.py --rows 100000 --fields food_name,calories
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.food_log import FoodLogResponse  # noqa: E402
+from app.services.nutrition_service import (  # noqa: E402
+    get_food_log_fields,
+    get_food_logs,
+)
+from app.utils.responses import ORJSONResponse  # noqa: E402
+from bench_pagination import load_rows  # noqa: E402
+
+
+def rows_per_second(fn, rows, seconds):
+    """Serialized rows per second of fn() over roughly `seconds`"""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        calls += 1
+    return calls * rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--fields", default="food_name,calories")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    fields = args.fields.split(",")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        user = User(email="bench@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        load_rows(session, user.id, args.rows)
+        session.refresh(user)
+        session.expunge_all()
+
+        adapter = TypeAdapter(List[FoodLogResponse])
+
+        def full():
+            adapter.dump_json(
+                adapter.validate_python(
+                    get_food_logs(session, user, 0, args.limit), from_attributes=True
+                )
+            )
+            session.expunge_all()
+
+        def projected():
+            rows, _ = get_food_log_fields(session, user, fields, 0, args.limit)
+            ORJSONResponse(rows)
+
+        full_rate = rows_per_second(full, args.limit, args.seconds)
+        projected_rate = rows_per_second(projected, args.limit, args.seconds)
+
+    print(f"{args.rows} rows, pages of {args.limit}, fields={args.fields}")
+    print(f"{'path':<10}{'rows/s':>12}")
+    print(f"{'full':<10}{full_rate:>12.0f}")
+    print(f"{'fields':<10}{projected_rate:>12.0f}")
+    print(f"speedup {projected_rate / full_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
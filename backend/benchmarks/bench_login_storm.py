@@ -0,0 +1,140 @@
+"""
+Login storm benchmark: nutrition route latency while bcrypt is saturated.
+
+Measures /api/nutrition/daily-summary latency on its own and again while a
+burst of concurrent /api/auth/login calls is in progress. With bcrypt in the
+dedicated process pool the two distributions should stay close; logins
+beyond the pool's capacity are shed with 503 rather than queued.
+
+Usage (from backend/):
+    python benchmarks/bench_login_storm.py --logins 200 --reads 500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+from app.main import app  # noqa: E402
+from app.database import Base, get_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.utils.password_pool import password_pool  # noqa: E402
+from app.utils.security import create_access_token, hash_password  # noqa: E402
+
+SUMMARY_URL = "/api/nutrition/daily-summary?date=2026-01-25"
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def timed_reads(client, headers, total, concurrency):
+    """Issue summary reads and return their latencies in ms"""
+    latencies = []
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(SUMMARY_URL, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def run(args, token):
+    """Baseline reads, then the same reads during a login storm"""
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        # Warm the worker processes so spawn cost is not measured
+        await c.post(
+            "/api/auth/login",
+            data={"username": "bench@example.com", "password": "password123"},
+        )
+        baseline = await timed_reads(c, headers, args.reads, args.concurrency)
+
+        logins = [
+            c.post(
+                "/api/auth/login",
+                data={"username": "bench@example.com", "password": "password123"},
+            )
+            for _ in range(args.logins)
+        ]
+        storm = asyncio.gather(*logins)
+        under_load = await timed_reads(c, headers, args.reads, args.concurrency)
+        login_responses = await storm
+
+    shed = sum(1 for r in login_responses if r.status_code == 503)
+    return baseline, under_load, shed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        # NullPool: measure bcrypt contention, not the SQLite pool size
+        engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False},
+            poolclass=NullPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        session = factory()
+        user = User(
+            email="bench@example.com", password_hash=hash_password("password123")
+        )
+        session.add(user)
+        session.commit()
+        token = create_access_token(data={"sub": str(user.id)})
+        session.close()
+
+        def override_get_db():
+            db = factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            baseline, under_load, shed = asyncio.run(run(args, token))
+        finally:
+            app.dependency_overrides.clear()
+            password_pool.shutdown()
+
+    print(f"{args.logins} concurrent logins, {shed} shed with 503")
+    print(f"{'reads':<14}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, latencies in (("baseline", baseline), ("login storm", under_load)):
+        print(
+            f"{label:<14}"
+            f"{statistics.median(latencies):>10.2f}"
+            f"{percentile(latencies, 99):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
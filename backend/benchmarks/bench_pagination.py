@@ -0,0 +1,110 @@
+"""
+Pagination benchmark: OFFSET paging vs keyset cursor paging.
+
+Loads one user with `--rows` food logs into a SQLite file and times
+nutrition_service.get_food_logs at several page depths in both modes.
+Offset pages slow down linearly with depth; cursor pages stay flat.
+
+Usage (from backend/):
+    python benchmarks/bench_pagination.py --rows 1000000 --pages 1,100,10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models.food_log import FoodLog  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.nutrition_service import get_food_logs  # noqa: E402
+from app.utils.pagination import encode_cursor  # noqa: E402
+
+
+def load_rows(session, user_id, rows):
+    """Insert `rows` entries, one every five minutes going back in time"""
+    start = datetime(2026, 1, 1)
+    batch = []
+    for i in range(rows):
+        batch.append(
+            {
+                "user_id": user_id,
+                "food_name": f"Food {i % 500}",
+                "calories": 100 + i % 400,
+                "protein_g": 5,
+                "carbs_g": 10,
+                "fats_g": 3,
+                "logged_at": start - timedelta(minutes=5 * i),
+            }
+        )
+        if len(batch) == 50000:
+            session.execute(insert(FoodLog), batch)
+            batch = []
+    if batch:
+        session.execute(insert(FoodLog), batch)
+    session.commit()
+
+
+def time_call(fn, repeat):
+    """Best-of-`repeat` wall time of fn() in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--pages", default="1,100,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    pages = [int(p) for p in args.pages.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        user = User(email="bench@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        load_rows(session, user.id, args.rows)
+
+        print(f"{args.rows} rows, limit {args.limit}")
+        print(f"{'page':>8}{'offset ms':>12}{'cursor ms':>12}")
+        for page in pages:
+            skip = (page - 1) * args.limit
+            if skip >= args.rows:
+                continue
+
+            # Cursor of the last row of the previous page (setup, not timed)
+            cursor = None
+            if skip:
+                previous = get_food_logs(session, user, skip - 1, 1)[0]
+                cursor = encode_cursor(previous.logged_at, previous.id)
+
+            offset_ms = time_call(
+                lambda: get_food_logs(session, user, skip, args.limit), args.repeat
+            )
+            cursor_ms = time_call(
+                lambda: get_food_logs(session, user, 0, args.limit, cursor=cursor),
+                args.repeat,
+            )
+            session.expunge_all()
+            print(f"{page:>8}{offset_ms:>12.2f}{cursor_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
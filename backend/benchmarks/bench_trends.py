@@ -0,0 +1,149 @@
+"""
+Trends benchmark: NumPy over the daily rollup vs Python loops over FoodLog.
+
+Loads one user with `--years` of dense history (`--per-day` entries a day)
+into a SQLite file, backfills the daily totals rollup and times a trends
+request over the whole history:
+
+- numpy: trends_service.get_trends (one rollup query, array statistics),
+  without its result cache
+- cached: the same request at an unchanged data version
+- loops: every FoodLog of the range loaded through the ORM and the same
+  statistics computed with per-day Python loops
+
+Usage (from backend/):
+    python benchmarks/bench_trends.py --years 5 --per-day 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DATABASE", "bench")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models.food_log import FoodLog  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import rollup_service, trends_service  # noqa: E402
+from bench_pagination import time_call  # noqa: E402
+
+
+def load_history(session, user_id, start, days, per_day):
+    """Insert per_day entries for each of `days` days from start"""
+    batch = []
+    for day in range(days):
+        logged = datetime.combine(start + timedelta(days=day), datetime.min.time())
+        for meal in range(per_day):
+            batch.append(
+                {
+                    "user_id": user_id,
+                    "food_name": f"Meal {meal}",
+                    "calories": 150 + (day * 7 + meal * 31) % 400,
+                    "protein_g": 5 + meal,
+                    "carbs_g": 20 + day % 30,
+                    "fats_g": 3 + meal % 4,
+                    "logged_at": logged + timedelta(hours=6 + meal * 2),
+                }
+            )
+        if len(batch) >= 50000:
+            session.execute(insert(FoodLog), batch)
+            batch = []
+    if batch:
+        session.execute(insert(FoodLog), batch)
+    session.commit()
+
+
+def loop_trends(session, user, start, end):
+    """The same statistics from ORM objects with Python loops"""
+    first = start - timedelta(days=30)
+    totals = defaultdict(lambda: [0.0, 0.0, 0.0, 0.0, 0])
+    entries = (
+        session.query(FoodLog)
+        .filter(
+            FoodLog.user_id == user.id,
+            FoodLog.logged_at >= first,
+            FoodLog.logged_at < end + timedelta(days=1),
+        )
+        .all()
+    )
+    for entry in entries:
+        day = totals[entry.logged_at.date()]
+        day[0] += float(entry.calories)
+        day[1] += float(entry.protein_g)
+        day[2] += float(entry.carbs_g)
+        day[3] += float(entry.fats_g)
+        day[4] += 1
+
+    result = []
+    day = start
+    while day <= end:
+        row = {"date": day, "calories": totals[day][0]}
+        for window in (7, 30):
+            logged = [
+                totals[day - timedelta(days=i)][0]
+                for i in range(window)
+                if totals[day - timedelta(days=i)][4]
+            ]
+            row[window] = sum(logged) / len(logged) if logged else None
+        row["change"] = totals[day][0] - totals[day - timedelta(days=1)][0]
+        kcal = [totals[day][1] * 4, totals[day][2] * 4, totals[day][3] * 9]
+        row["split"] = [k / sum(kcal) * 100 for k in kcal] if sum(kcal) else None
+        result.append(row)
+        day += timedelta(days=1)
+    session.expunge_all()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    end = date(2026, 1, 1)
+    start = end - timedelta(days=365 * args.years)
+    days = (end - start).days + 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        user = User(email="bench@example.com", password_hash="x")
+        session.add(user)
+        session.commit()
+        load_history(
+            session, user.id, start - timedelta(days=30), days + 30, args.per_day
+        )
+        rollup_service.backfill_daily_totals(session, user.id)
+        session.commit()
+        session.refresh(user)
+
+        def uncached():
+            trends_service.trends_cache.clear()
+            trends_service.get_trends(session, user, start, end, 0)
+
+        numpy_ms = time_call(uncached, args.repeat)
+        cached_ms = time_call(
+            lambda: trends_service.get_cached_trends(user.id, 0, start, end),
+            args.repeat,
+        )
+        loop_ms = time_call(lambda: loop_trends(session, user, start, end), 3)
+
+    print(f"{days} days x {args.per_day} entries ({days * args.per_day} rows)")
+    print(f"{'path':<8}{'ms':>10}")
+    print(f"{'numpy':<8}{numpy_ms:>10.2f}")
+    print(f"{'cached':<8}{cached_ms:>10.3f}")
+    print(f"{'loops':<8}{loop_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compile the food catalog into its memory-mapped binary index.
+
+Usage (from backend/):
+    python scripts/build_catalog.py [SOURCE] [--output INDEX]
+
+SOURCE defaults to FOOD_CATALOG_PATH and INDEX to FOOD_CATALOG_INDEX_PATH
+(or SOURCE with an .idx suffix). Run it at build/deploy time so that
+workers only map the index on startup; they recompile by themselves if the
+source file changes.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.utils.catalog_index import CatalogFormatError, compile_catalog  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", nargs="?", default=settings.FOOD_CATALOG_PATH)
+    parser.add_argument("--output", default=settings.FOOD_CATALOG_INDEX_PATH)
+    args = parser.parse_args()
+
+    if not args.source:
+        parser.error("no SOURCE given and FOOD_CATALOG_PATH is not set")
+    output = args.output or str(Path(args.source).with_suffix(".idx"))
+
+    try:
+        count = compile_catalog(args.source, output)
+    except (OSError, CatalogFormatError) as exc:
+        print(f"Failed to compile {args.source}: {exc}", file=sys.stderr)
+        return 1
+
+    size = os.path.getsize(output)
+    print(f"Compiled {count} foods into {output} ({size / 1024:.1f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
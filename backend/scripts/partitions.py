@@ -0,0 +1,78 @@
+"""
+Maintenance commands for the food_logs partitions and archive tier.
+
+Usage (from backend/), e.g. monthly from cron:
+    python scripts/partitions.py list
+    python scripts/partitions.py ensure [--months-ahead N]
+    python scripts/partitions.py archive [--older-than-months N]
+
+`list` prints the partitions of food_logs (MySQL, after migration 007) and
+the months in ARCHIVE_DIR. `ensure` creates the monthly partitions up to
+PARTITION_MONTHS_AHEAD months from now. `archive` moves every month older
+than ARCHIVE_AFTER_MONTHS to ARCHIVE_DIR, dropping its partition (or
+deleting its rows on an unpartitioned table).
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.services.archive_service import (  # noqa: E402
+    archive_old_months,
+    archived_months,
+)
+from app.services.partition_service import (  # noqa: E402
+    ensure_future_partitions,
+    list_partitions,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="show partitions and archived months")
+
+    ensure = commands.add_parser("ensure", help="create future partitions")
+    ensure.add_argument(
+        "--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD
+    )
+
+    archive = commands.add_parser("archive", help="move old months to the archive")
+    archive.add_argument(
+        "--older-than-months", type=int, default=settings.ARCHIVE_AFTER_MONTHS
+    )
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "list":
+            print(f"Partitions: {', '.join(list_partitions(db)) or 'none'}")
+            months = [month.strftime("%Y-%m") for month in archived_months()]
+            print(f"Archived months: {', '.join(months) or 'none'}")
+            return 0
+
+        if args.command == "ensure":
+            created = ensure_future_partitions(db, args.months_ahead)
+            print(f"Created {len(created)} partition(s) {' '.join(created)}")
+            return 0
+
+        if not settings.ARCHIVE_DIR:
+            print("ARCHIVE_DIR is not set", file=sys.stderr)
+            return 1
+        archived = archive_old_months(db, args.older_than_months)
+        for month, count in archived.items():
+            print(f"{month:%Y-%m}: {count} entries archived")
+        print(f"{len(archived)} month(s) archived")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
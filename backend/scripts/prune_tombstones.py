@@ -0,0 +1,27 @@
+"""
+Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS.
+
+Usage (from backend/), e.g. daily from cron:
+    python scripts/prune_tombstones.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal  # noqa: E402
+from app.services.sync_service import prune_tombstones  # noqa: E402
+
+
+def main():
+    db = SessionLocal()
+    try:
+        print(f"Pruned {prune_tombstones(db)} tombstone(s)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
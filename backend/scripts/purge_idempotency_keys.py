@@ -0,0 +1,27 @@
+"""
+Delete expired rows of the idempotency_keys table (IDEMPOTENCY_STORE=database).
+
+Usage (from backend/), e.g. hourly from cron:
+    python scripts/purge_idempotency_keys.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal  # noqa: E402
+from app.services.idempotency_service import purge_expired_keys  # noqa: E402
+
+
+def main():
+    db = SessionLocal()
+    try:
+        print(f"Purged {purge_expired_keys(db)} expired idempotency key(s)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
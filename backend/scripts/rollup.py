@@ -0,0 +1,57 @@
+"""
+Maintenance commands for the daily_nutrition_totals rollup.
+
+Usage (from backend/):
+    python scripts/rollup.py backfill [--user-id ID]
+    python scripts/rollup.py check [--user-id ID] [--repair]
+
+`backfill` rebuilds the rollup from food_logs, one user per transaction.
+`check` lists (user, day) rows that disagree with food_logs and, with
+--repair, recomputes them. It exits non-zero when drift is left unrepaired.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal  # noqa: E402
+from app.services.rollup_service import (  # noqa: E402
+    backfill_daily_totals,
+    check_daily_totals,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("backfill", help="rebuild the rollup")
+    backfill.add_argument("--user-id", type=int)
+
+    check = commands.add_parser("check", help="detect (and repair) drift")
+    check.add_argument("--user-id", type=int)
+    check.add_argument("--repair", action="store_true")
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "backfill":
+            users = backfill_daily_totals(db, args.user_id)
+            print(f"Rebuilt daily totals for {users} user(s)")
+            return 0
+
+        drifted = check_daily_totals(db, args.user_id, repair=args.repair)
+        for user_id, day in drifted:
+            print(f"user {user_id} {day.isoformat()}: drift")
+        action = "repaired" if args.repair else "found"
+        print(f"{len(drifted)} drifted day(s) {action}")
+        return 1 if drifted and not args.repair else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
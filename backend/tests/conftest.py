@@ -6,9 +6,15 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_session_factory
 from app.models.user import User
-from app.utils.security import hash_password
+from app.services.dashboard_service import dashboard_cache
+from app.services.idempotency_service import idempotency_store
+from app.services.suggest_service import suggest_indexes
+from app.services.targets_service import targets_cache
+from app.services.trends_service import trends_cache
+from app.services.user_service import data_version_cache, user_cache
+from app.utils.security import hash_password, token_cache
 
 # Create in-memory SQLite database for tests
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -21,6 +27,28 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Reset in-process caches so ids reused across tests never hit stale data"""
+    user_cache.clear()
+    token_cache.clear()
+    data_version_cache.clear()
+    suggest_indexes.clear()
+    trends_cache.clear()
+    targets_cache.clear()
+    dashboard_cache.clear()
+    idempotency_store.cache.clear()
+    yield
+    user_cache.clear()
+    token_cache.clear()
+    data_version_cache.clear()
+    suggest_indexes.clear()
+    trends_cache.clear()
+    targets_cache.clear()
+    dashboard_cache.clear()
+    idempotency_store.cache.clear()
+
+
 @pytest.fixture(scope="function")
 def db():
     """Create a fresh database for each test"""
@@ -44,6 +72,7 @@ def client(db):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
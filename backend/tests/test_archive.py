@@ -0,0 +1,210 @@
+"""Tests for the food log archive tier and partition maintenance"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from fastapi import status
+from app.config import settings
+from app.models.food_log import FoodLog
+from app.services import archive_service, partition_service
+from app.utils.food_log_archive import ArchivedMonth, write_month
+
+ENTRIES = [
+    ("Porridge", "2023-01-10T08:00"),
+    ("Soup", "2023-01-20T12:00"),
+    ("Stew", "2023-02-05T19:00"),
+    ("Salad", "2026-01-20T12:00"),
+]
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    """Enable the archive tier in a temporary directory"""
+    path = tmp_path / "archive"
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def archived(client, auth_headers, db, archive_dir):
+    """Log ENTRIES and archive everything older than 24 months"""
+    response = client.post(
+        "/api/nutrition/food-log/bulk",
+        headers=auth_headers,
+        json={
+            "items": [
+                {"food_name": name, "calories": 100 + i, "logged_at": logged_at}
+                for i, (name, logged_at) in enumerate(ENTRIES)
+            ]
+        },
+    )
+    ids = response.json()["ids"]
+    counts = archive_service.archive_old_months(db, 24)
+    return dict(zip((name for name, _ in ENTRIES), ids)), counts
+
+
+def _names(response):
+    return [food_log["food_name"] for food_log in response.json()]
+
+
+class TestArchive:
+    """Test moving old months out of the table"""
+
+    def test_archive_old_months(self, client, auth_headers, db, archived):
+        """Test old months leave the table but still count in summaries"""
+        _, counts = archived
+        assert counts[date(2023, 1, 1)] == 2
+        assert counts[date(2023, 2, 1)] == 1
+        assert max(counts) < date(2024, 10, 1)
+        assert [food_log.food_name for food_log in db.query(FoodLog)] == ["Salad"]
+        assert archive_service.horizon() == datetime(2024, 10, 1)
+
+        response = client.get(
+            "/api/nutrition/daily-summary",
+            headers=auth_headers,
+            params={"date": "2023-01-10"},
+        )
+        assert response.json()["entries_count"] == 1
+
+        # Nothing left to archive
+        assert archive_service.archive_old_months(db, 24) == {}
+
+    def test_listing_continues_into_archive(self, client, auth_headers, archived):
+        """Test pages run from the table into the archive, newest first"""
+        first = client.get(
+            "/api/nutrition/food-log", headers=auth_headers, params={"limit": 2}
+        )
+        assert _names(first) == ["Salad", "Stew"]
+
+        second = client.get(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+        )
+        assert _names(second) == ["Soup", "Porridge"]
+        assert second.json()[0]["calories"] == "101.00"
+
+        skipped = client.get(
+            "/api/nutrition/food-log", headers=auth_headers, params={"skip": 2}
+        )
+        assert _names(skipped) == ["Soup", "Porridge"]
+
+        in_range = client.get(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            params={
+                "start_date": "2023-01-15T00:00",
+                "end_date": "2023-12-31T00:00",
+                "fields": "id,food_name",
+            },
+        )
+        assert [row["food_name"] for row in in_range.json()] == ["Stew", "Soup"]
+
+    def test_archived_entries_are_read_only(self, client, auth_headers, archived):
+        """Test archived entries can be read but not changed or added to"""
+        ids, _ = archived
+        url = f"/api/nutrition/food-log/{ids['Soup']}"
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["food_name"] == "Soup"
+
+        response = client.put(url, headers=auth_headers, json={"calories": 1})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={"food_name": "Late", "calories": 1, "logged_at": "2023-03-01T08:00"},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        response = client.get("/api/nutrition/food-log/999999", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_archive_is_per_user(self, client, archived):
+        """Test another user sees none of the archived entries"""
+        ids, _ = archived
+        client.post(
+            "/api/auth/register",
+            json={"email": "other@example.com", "password": "password123"},
+        )
+        token = client.post(
+            "/api/auth/login",
+            data={"username": "other@example.com", "password": "password123"},
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        assert client.get("/api/nutrition/food-log", headers=headers).json() == []
+        response = client.get(f"/api/nutrition/food-log/{ids['Soup']}", headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_export_includes_archive(self, client, auth_headers, archived):
+        """Test the export streams archived entries before the table's"""
+        response = client.get("/api/nutrition/food-log/export", headers=auth_headers)
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["food_name"] for row in rows] == [name for name, _ in ENTRIES]
+        assert rows[0]["logged_at"] == "2023-01-10T08:00:00"
+
+
+class TestArchiveFile:
+    """Test the columnar month file format"""
+
+    def test_round_trip(self, tmp_path):
+        """Test values come back exactly, ordered lookups included"""
+        rows = [
+            {
+                "id": 7,
+                "user_id": 1,
+                "food_name": "Crème brûlée",
+                "calories": Decimal("512.25"),
+                "protein_g": Decimal("6.10"),
+                "carbs_g": None,
+                "fats_g": Decimal("0"),
+                "logged_at": datetime(2023, 1, 2, 20, 30),
+                "created_at": datetime(2023, 1, 2, 20, 31),
+                "updated_at": None,
+            },
+            {
+                "id": 3,
+                "user_id": 2,
+                "food_name": "Tea",
+                "calories": Decimal("1.00"),
+                "protein_g": Decimal("0"),
+                "carbs_g": Decimal("0"),
+                "fats_g": Decimal("0"),
+                "logged_at": datetime(2023, 1, 1, 8, 0),
+                "created_at": datetime(2023, 1, 1, 8, 0),
+                "updated_at": datetime(2023, 1, 1, 8, 0, 0, 123456),
+            },
+        ]
+        path = tmp_path / "food_logs_2023_01.npz"
+        assert write_month(path, rows) == 2
+
+        archived = ArchivedMonth(path)
+        assert len(archived) == 2
+        assert ArchivedMonth.id_bounds(path) == (3, 7)
+        first = archived.row(int(archived.select(1)[0]))
+        assert first == {**rows[0], "carbs_g": Decimal("0")}
+        assert archived.row(1)["updated_at"] == rows[1]["updated_at"]
+        assert len(archived.select(2, start=datetime(2023, 1, 2))) == 0
+        assert len(archived.select(3)) == 0
+
+
+class TestPartitions:
+    """Test the partition maintenance helpers"""
+
+    def test_partition_definition(self):
+        """Test monthly partition bounds, across a year end"""
+        assert partition_service.partition_definition(date(2026, 12, 1)) == (
+            "PARTITION p202612 VALUES LESS THAN ('2027-01-01')"
+        )
+        assert partition_service.partition_month("p202612") == date(2026, 12, 1)
+        assert partition_service.partition_month("pmax") is None
+        assert partition_service.add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+
+    def test_unpartitioned_table(self, db):
+        """Test maintenance is a no-op on a table without partitions"""
+        assert partition_service.list_partitions(db) == []
+        assert partition_service.ensure_future_partitions(db, 3) == []
+        assert not partition_service.drop_partition(db, date(2023, 1, 1))
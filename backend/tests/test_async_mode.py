@@ -0,0 +1,209 @@
+"""Tests for the async (AsyncSession) data layer"""
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.main import app
+from app.database import Base, get_db, get_session_factory
+from app.services import idempotency_service
+
+
+@pytest.fixture(scope="function")
+def async_client(tmp_path):
+    """Test client whose database dependency yields aiosqlite AsyncSessions"""
+    db_path = tmp_path / "async_mode.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: AsyncTestingSessionLocal
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+    sync_engine.dispose()
+
+
+@pytest.fixture
+def async_auth_headers(async_client):
+    """Register and log in a user through the async data layer"""
+    async_client.post(
+        "/api/auth/register",
+        json={"email": "async@example.com", "password": "password123"},
+    )
+    response = async_client.post(
+        "/api/auth/login",
+        data={"username": "async@example.com", "password": "password123"},
+    )
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestAsyncAuth:
+    """Test authentication through AsyncSession"""
+
+    def test_register_duplicate_email(self, async_client, async_auth_headers):
+        """Test duplicate registration is rejected"""
+        response = async_client.post(
+            "/api/auth/register",
+            json={"email": "async@example.com", "password": "password123"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_login_wrong_password(self, async_client, async_auth_headers):
+        """Test login with wrong password"""
+        response = async_client.post(
+            "/api/auth/login",
+            data={"username": "async@example.com", "password": "wrongpassword"},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_get_current_user(self, async_client, async_auth_headers):
+        """Test current user is resolved through the async session"""
+        response = async_client.get("/api/auth/me", headers=async_auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["email"] == "async@example.com"
+
+
+class TestAsyncNutrition:
+    """Test food log CRUD and summary through AsyncSession"""
+
+    def test_food_log_lifecycle(self, async_client, async_auth_headers):
+        """Test create, update, summary and delete of a food log"""
+        create_response = async_client.post(
+            "/api/nutrition/food-log",
+            headers=async_auth_headers,
+            json={
+                "food_name": "Apple",
+                "calories": 95,
+                "protein_g": 0.5,
+                "logged_at": "2026-01-25T12:00:00",
+            },
+        )
+        assert create_response.status_code == status.HTTP_201_CREATED
+        food_log_id = create_response.json()["id"]
+
+        response = async_client.put(
+            f"/api/nutrition/food-log/{food_log_id}",
+            headers=async_auth_headers,
+            json={"calories": 100},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert float(response.json()["calories"]) == 100
+
+        response = async_client.get(
+            "/api/nutrition/daily-summary?date=2026-01-25", headers=async_auth_headers
+        )
+        assert float(response.json()["total_calories"]) == 100
+        assert response.json()["entries_count"] == 1
+
+        response = async_client.delete(
+            f"/api/nutrition/food-log/{food_log_id}", headers=async_auth_headers
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = async_client.get(
+            "/api/nutrition/food-log", headers=async_auth_headers
+        )
+        assert response.json() == []
+
+    def test_export_streams_from_async_session(self, async_client, async_auth_headers):
+        """Test the export streams rows through AsyncSession.stream"""
+        async_client.post(
+            "/api/nutrition/food-log/bulk",
+            headers=async_auth_headers,
+            json={
+                "items": [
+                    {
+                        "food_name": f"Meal {i}",
+                        "calories": 100,
+                        "logged_at": "2026-01-25",
+                    }
+                    for i in range(3)
+                ]
+            },
+        )
+        response = async_client.get(
+            "/api/nutrition/food-log/export?format=csv", headers=async_auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.text.splitlines()) == 4
+
+
+class TestAsyncProfile:
+    """Test profile updates through AsyncSession"""
+
+    def test_update_profile(self, async_client, async_auth_headers):
+        """Test profile update is persisted"""
+        response = async_client.put(
+            "/api/profile", headers=async_auth_headers, json={"name": "Async User"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = async_client.get("/api/profile", headers=async_auth_headers)
+        assert response.json()["name"] == "Async User"
+
+
+class TestAsyncDashboard:
+    """Test the dashboard sections on separate AsyncSessions"""
+
+    def test_dashboard(self, async_client, async_auth_headers):
+        """Test every section is loaded through its own async session"""
+        async_client.post(
+            "/api/nutrition/food-log",
+            headers=async_auth_headers,
+            json={
+                "food_name": "Apple",
+                "calories": 95,
+                "logged_at": "2026-01-25T12:00",
+            },
+        )
+        response = async_client.get(
+            "/api/dashboard", headers=async_auth_headers, params={"date": "2026-01-25"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["profile"]["email"] == "async@example.com"
+        assert data["targets"] is None
+        assert data["today"]["entries_count"] == 1
+        assert data["recent_entries"][0]["food_name"] == "Apple"
+        assert len(data["week"]["buckets"]) == 7
+
+
+class TestAsyncIdempotency:
+    """Test the database key store on AsyncSessions"""
+
+    def test_retry_replays(self, async_client, async_auth_headers, monkeypatch):
+        """Test a retried create is replayed from the idempotency_keys table"""
+        monkeypatch.setattr(
+            idempotency_service,
+            "idempotency_store",
+            idempotency_service.DatabaseIdempotencyStore(ttl_seconds=60),
+        )
+        headers = {**async_auth_headers, "Idempotency-Key": "async-retry"}
+        food = {"food_name": "Pear", "calories": 60, "logged_at": "2026-01-25T12:00"}
+        first = async_client.post("/api/nutrition/food-log", headers=headers, json=food)
+        second = async_client.post(
+            "/api/nutrition/food-log", headers=headers, json=food
+        )
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert second.content == first.content
+        assert second.headers["Idempotent-Replayed"] == "true"
+        listing = async_client.get(
+            "/api/nutrition/food-log", headers=async_auth_headers
+        )
+        assert len(listing.json()) == 1
@@ -1,6 +1,13 @@
 """Tests for authentication endpoints"""
 
+import time
+from datetime import timedelta
+import pytest
 from fastapi import status
+from jose import JWTError
+from app.config import settings
+from app.utils.password_pool import password_pool
+from app.utils.security import create_access_token, decode_access_token, token_cache
 
 
 class TestRegistration:
@@ -103,3 +110,58 @@ class TestGetCurrentUser:
             "/api/auth/me", headers={"Authorization": "Bearer invalid_token"}
         )
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestPasswordHashPool:
+    """Test the dedicated bcrypt process pool"""
+
+    def test_login_rejected_when_pool_saturated(self, client, test_user, monkeypatch):
+        """Test login fails fast with 503 and Retry-After when the pool is full"""
+        monkeypatch.setattr(password_pool, "capacity", 0)
+        response = client.post(
+            "/api/auth/login",
+            data={"username": "test@example.com", "password": "password123"},
+        )
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+
+    def test_metrics_report_queue_wait(self, client, auth_headers):
+        """Test hash queue wait time is exposed after a login"""
+        response = client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["password_hashing"]
+        assert data["queue_wait"]["count"] >= 1
+        assert data["in_flight"] == 0
+
+
+class TestTokenCache:
+    """Test the decoded-JWT verification cache"""
+
+    def test_repeat_token_served_from_cache(self):
+        """Test a token is verified once and then served from the cache"""
+        token = create_access_token(data={"sub": "1"})
+        first = decode_access_token(token)
+        hits = token_cache.hits
+
+        assert decode_access_token(token) == first
+        assert token_cache.hits == hits + 1
+
+    def test_expired_entry_never_served(self):
+        """Test a cached token is rejected once its exp passes"""
+        token = create_access_token(
+            data={"sub": "1"}, expires_delta=timedelta(seconds=1)
+        )
+        decode_access_token(token)
+        time.sleep(2)
+
+        with pytest.raises(JWTError):
+            decode_access_token(token)
+
+    def test_secret_key_rotation_clears_cache(self, monkeypatch):
+        """Test tokens signed with a rotated-out key stop validating"""
+        token = create_access_token(data={"sub": "1"})
+        decode_access_token(token)
+
+        monkeypatch.setattr(settings, "SECRET_KEY", "rotated-secret-key")
+        with pytest.raises(JWTError):
+            decode_access_token(token)
@@ -0,0 +1,204 @@
+"""Tests for the food catalog and its binary index"""
+
+import json
+import os
+from decimal import Decimal
+import pytest
+from fastapi import status
+from app.config import settings
+from app.services import catalog_service
+from app.utils import catalog_index
+from app.utils.catalog_index import (
+    CatalogFormatError,
+    CatalogIndex,
+    compile_catalog,
+    open_catalog,
+)
+
+CATALOG_CSV = """id,name,serving,calories,protein_g,carbs_g,fats_g
+3,Paneer,100 g,265,18.3,1.2,20.8
+1,Apple,1 medium,95,0.5,25,0.3
+7,Apple Pie,1 slice,296,2.4,42.5,13.8
+2,Banana,1 medium,105,1.3,27,0.4
+9,apple,100 g,52,0.3,13.8,0.2
+"""
+
+
+@pytest.fixture
+def catalog_csv(tmp_path):
+    """Catalog source file in CSV format"""
+    path = tmp_path / "catalog.csv"
+    path.write_text(CATALOG_CSV)
+    return path
+
+
+@pytest.fixture
+def catalog(catalog_csv, tmp_path):
+    """Compiled and opened catalog index"""
+    index = open_catalog(catalog_csv, tmp_path / "catalog.idx")
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def configured_catalog(catalog_csv, monkeypatch):
+    """Point the application at the test catalog"""
+    monkeypatch.setattr(settings, "FOOD_CATALOG_PATH", str(catalog_csv))
+    catalog_service.close_catalog()
+    yield
+    catalog_service.close_catalog()
+
+
+class TestCatalogIndex:
+    """Test compiling and reading the binary index"""
+
+    def test_lookup_by_id(self, catalog):
+        """Test foods are found by id with exact nutrients"""
+        food = catalog.get(3)
+        assert food.name == "Paneer"
+        assert food.serving == "100 g"
+        assert food.calories == Decimal("265.00")
+        assert food.fats_g == Decimal("20.80")
+        assert catalog.get(4) is None
+        assert catalog.get(100) is None
+        assert len(catalog) == 5
+
+    def test_prefix_search(self, catalog):
+        """Test prefix search is case-insensitive and in name order"""
+        assert [food.id for food in catalog.search("APP")] == [1, 9, 7]
+        assert [food.id for food in catalog.search("app", limit=2)] == [1, 9]
+        assert catalog.search("cherry") == []
+
+    def test_exact_name_lookup(self, catalog):
+        """Test exact lookup ignores case but not extra words"""
+        assert [food.id for food in catalog.find("apple")] == [1, 9]
+        assert catalog.find("appl") == []
+
+    def test_json_source(self, tmp_path):
+        """Test JSON arrays compile like CSV"""
+        source = tmp_path / "catalog.json"
+        source.write_text(json.dumps([{"id": 5, "name": "Rice", "calories": 130}]))
+        assert compile_catalog(source, tmp_path / "catalog.idx") == 1
+        index = CatalogIndex(tmp_path / "catalog.idx")
+        assert index.get(5).protein_g == Decimal("0.00")
+        index.close()
+
+    def test_invalid_source(self, tmp_path):
+        """Test bad rows and duplicate ids are reported"""
+        source = tmp_path / "catalog.csv"
+        source.write_text("id,name,calories\n1,Apple,abc\n")
+        with pytest.raises(CatalogFormatError):
+            compile_catalog(source, tmp_path / "catalog.idx")
+
+        source.write_text("id,name,calories\n1,Apple,95\n1,Pear,60\n")
+        with pytest.raises(CatalogFormatError):
+            compile_catalog(source, tmp_path / "catalog.idx")
+        assert not (tmp_path / "catalog.idx").exists()
+
+    def test_fresh_index_is_not_recompiled(self, catalog_csv, tmp_path, monkeypatch):
+        """Test opening a current index never parses the source file"""
+        open_catalog(catalog_csv, tmp_path / "catalog.idx").close()
+
+        def fail(*args):
+            raise AssertionError("source parsed")
+
+        monkeypatch.setattr(catalog_index, "_read_source", fail)
+        index = open_catalog(catalog_csv, tmp_path / "catalog.idx")
+        assert index.get(1).name == "Apple"
+        index.close()
+
+    def test_changed_source_is_recompiled(self, catalog_csv, tmp_path):
+        """Test an index built from an older source is rebuilt"""
+        open_catalog(catalog_csv, tmp_path / "catalog.idx").close()
+        catalog_csv.write_text(CATALOG_CSV + "11,Mango,1 cup,99,1.4,24.7,0.6\n")
+        os.utime(catalog_csv, ns=(0, 10**18))
+
+        index = open_catalog(catalog_csv, tmp_path / "catalog.idx")
+        assert index.get(11).name == "Mango"
+        index.close()
+
+
+class TestCatalogEndpoints:
+    """Test catalog search and catalog-based food logging"""
+
+    def test_search_and_get(self, client, auth_headers, configured_catalog):
+        """Test catalog search and lookup endpoints"""
+        response = client.get(
+            "/api/nutrition/catalog/search", headers=auth_headers, params={"q": "ban"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]["name"] == "Banana"
+
+        response = client.get(
+            "/api/nutrition/catalog/search",
+            headers=auth_headers,
+            params={"q": "Apple", "exact": True},
+        )
+        assert [food["id"] for food in response.json()] == [1, 9]
+
+        response = client.get("/api/nutrition/catalog/3", headers=auth_headers)
+        assert response.json()["calories"] == "265.00"
+        response = client.get("/api/nutrition/catalog/4", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_create_from_catalog(self, client, auth_headers, configured_catalog):
+        """Test macros are computed from the catalog and servings"""
+        response = client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={"catalog_id": 3, "servings": 1.5, "logged_at": "2026-01-25T12:00"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["food_name"] == "Paneer"
+        assert data["calories"] == "397.50"
+        assert data["protein_g"] == "27.45"
+
+        summary = client.get(
+            "/api/nutrition/daily-summary?date=2026-01-25", headers=auth_headers
+        ).json()
+        assert summary["total_calories"] == "397.50"
+
+    def test_catalog_rules(self, client, auth_headers, configured_catalog):
+        """Test unknown ids and client-supplied nutrients are rejected"""
+        for body in [
+            {"catalog_id": 4, "logged_at": "2026-01-25T12:00"},
+            {"catalog_id": 3, "calories": 10, "logged_at": "2026-01-25T12:00"},
+            {
+                "food_name": "Apple",
+                "servings": 2,
+                "calories": 95,
+                "logged_at": "2026-01-25",
+            },
+            {"food_name": "Apple", "logged_at": "2026-01-25T12:00"},
+        ]:
+            response = client.post(
+                "/api/nutrition/food-log", headers=auth_headers, json=body
+            )
+            assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY, body
+
+    def test_bulk_reports_unknown_catalog_id(
+        self, client, auth_headers, configured_catalog
+    ):
+        """Test a bad catalog id fails only its own item in partial mode"""
+        response = client.post(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={
+                "allow_partial": True,
+                "items": [
+                    {"catalog_id": 1, "logged_at": "2026-01-25T08:00"},
+                    {"catalog_id": 404, "logged_at": "2026-01-25T09:00"},
+                ],
+            },
+        )
+        data = response.json()
+        assert data["created_count"] == 1
+        assert data["errors"][0]["index"] == 1
+
+    def test_no_catalog_configured(self, client, auth_headers):
+        """Test the catalog is empty when none is configured"""
+        response = client.get(
+            "/api/nutrition/catalog/search", headers=auth_headers, params={"q": "a"}
+        )
+        assert response.json() == []
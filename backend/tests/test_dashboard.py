@@ -0,0 +1,110 @@
+"""Tests for the dashboard endpoint"""
+
+import threading
+from fastapi import status
+from app.services import dashboard_service, nutrition_service
+
+
+def _log(client, auth_headers, name, calories, logged_at):
+    client.post(
+        "/api/nutrition/food-log",
+        headers=auth_headers,
+        json={"food_name": name, "calories": calories, "logged_at": logged_at},
+    )
+
+
+class TestDashboard:
+    """Test the single-request dashboard"""
+
+    def test_all_sections(self, client, auth_headers):
+        """Test profile, targets, today, recent entries and week in one payload"""
+        _log(client, auth_headers, "Oats", 300, "2026-01-19T08:00")
+        _log(client, auth_headers, "Apple", 95, "2026-01-25T12:00")
+        _log(client, auth_headers, "Rice", 200, "2026-01-25T19:00")
+
+        response = client.get(
+            "/api/dashboard", headers=auth_headers, params={"date": "2026-01-25"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"]
+        data = response.json()
+
+        assert data["profile"]["email"] == "test@example.com"
+        assert data["targets"]["calories"] == "2555.56"
+        assert data["today"]["total_calories"] == "295.00"
+        assert data["today"]["remaining"]["calories"] == "2260.56"
+        assert [e["food_name"] for e in data["recent_entries"]] == [
+            "Rice",
+            "Apple",
+            "Oats",
+        ]
+        assert [b["date"] for b in data["week"]["buckets"]][0] == "2026-01-19"
+        assert [b["entries_count"] for b in data["week"]["buckets"]] == [
+            1,
+            0,
+            0,
+            0,
+            0,
+            0,
+            2,
+        ]
+
+    def test_sections_run_concurrently(self, client, auth_headers, monkeypatch):
+        """Test the three sections are in flight at the same time"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def together(fn):
+            def wrapper(*args):
+                barrier.wait()
+                return fn(*args)
+
+            return wrapper
+
+        monkeypatch.setattr(
+            nutrition_service,
+            "get_daily_summary",
+            together(nutrition_service.get_daily_summary),
+        )
+        monkeypatch.setattr(
+            nutrition_service,
+            "get_range_summary",
+            together(nutrition_service.get_range_summary),
+        )
+        monkeypatch.setattr(
+            dashboard_service,
+            "_recent_entries",
+            together(dashboard_service._recent_entries),
+        )
+
+        response = client.get("/api/dashboard", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_sections_cached_until_write(self, client, auth_headers, monkeypatch):
+        """Test cached sections open no session and a write refreshes them"""
+        params = {"date": "2026-01-25"}
+        client.get("/api/dashboard", headers=auth_headers, params=params)
+
+        opened = []
+        original = dashboard_service.run_in_new_session
+
+        def counting(session_factory, fn, *args):
+            opened.append(fn)
+            return original(session_factory, fn, *args)
+
+        monkeypatch.setattr(dashboard_service, "run_in_new_session", counting)
+        data = client.get("/api/dashboard", headers=auth_headers, params=params).json()
+        assert opened == []
+        assert data["recent_entries"] == []
+
+        _log(client, auth_headers, "Apple", 95, "2026-01-25T12:00")
+        data = client.get("/api/dashboard", headers=auth_headers, params=params).json()
+        assert len(opened) == 3
+        assert data["today"]["entries_count"] == 1
+
+    def test_not_modified(self, client, auth_headers):
+        """Test an unchanged dashboard is answered with 304"""
+        etag = client.get("/api/dashboard", headers=auth_headers).headers["ETag"]
+        response = client.get(
+            "/api/dashboard", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
@@ -0,0 +1,181 @@
+"""Tests for Idempotency-Key support on create endpoints"""
+
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import status
+from app.models.food_log import FoodLog
+from app.models.idempotency_key import IdempotencyKey
+from app.services import idempotency_service, nutrition_service
+
+FOOD = {"food_name": "Oats", "calories": 300, "logged_at": "2026-01-20T08:00"}
+
+
+class SerializedDatabaseStore(idempotency_service.DatabaseIdempotencyStore):
+    """
+    Database store whose calls never overlap.
+
+    The test database is one connection shared by every session, so a
+    request's poll could otherwise roll back another's transaction.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        super().__init__(ttl_seconds)
+        self.lock = asyncio.Lock()
+
+    async def claim(self, *args):
+        async with self.lock:
+            return await super().claim(*args)
+
+    async def get(self, *args):
+        async with self.lock:
+            return await super().get(*args)
+
+    async def complete(self, *args):
+        async with self.lock:
+            await super().complete(*args)
+
+    async def release(self, *args):
+        async with self.lock:
+            await super().release(*args)
+
+
+@pytest.fixture(params=["memory", "database"])
+def store(request, monkeypatch):
+    """Run a test against each key store"""
+    if request.param == "database":
+        monkeypatch.setattr(
+            idempotency_service,
+            "idempotency_store",
+            SerializedDatabaseStore(ttl_seconds=60),
+        )
+    return request.param
+
+
+def _post(client, auth_headers, key, json=FOOD):
+    return client.post(
+        "/api/nutrition/food-log",
+        headers={**auth_headers, "Idempotency-Key": key},
+        json=json,
+    )
+
+
+class TestIdempotentFoodLog:
+    """Test retried food log creates"""
+
+    def test_retry_replays_first_response(self, client, auth_headers, db, store):
+        """Test a retry gets the same bytes and creates nothing"""
+        first = _post(client, auth_headers, "retry-1")
+        second = _post(client, auth_headers, "retry-1")
+
+        assert first.status_code == second.status_code == status.HTTP_201_CREATED
+        assert second.content == first.content
+        assert "Idempotent-Replayed" not in first.headers
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert db.query(FoodLog).count() == 1
+
+        third = _post(client, auth_headers, "retry-2")
+        assert third.json()["id"] != first.json()["id"]
+        assert db.query(FoodLog).count() == 2
+
+    def test_key_reused_with_other_body(self, client, auth_headers, store):
+        """Test a key sent with a different body is rejected"""
+        _post(client, auth_headers, "reused")
+        response = _post(client, auth_headers, "reused", {**FOOD, "calories": 301})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_failed_write_frees_key(self, client, auth_headers, store):
+        """Test errors are not stored, so the retry runs again"""
+        body = {"catalog_id": 1, "logged_at": "2026-01-20T08:00"}
+        executed = idempotency_service.counters["executed"]
+        for _ in range(2):
+            response = _post(client, auth_headers, "failing", body)
+            assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+            assert "Idempotent-Replayed" not in response.headers
+        assert idempotency_service.counters["executed"] == executed
+
+    def test_concurrent_duplicate_waits(
+        self, client, auth_headers, db, store, monkeypatch
+    ):
+        """Test a duplicate sent during the first request waits for it"""
+        started = threading.Event()
+        create = nutrition_service.create_food_log
+
+        def slow_create(*args):
+            # Write first: the test database is one connection shared by
+            # both requests' threads, so only the wait may overlap
+            food_log = create(*args)
+            started.set()
+            time.sleep(0.3)
+            return food_log
+
+        monkeypatch.setattr(nutrition_service, "create_food_log", slow_create)
+        waited = idempotency_service.counters["waited"]
+        responses = {}
+        first = threading.Thread(
+            target=lambda: responses.update(first=_post(client, auth_headers, "dup"))
+        )
+        first.start()
+        assert started.wait(5)
+        responses["second"] = _post(client, auth_headers, "dup")
+        first.join()
+
+        assert responses["second"].status_code == status.HTTP_201_CREATED
+        assert responses["second"].content == responses["first"].content
+        assert idempotency_service.counters["waited"] == waited + 1
+        assert db.query(FoodLog).count() == 1
+
+    def test_keys_are_per_user(self, client, auth_headers, store):
+        """Test another user's key does not replay to this user"""
+        client.post(
+            "/api/auth/register",
+            json={"email": "other@example.com", "password": "password123"},
+        )
+        token = client.post(
+            "/api/auth/login",
+            data={"username": "other@example.com", "password": "password123"},
+        ).json()["access_token"]
+
+        mine = _post(client, auth_headers, "shared")
+        theirs = _post(client, {"Authorization": f"Bearer {token}"}, "shared")
+        assert "Idempotent-Replayed" not in theirs.headers
+        assert theirs.json()["id"] != mine.json()["id"]
+
+
+class TestIdempotentRegistration:
+    """Test retried registrations"""
+
+    def test_retry_replays_registration(self, client, db, store):
+        """Test a retried registration returns the created user again"""
+        payload = {"email": "new@example.com", "password": "password123"}
+        headers = {"Idempotency-Key": "signup-1"}
+        first = client.post("/api/auth/register", json=payload, headers=headers)
+        second = client.post("/api/auth/register", json=payload, headers=headers)
+
+        assert first.status_code == second.status_code == status.HTTP_201_CREATED
+        assert second.content == first.content
+        without_key = client.post("/api/auth/register", json=payload)
+        assert without_key.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestDatabaseStore:
+    """Test the idempotency_keys table maintenance"""
+
+    def test_purge_expired_keys(self, db):
+        """Test only expired rows are purged"""
+        now = int(time.time())
+        db.add_all(
+            [
+                IdempotencyKey(
+                    scope="user:1", key="old", fingerprint="x", expires_at=now - 1
+                ),
+                IdempotencyKey(
+                    scope="user:1", key="new", fingerprint="x", expires_at=now + 60
+                ),
+            ]
+        )
+        db.commit()
+
+        assert idempotency_service.purge_expired_keys(db) == 1
+        assert [row.key for row in db.query(IdempotencyKey)] == ["new"]
@@ -1,6 +1,25 @@
 """Tests for nutrition endpoints"""
 
-from fastapi import status
+import asyncio
+import csv
+import io
+import json
+import time
+from datetime import date, datetime
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy import event, update
+from app.config import settings
+from app.models.daily_nutrition_total import DailyNutritionTotal
+from app.models.user import User
+from app.schemas.food_log import FoodLogCreate
+from app.services import rollup_service
+from app.services.async_nutrition_service import (
+    create_food_log_grouped,
+    food_log_buffer,
+)
+from app.utils.pagination import encode_sync_token
+from tests.conftest import TestingSessionLocal
 
 
 class TestCreateFoodLog:
@@ -232,3 +251,1077 @@ class TestDailySummary:
         assert float(data["total_calories"]) == 200
         assert float(data["total_protein_g"]) == 1.8
         assert data["entries_count"] == 2
+
+    def test_progress_against_targets(self, client, auth_headers, db):
+        """Test remaining and percent of the profile targets, with no extra query"""
+        client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={
+                "food_name": "Thali",
+                "calories": 555.56,
+                "protein_g": 28,
+                "logged_at": "2026-01-25T12:00:00",
+            },
+        )
+        client.get("/api/nutrition/daily-summary?date=2026-01-25", headers=auth_headers)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            data = client.get(
+                "/api/nutrition/daily-summary?date=2026-01-25", headers=auth_headers
+            ).json()
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        # Only the rollup row is read
+        assert len(statements) == 1
+        assert data["remaining"]["calories"] == "2000.00"
+        assert data["remaining"]["protein_g"] == "84.00"
+        assert data["percent_of_target"]["calories"] == "21.7"
+        assert data["percent_of_target"]["protein_g"] == "25.0"
+
+    def test_no_progress_without_targets(self, client, db, test_user, auth_headers):
+        """Test an incomplete profile leaves the progress fields empty"""
+        db.execute(update(User).where(User.id == test_user.id).values(age=None))
+        db.commit()
+        data = client.get(
+            "/api/nutrition/daily-summary?date=2026-01-25", headers=auth_headers
+        ).json()
+        assert data["remaining"] is None
+        assert data["percent_of_target"] is None
+
+
+class TestBulkCreateFoodLogs:
+    """Test bulk food log ingestion"""
+
+    def test_bulk_create_success(self, client, auth_headers):
+        """Test all items are stored and their ids returned in order"""
+        items = [
+            {
+                "food_name": f"Meal {i}",
+                "calories": 100 + i,
+                "logged_at": f"2026-01-25T{8 + i:02d}:00:00",
+            }
+            for i in range(5)
+        ]
+        response = client.post(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={"items": items},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["created_count"] == 5
+        assert data["errors"] == []
+        assert len(set(data["ids"])) == 5
+
+        for i, food_log_id in enumerate(data["ids"]):
+            entry = client.get(
+                f"/api/nutrition/food-log/{food_log_id}", headers=auth_headers
+            ).json()
+            assert entry["food_name"] == f"Meal {i}"
+
+    def test_bulk_create_rejects_whole_batch_by_default(self, client, auth_headers):
+        """Test one invalid item rejects the batch unless partial mode is asked"""
+        response = client.post(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={
+                "items": [
+                    {"food_name": "Apple", "calories": 95, "logged_at": "2026-01-25"},
+                    {"food_name": "Bad", "calories": -1, "logged_at": "2026-01-25"},
+                ]
+            },
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["index"] == 1
+
+        listing = client.get("/api/nutrition/food-log", headers=auth_headers)
+        assert listing.json() == []
+
+    def test_bulk_create_partial(self, client, auth_headers):
+        """Test partial mode stores valid items and reports invalid ones"""
+        response = client.post(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={
+                "allow_partial": True,
+                "items": [
+                    {"food_name": "Apple", "calories": 95, "logged_at": "2026-01-25"},
+                    {"food_name": "Bad", "calories": -1, "logged_at": "2026-01-25"},
+                    {"food_name": "Pear", "calories": 60, "logged_at": "2026-01-25"},
+                ],
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["created_count"] == 2
+        assert data["ids"][1] is None
+        assert data["errors"][0]["index"] == 1
+        assert data["errors"][0]["errors"][0]["loc"] == ["calories"]
+
+    def test_bulk_create_too_many_items(self, client, auth_headers):
+        """Test batches above the configured limit are rejected"""
+        item = {"food_name": "Apple", "calories": 95, "logged_at": "2026-01-25"}
+        response = client.post(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={"items": [item] * (settings.FOOD_LOG_BULK_MAX_ITEMS + 1)},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def _create_week(client, auth_headers):
+    """Create one entry per day for 2026-01-19 .. 2026-01-25, returning ids"""
+    items = [
+        {
+            "food_name": f"Day {day}",
+            "calories": 100,
+            "logged_at": f"2026-01-{day}T12:00",
+        }
+        for day in range(19, 26)
+    ]
+    response = client.post(
+        "/api/nutrition/food-log/bulk", headers=auth_headers, json={"items": items}
+    )
+    return response.json()["ids"]
+
+
+class TestBulkUpdateFoodLogs:
+    """Test set-based bulk updates"""
+
+    def test_bulk_update_by_ids(self, client, auth_headers):
+        """Test updating a list of entries by id"""
+        ids = _create_week(client, auth_headers)
+        response = client.patch(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={"ids": ids[:3] + [9999], "changes": {"calories": 250}},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["affected_count"] == 3
+
+        entry = client.get(f"/api/nutrition/food-log/{ids[0]}", headers=auth_headers)
+        assert float(entry.json()["calories"]) == 250
+        entry = client.get(f"/api/nutrition/food-log/{ids[3]}", headers=auth_headers)
+        assert float(entry.json()["calories"]) == 100
+
+    def test_bulk_update_by_range(self, client, auth_headers):
+        """Test updating every entry inside a logged_at range"""
+        _create_week(client, auth_headers)
+        response = client.patch(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={
+                "start_date": "2026-01-20T00:00:00",
+                "end_date": "2026-01-21T23:59:59",
+                "changes": {"food_name": "Edited"},
+            },
+        )
+        assert response.json()["affected_count"] == 2
+
+    def test_bulk_update_requires_selection(self, client, auth_headers):
+        """Test an empty selection is refused rather than matching everything"""
+        response = client.patch(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={"changes": {"calories": 1}},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestBulkDeleteFoodLogs:
+    """Test set-based bulk deletes"""
+
+    def test_bulk_delete_by_range(self, client, auth_headers):
+        """Test clearing a range of entries in one request"""
+        _create_week(client, auth_headers)
+        response = client.post(
+            "/api/nutrition/food-log/bulk-delete",
+            headers=auth_headers,
+            json={
+                "start_date": "2026-01-19T00:00:00",
+                "end_date": "2026-01-23T23:59:59",
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["affected_count"] == 5
+
+        listing = client.get("/api/nutrition/food-log", headers=auth_headers)
+        assert len(listing.json()) == 2
+
+    def test_bulk_delete_by_ids(self, client, auth_headers):
+        """Test deleting a list of entries by id"""
+        ids = _create_week(client, auth_headers)
+        response = client.post(
+            "/api/nutrition/food-log/bulk-delete",
+            headers=auth_headers,
+            json={"ids": ids[:2]},
+        )
+        assert response.json()["affected_count"] == 2
+
+        entry = client.get(f"/api/nutrition/food-log/{ids[0]}", headers=auth_headers)
+        assert entry.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestCursorPagination:
+    """Test keyset (cursor) pagination of the food log listing"""
+
+    def test_walk_pages_with_cursor(self, client, auth_headers):
+        """Test following X-Next-Cursor visits every entry exactly once"""
+        items = [
+            # Pairs share a logged_at so ties must be broken by id
+            {
+                "food_name": f"Meal {i}",
+                "calories": 100,
+                "logged_at": f"2026-01-{10 + i // 2}",
+            }
+            for i in range(7)
+        ]
+        client.post(
+            "/api/nutrition/food-log/bulk", headers=auth_headers, json={"items": items}
+        )
+
+        seen, cursor = [], None
+        for _ in range(10):
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(
+                "/api/nutrition/food-log", headers=auth_headers, params=params
+            )
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(entry["food_name"] for entry in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert sorted(seen) == sorted(item["food_name"] for item in items)
+        assert len(seen) == len(set(seen))
+
+    def test_cursor_respects_date_filters(self, client, auth_headers):
+        """Test cursor pages stay inside start_date/end_date"""
+        _create_week(client, auth_headers)
+        params = {"limit": 2, "start_date": "2026-01-21T00:00:00"}
+        first = client.get(
+            "/api/nutrition/food-log", headers=auth_headers, params=params
+        )
+        params["cursor"] = first.headers["X-Next-Cursor"]
+        second = client.get(
+            "/api/nutrition/food-log", headers=auth_headers, params=params
+        )
+
+        names = [e["food_name"] for e in first.json() + second.json()]
+        assert names == ["Day 25", "Day 24", "Day 23", "Day 22"]
+
+    def test_last_page_has_no_cursor(self, client, auth_headers):
+        """Test a short page does not advertise a next cursor"""
+        _create_week(client, auth_headers)
+        response = client.get("/api/nutrition/food-log", headers=auth_headers)
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, client, auth_headers):
+        """Test a malformed cursor is rejected"""
+        response = client.get(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            params={"cursor": "not-a-cursor"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestSparseFieldsets:
+    """Test ?fields= projection of the food log listing"""
+
+    def test_only_requested_fields(self, client, auth_headers):
+        """Test rows carry exactly the requested fields, in the API format"""
+        client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={
+                "food_name": "Apple",
+                "calories": 95.5,
+                "logged_at": "2026-01-25T12:00:00",
+            },
+        )
+        full = client.get("/api/nutrition/food-log", headers=auth_headers).json()[0]
+
+        response = client.get(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            params={"fields": "food_name,calories,logged_at"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" in response.headers
+        assert response.json() == [
+            {key: full[key] for key in ("food_name", "calories", "logged_at")}
+        ]
+
+    def test_cursor_with_fields(self, client, auth_headers):
+        """Test paging works when the key columns are not requested"""
+        _create_week(client, auth_headers)
+        seen, cursor = [], None
+        for _ in range(5):
+            params = {"limit": 3, "fields": "food_name"}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(
+                "/api/nutrition/food-log", headers=auth_headers, params=params
+            )
+            seen.extend(row["food_name"] for row in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert seen == [f"Day {day}" for day in range(25, 18, -1)]
+
+    def test_unknown_field(self, client, auth_headers):
+        """Test unknown fields are rejected"""
+        response = client.get(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            params={"fields": "food_name,password_hash"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestExportFoodLogs:
+    """Test streaming export of food log history"""
+
+    def test_export_ndjson(self, client, auth_headers):
+        """Test NDJSON export contains every entry oldest first"""
+        _create_week(client, auth_headers)
+        response = client.get("/api/nutrition/food-log/export", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["food_name"] for line in lines] == [
+            f"Day {day}" for day in range(19, 26)
+        ]
+        assert lines[0]["calories"] == "100.00"
+
+    def test_export_csv_with_date_range(self, client, auth_headers):
+        """Test CSV export honours start_date/end_date"""
+        _create_week(client, auth_headers)
+        response = client.get(
+            "/api/nutrition/food-log/export",
+            headers=auth_headers,
+            params={
+                "format": "csv",
+                "start_date": "2026-01-20T00:00:00",
+                "end_date": "2026-01-21T23:59:59",
+            },
+        )
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0][:3] == ["id", "food_name", "calories"]
+        assert [row[1] for row in rows[1:]] == ["Day 20", "Day 21"]
+
+    def test_export_invalid_format(self, client, auth_headers):
+        """Test unknown export formats are rejected"""
+        response = client.get(
+            "/api/nutrition/food-log/export",
+            headers=auth_headers,
+            params={"format": "xml"},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestRangeSummary:
+    """Test bucketed range summaries"""
+
+    def test_daily_buckets_zero_filled(self, client, auth_headers):
+        """Test every day in the range is present, empty days zeroed"""
+        client.post(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={
+                "items": [
+                    {
+                        "food_name": "A",
+                        "calories": 100,
+                        "logged_at": "2026-01-20T08:00",
+                    },
+                    {"food_name": "B", "calories": 50, "logged_at": "2026-01-20T20:00"},
+                    {"food_name": "C", "calories": 70, "logged_at": "2026-01-22T12:00"},
+                ]
+            },
+        )
+        response = client.get(
+            "/api/nutrition/summary",
+            headers=auth_headers,
+            params={"start": "2026-01-19", "end": "2026-01-22"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        buckets = response.json()["buckets"]
+        assert [b["date"] for b in buckets] == [
+            "2026-01-19",
+            "2026-01-20",
+            "2026-01-21",
+            "2026-01-22",
+        ]
+        assert [float(b["total_calories"]) for b in buckets] == [0, 150, 0, 70]
+        assert [b["entries_count"] for b in buckets] == [0, 2, 0, 1]
+
+    def test_weekly_and_monthly_buckets(self, client, auth_headers):
+        """Test days are folded into ISO weeks and calendar months"""
+        _create_week(client, auth_headers)
+        weekly = client.get(
+            "/api/nutrition/summary",
+            headers=auth_headers,
+            params={"start": "2026-01-19", "end": "2026-02-01", "bucket": "week"},
+        ).json()["buckets"]
+        assert [b["date"] for b in weekly] == ["2026-01-19", "2026-01-26"]
+        assert [b["entries_count"] for b in weekly] == [7, 0]
+
+        monthly = client.get(
+            "/api/nutrition/summary",
+            headers=auth_headers,
+            params={"start": "2025-12-15", "end": "2026-01-31", "bucket": "month"},
+        ).json()["buckets"]
+        assert [b["date"] for b in monthly] == ["2025-12-01", "2026-01-01"]
+        assert float(monthly[1]["total_calories"]) == 700
+
+    def test_inverted_range(self, client, auth_headers):
+        """Test end before start is rejected"""
+        response = client.get(
+            "/api/nutrition/summary",
+            headers=auth_headers,
+            params={"start": "2026-01-22", "end": "2026-01-19"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestDailyRollup:
+    """Test the daily_nutrition_totals rollup is kept in step with food_logs"""
+
+    def _summary(self, client, auth_headers, day):
+        return client.get(
+            f"/api/nutrition/daily-summary?date={day}", headers=auth_headers
+        ).json()
+
+    def test_create_update_delete_keep_rollup(self, client, auth_headers, db):
+        """Test single-entry writes adjust the rollup, incl. moving days"""
+        food_log_id = client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={
+                "food_name": "Apple",
+                "calories": 95,
+                "protein_g": 0.5,
+                "logged_at": "2026-01-25T12:00:00",
+            },
+        ).json()["id"]
+        summary = self._summary(client, auth_headers, "2026-01-25")
+        assert float(summary["total_calories"]) == 95
+        assert summary["entries_count"] == 1
+
+        client.put(
+            f"/api/nutrition/food-log/{food_log_id}",
+            headers=auth_headers,
+            json={"calories": 120, "logged_at": "2026-01-24T20:00:00"},
+        )
+        assert self._summary(client, auth_headers, "2026-01-25")["entries_count"] == 0
+        summary = self._summary(client, auth_headers, "2026-01-24")
+        assert float(summary["total_calories"]) == 120
+        assert float(summary["total_protein_g"]) == 0.5
+        assert summary["entries_count"] == 1
+
+        client.delete(f"/api/nutrition/food-log/{food_log_id}", headers=auth_headers)
+        assert self._summary(client, auth_headers, "2026-01-24")["entries_count"] == 0
+        assert rollup_service.check_daily_totals(db) == []
+
+    def test_bulk_writes_keep_rollup(self, client, auth_headers, db):
+        """Test bulk create, update and delete leave no drift"""
+        ids = _create_week(client, auth_headers)
+        assert rollup_service.check_daily_totals(db) == []
+
+        client.patch(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={"ids": ids[:3], "changes": {"logged_at": "2026-01-25T08:00"}},
+        )
+        summary = self._summary(client, auth_headers, "2026-01-25")
+        assert summary["entries_count"] == 4
+        assert self._summary(client, auth_headers, "2026-01-19")["entries_count"] == 0
+
+        client.post(
+            "/api/nutrition/food-log/bulk-delete",
+            headers=auth_headers,
+            json={"start_date": "2026-01-25T00:00", "end_date": "2026-01-25T23:59"},
+        )
+        assert self._summary(client, auth_headers, "2026-01-25")["entries_count"] == 0
+        assert rollup_service.check_daily_totals(db) == []
+
+    def test_check_repairs_drift(self, client, auth_headers, db, test_user):
+        """Test the consistency checker finds and fixes tampered rows"""
+        _create_week(client, auth_headers)
+        db.execute(
+            update(DailyNutritionTotal)
+            .where(DailyNutritionTotal.day == date(2026, 1, 20))
+            .values(total_calories=1, entries_count=5)
+        )
+        db.commit()
+
+        drifted = rollup_service.check_daily_totals(db, test_user.id, repair=True)
+        assert drifted == [(test_user.id, date(2026, 1, 20))]
+        assert rollup_service.check_daily_totals(db) == []
+        summary = self._summary(client, auth_headers, "2026-01-20")
+        assert float(summary["total_calories"]) == 100
+        assert summary["entries_count"] == 1
+
+    def test_backfill_rebuilds_rollup(self, client, auth_headers, db):
+        """Test backfill recreates the rollup from food_logs"""
+        _create_week(client, auth_headers)
+        db.query(DailyNutritionTotal).delete()
+        db.commit()
+        assert len(rollup_service.check_daily_totals(db)) == 7
+
+        assert rollup_service.backfill_daily_totals(db) == 1
+        assert rollup_service.check_daily_totals(db) == []
+
+
+class TestConditionalGet:
+    """Test ETags and 304 responses on nutrition reads"""
+
+    def _get(self, client, auth_headers, etag=None):
+        headers = {**auth_headers, "If-None-Match": etag} if etag else auth_headers
+        return client.get(
+            "/api/nutrition/daily-summary?date=2026-01-25", headers=headers
+        )
+
+    def test_not_modified_skips_queries(self, client, auth_headers, db):
+        """Test a matching If-None-Match is answered without any SQL"""
+        etag = self._get(client, auth_headers).headers["ETag"]
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            response = self._get(client, auth_headers, etag)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert statements == []
+
+    def test_every_write_changes_etag(self, client, auth_headers):
+        """Test single and bulk writes all bump the data version"""
+        etags = [self._get(client, auth_headers).headers["ETag"]]
+        food_log_id = client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={"food_name": "Apple", "calories": 95, "logged_at": "2026-01-25"},
+        ).json()["id"]
+        etags.append(self._get(client, auth_headers).headers["ETag"])
+
+        client.put(
+            f"/api/nutrition/food-log/{food_log_id}",
+            headers=auth_headers,
+            json={"calories": 100},
+        )
+        etags.append(self._get(client, auth_headers).headers["ETag"])
+
+        ids = _create_week(client, auth_headers)
+        etags.append(self._get(client, auth_headers).headers["ETag"])
+
+        client.patch(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={"ids": ids, "changes": {"calories": 50}},
+        )
+        etags.append(self._get(client, auth_headers).headers["ETag"])
+
+        client.post(
+            "/api/nutrition/food-log/bulk-delete",
+            headers=auth_headers,
+            json={"ids": ids},
+        )
+        etags.append(self._get(client, auth_headers).headers["ETag"])
+
+        client.delete(f"/api/nutrition/food-log/{food_log_id}", headers=auth_headers)
+        etags.append(self._get(client, auth_headers).headers["ETag"])
+
+        assert len(set(etags)) == len(etags)
+
+    def test_stale_etag_gets_fresh_body(self, client, auth_headers):
+        """Test an outdated If-None-Match is answered with the new data"""
+        etag = self._get(client, auth_headers).headers["ETag"]
+        client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={"food_name": "Apple", "calories": 95, "logged_at": "2026-01-25"},
+        )
+
+        response = self._get(client, auth_headers, etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert float(response.json()["total_calories"]) == 95
+
+    def test_etag_is_per_user(self, client, auth_headers):
+        """Test another user's ETag never matches"""
+        client.post(
+            "/api/auth/register",
+            json={"email": "other@example.com", "password": "password123"},
+        )
+        token = client.post(
+            "/api/auth/login",
+            data={"username": "other@example.com", "password": "password123"},
+        ).json()["access_token"]
+        other_headers = {"Authorization": f"Bearer {token}"}
+
+        etag = self._get(client, auth_headers).headers["ETag"]
+        response = self._get(client, other_headers, etag)
+        assert response.status_code == status.HTTP_200_OK
+
+
+class TestFoodSuggestions:
+    """Test food name autocomplete from the in-memory history index"""
+
+    def _log(self, client, auth_headers, name, calories, logged_at):
+        return client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={"food_name": name, "calories": calories, "logged_at": logged_at},
+        ).json()["id"]
+
+    def _suggest(self, client, auth_headers, q):
+        response = client.get(
+            "/api/nutrition/foods/suggest", headers=auth_headers, params={"q": q}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    def test_ranked_by_frequency_and_recency(self, client, auth_headers):
+        """Test frequent recent foods rank first, with last-used macros"""
+        self._log(client, auth_headers, "Greek Yogurt", 100, "2026-01-10T08:00")
+        self._log(client, auth_headers, "Greek Yogurt", 120, "2026-01-20T08:00")
+        self._log(client, auth_headers, "Grapes", 60, "2026-01-20T10:00")
+        self._log(client, auth_headers, "Granola", 200, "2025-06-01T08:00")
+        self._log(client, auth_headers, "Granola", 200, "2025-06-02T08:00")
+        self._log(client, auth_headers, "Granola", 200, "2025-06-03T08:00")
+
+        suggestions = self._suggest(client, auth_headers, "gr")
+        assert [s["food_name"] for s in suggestions] == [
+            "Greek Yogurt",
+            "Grapes",
+            "Granola",
+        ]
+        assert suggestions[0]["uses"] == 2
+        assert float(suggestions[0]["calories"]) == 120
+
+    def test_matches_word_starts_case_insensitively(self, client, auth_headers):
+        """Test any word of the name can be completed"""
+        self._log(client, auth_headers, "Greek Yogurt", 100, "2026-01-10T08:00")
+        assert [s["food_name"] for s in self._suggest(client, auth_headers, "YOG")] == [
+            "Greek Yogurt"
+        ]
+        assert self._suggest(client, auth_headers, "urt") == []
+
+    def test_create_updates_loaded_index_without_queries(
+        self, client, auth_headers, db
+    ):
+        """Test new entries are searchable without rebuilding the index"""
+        self._suggest(client, auth_headers, "a")
+        self._log(client, auth_headers, "Apple", 95, "2026-01-25T12:00")
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            suggestions = self._suggest(client, auth_headers, "app")
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        assert [s["food_name"] for s in suggestions] == ["Apple"]
+        assert statements == []
+
+    def test_rename_and_delete_rebuild_index(self, client, auth_headers):
+        """Test changed and deleted entries do not linger in suggestions"""
+        food_log_id = self._log(client, auth_headers, "Aple", 95, "2026-01-25")
+        assert self._suggest(client, auth_headers, "apl")
+
+        client.put(
+            f"/api/nutrition/food-log/{food_log_id}",
+            headers=auth_headers,
+            json={"food_name": "Apple"},
+        )
+        assert self._suggest(client, auth_headers, "apl") == []
+        assert self._suggest(client, auth_headers, "appl")
+
+        client.delete(f"/api/nutrition/food-log/{food_log_id}", headers=auth_headers)
+        assert self._suggest(client, auth_headers, "appl") == []
+
+    def test_bulk_create_feeds_index(self, client, auth_headers):
+        """Test bulk-created entries are added to a loaded index"""
+        self._suggest(client, auth_headers, "d")
+        _create_week(client, auth_headers)
+        assert len(self._suggest(client, auth_headers, "day")) == 7
+
+
+class TestFoodLogSearch:
+    """Test full-text search over food log names"""
+
+    def _log(self, client, auth_headers, name, logged_at="2026-01-20T12:00"):
+        return client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={"food_name": name, "calories": 100, "logged_at": logged_at},
+        ).json()["id"]
+
+    def _search(self, client, auth_headers, q, **params):
+        response = client.get(
+            "/api/nutrition/food-log/search",
+            headers=auth_headers,
+            params={"q": q, **params},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return [entry["food_name"] for entry in response.json()]
+
+    def test_ranked_word_prefix_matches(self, client, auth_headers):
+        """Test whole words plus a trailing prefix match, best match first"""
+        self._log(client, auth_headers, "Palak Paneer with Butter Naan")
+        self._log(client, auth_headers, "Paneer")
+        self._log(client, auth_headers, "Paneer Tikka")
+        self._log(client, auth_headers, "Spinach Soup")
+
+        assert self._search(client, auth_headers, "paneer")[0] == "Paneer"
+        assert len(self._search(client, auth_headers, "PAN")) == 3
+        assert self._search(client, auth_headers, "paneer tik") == ["Paneer Tikka"]
+        assert self._search(client, auth_headers, "pan tikka") == []
+        assert self._search(client, auth_headers, "aneer") == []
+        assert self._search(client, auth_headers, '"*') == []
+
+    def test_ties_newest_first_and_paging(self, client, auth_headers):
+        """Test equally relevant hits page newest first"""
+        for day in range(10, 15):
+            self._log(client, auth_headers, "Apple", f"2026-01-{day}T08:00")
+
+        first = client.get(
+            "/api/nutrition/food-log/search",
+            headers=auth_headers,
+            params={"q": "apple", "limit": 2},
+        ).json()
+        second = client.get(
+            "/api/nutrition/food-log/search",
+            headers=auth_headers,
+            params={"q": "apple", "limit": 2, "skip": 2},
+        ).json()
+        assert [e["logged_at"][:10] for e in first + second] == [
+            "2026-01-14",
+            "2026-01-13",
+            "2026-01-12",
+            "2026-01-11",
+        ]
+
+    def test_index_follows_updates_and_deletes(self, client, auth_headers):
+        """Test renamed, bulk-renamed and deleted entries are reindexed"""
+        food_log_id = self._log(client, auth_headers, "Apple")
+        client.put(
+            f"/api/nutrition/food-log/{food_log_id}",
+            headers=auth_headers,
+            json={"food_name": "Banana"},
+        )
+        assert self._search(client, auth_headers, "apple") == []
+        assert self._search(client, auth_headers, "banana") == ["Banana"]
+
+        client.patch(
+            "/api/nutrition/food-log/bulk",
+            headers=auth_headers,
+            json={"ids": [food_log_id], "changes": {"food_name": "Cherry"}},
+        )
+        assert self._search(client, auth_headers, "cherry") == ["Cherry"]
+
+        client.delete(f"/api/nutrition/food-log/{food_log_id}", headers=auth_headers)
+        assert self._search(client, auth_headers, "cherry") == []
+
+    def test_only_own_entries(self, client, auth_headers):
+        """Test another user's entries are never returned"""
+        self._log(client, auth_headers, "Apple")
+        client.post(
+            "/api/auth/register",
+            json={"email": "other@example.com", "password": "password123"},
+        )
+        token = client.post(
+            "/api/auth/login",
+            data={"username": "other@example.com", "password": "password123"},
+        ).json()["access_token"]
+
+        assert self._search(client, {"Authorization": f"Bearer {token}"}, "apple") == []
+
+
+class TestTrends:
+    """Test rolling averages, macro split and day-over-day changes"""
+
+    def _log_days(self, client, auth_headers, calories_by_day):
+        items = [
+            {
+                "food_name": "Meal",
+                "calories": calories,
+                "protein_g": 100,
+                "carbs_g": 250,
+                "fats_g": 50,
+                "logged_at": f"{day}T12:00",
+            }
+            for day, calories in calories_by_day.items()
+        ]
+        client.post(
+            "/api/nutrition/food-log/bulk", headers=auth_headers, json={"items": items}
+        )
+
+    def _trends(self, client, auth_headers, start, end):
+        return client.get(
+            "/api/nutrition/trends",
+            headers=auth_headers,
+            params={"start": start, "end": end},
+        )
+
+    def test_statistics(self, client, auth_headers):
+        """Test averages skip unlogged days and include days before start"""
+        self._log_days(
+            client,
+            auth_headers,
+            {"2026-01-01": 2000, "2026-01-02": 2500, "2026-01-04": 1500},
+        )
+        response = self._trends(client, auth_headers, "2026-01-02", "2026-01-04")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["logged_days"] == 2
+        assert data["avg_calories"] == 2000
+        assert [day["date"] for day in data["days"]] == [
+            "2026-01-02",
+            "2026-01-03",
+            "2026-01-04",
+        ]
+        assert [day["calories_avg_7d"] for day in data["days"]] == [2250, 2250, 2000]
+        assert [day["calories_avg_30d"] for day in data["days"]] == [2250, 2250, 2000]
+        assert [day["calories_change"] for day in data["days"]] == [500, -2500, 1500]
+
+        # 400 + 1000 + 450 kcal from protein, carbs and fats
+        first, gap, _ = data["days"]
+        assert (first["protein_pct"], first["carbs_pct"], first["fats_pct"]) == (
+            21.62,
+            54.05,
+            24.32,
+        )
+        assert gap["entries_count"] == 0
+        assert gap["protein_pct"] is None
+        assert data["fats_pct"] == 24.32
+
+    def test_empty_history(self, client, auth_headers):
+        """Test a range without entries has no averages"""
+        data = self._trends(client, auth_headers, "2026-01-01", "2026-01-07").json()
+        assert data["logged_days"] == 0
+        assert data["avg_calories"] is None
+        assert len(data["days"]) == 7
+        assert all(day["calories_avg_30d"] is None for day in data["days"])
+
+    def test_cached_until_next_write(self, client, auth_headers, db):
+        """Test repeat requests run no query and writes invalidate them"""
+        self._log_days(client, auth_headers, {"2026-01-01": 2000})
+        self._trends(client, auth_headers, "2026-01-01", "2026-01-01")
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            data = self._trends(client, auth_headers, "2026-01-01", "2026-01-01").json()
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+        assert statements == []
+        assert data["avg_calories"] == 2000
+
+        self._log_days(client, auth_headers, {"2026-01-01": 1000})
+        data = self._trends(client, auth_headers, "2026-01-01", "2026-01-01").json()
+        assert data["avg_calories"] == 3000
+
+    def test_invalid_ranges(self, client, auth_headers):
+        """Test inverted and overlong ranges are rejected"""
+        response = self._trends(client, auth_headers, "2026-01-02", "2026-01-01")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = self._trends(client, auth_headers, "2016-01-01", "2026-01-01")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestGroupCommit:
+    """Test single creates written together by the group commit buffer"""
+
+    def _create_all(self, user, items):
+        async def create_all():
+            return await asyncio.gather(
+                *(
+                    create_food_log_grouped(
+                        TestingSessionLocal, user, FoodLogCreate(**item)
+                    )
+                    for item in items
+                ),
+                return_exceptions=True,
+            )
+
+        return asyncio.run(asyncio.wait_for(create_all(), timeout=5))
+
+    def _item(self, calories, **extra):
+        return {
+            "food_name": f"Snack {calories}",
+            "calories": calories,
+            "logged_at": "2026-01-20T12:00",
+            **extra,
+        }
+
+    def test_concurrent_creates_share_one_flush(
+        self, client, auth_headers, test_user, monkeypatch
+    ):
+        """Test creates queued together are written in one batch"""
+        monkeypatch.setattr(food_log_buffer, "max_delay_ms", 50)
+        batches = food_log_buffer.batches
+
+        created = self._create_all(test_user, [self._item(c) for c in (100, 200, 300)])
+
+        assert food_log_buffer.batches == batches + 1
+        assert [food_log.calories for food_log in created] == [100, 200, 300]
+        assert len({food_log.id for food_log in created}) == 3
+        summary = client.get(
+            "/api/nutrition/daily-summary",
+            headers=auth_headers,
+            params={"date": "2026-01-20"},
+        ).json()
+        assert summary["total_calories"] == "600.00"
+        assert summary["entries_count"] == 3
+
+    def test_full_batch_flushes_without_waiting(self, test_user, monkeypatch):
+        """Test max_rows starts the flush before max_delay_ms"""
+        monkeypatch.setattr(food_log_buffer, "max_delay_ms", 60000)
+        monkeypatch.setattr(food_log_buffer, "max_rows", 2)
+        batches = food_log_buffer.batches
+
+        created = self._create_all(test_user, [self._item(c) for c in range(1, 5)])
+
+        assert food_log_buffer.batches == batches + 2
+        assert [food_log.calories for food_log in created] == [1, 2, 3, 4]
+
+    def test_errors_reach_their_callers(self, test_user, monkeypatch):
+        """Test an invalid entry fails alone and a failed flush fails everyone"""
+        created = self._create_all(
+            test_user,
+            [self._item(100), {"catalog_id": 1, "logged_at": "2026-01-20T12:00"}],
+        )
+        assert created[0].calories == 100
+        assert isinstance(created[1], HTTPException)
+        assert created[1].status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        def broken(db, items):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(food_log_buffer, "flush_fn", broken)
+        failed = food_log_buffer.failed_batches
+        created = self._create_all(test_user, [self._item(1), self._item(2)])
+        assert all(isinstance(result, RuntimeError) for result in created)
+        assert food_log_buffer.failed_batches == failed + 1
+
+    @pytest.mark.parametrize("enabled", [False, True])
+    def test_create_route(self, client, auth_headers, monkeypatch, enabled):
+        """Test the create endpoint responds the same with group commit"""
+        monkeypatch.setattr(settings, "FOOD_LOG_GROUP_COMMIT", enabled)
+        batches = food_log_buffer.batches
+        response = client.post(
+            "/api/nutrition/food-log", headers=auth_headers, json=self._item(250)
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["food_name"] == "Snack 250"
+        assert response.json()["created_at"]
+        assert food_log_buffer.batches == batches + enabled
+
+
+class TestSync:
+    """Test the delta sync feed"""
+
+    @pytest.fixture(autouse=True)
+    def no_settle(self, monkeypatch):
+        monkeypatch.setattr(settings, "SYNC_SETTLE_SECONDS", 0)
+
+    def _log(self, client, auth_headers, name):
+        return client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={"food_name": name, "calories": 100, "logged_at": "2026-01-20T12:00"},
+        ).json()["id"]
+
+    def _sync(self, client, auth_headers, since=None, **params):
+        # Let the current second end, so its rows have settled
+        time.sleep(1.05)
+        if since is not None:
+            params["since"] = since
+        return client.get("/api/nutrition/sync", headers=auth_headers, params=params)
+
+    def test_full_then_delta_sync(self, client, auth_headers):
+        """Test a sync returns only what changed since the token"""
+        ids = [self._log(client, auth_headers, name) for name in "ABCD"]
+        data = self._sync(client, auth_headers).json()
+        assert [c["id"] for c in data["changes"]] == ids
+        assert data["deleted_ids"] == []
+        assert data["has_more"] is False
+
+        client.put(
+            f"/api/nutrition/food-log/{ids[1]}",
+            headers=auth_headers,
+            json={"calories": 150},
+        )
+        client.delete(f"/api/nutrition/food-log/{ids[2]}", headers=auth_headers)
+        client.post(
+            "/api/nutrition/food-log/bulk-delete",
+            headers=auth_headers,
+            json={"ids": [ids[3]]},
+        )
+        new_id = self._log(client, auth_headers, "E")
+
+        delta = self._sync(client, auth_headers, data["next_token"]).json()
+        assert sorted(c["id"] for c in delta["changes"]) == [ids[1], new_id]
+        assert sorted(delta["deleted_ids"]) == [ids[2], ids[3]]
+
+        idle = self._sync(client, auth_headers, delta["next_token"]).json()
+        assert idle["changes"] == [] and idle["deleted_ids"] == []
+
+    def test_pages(self, client, auth_headers):
+        """Test a full sync is paged with has_more"""
+        ids = [self._log(client, auth_headers, name) for name in "ABCDE"]
+        seen, token = [], None
+        while True:
+            data = self._sync(client, auth_headers, token, limit=2).json()
+            seen += [c["id"] for c in data["changes"]]
+            token = data["next_token"]
+            if not data["has_more"]:
+                break
+        assert seen == ids
+
+    def test_unsettled_rows_wait(self, client, auth_headers, monkeypatch):
+        """Test rows inside the settle window are left for a later sync"""
+        monkeypatch.setattr(settings, "SYNC_SETTLE_SECONDS", 60)
+        self._log(client, auth_headers, "A")
+        data = client.get("/api/nutrition/sync", headers=auth_headers).json()
+        assert data["changes"] == []
+
+    def test_invalid_and_expired_tokens(self, client, auth_headers):
+        """Test malformed tokens are rejected and old ones need a full sync"""
+        response = client.get(
+            "/api/nutrition/sync", headers=auth_headers, params={"since": "nope"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        old = datetime(2020, 1, 1)
+        response = client.get(
+            "/api/nutrition/sync",
+            headers=auth_headers,
+            params={"since": encode_sync_token((old, 1), (old, 1))},
+        )
+        assert response.status_code == status.HTTP_410_GONE
@@ -1,6 +1,9 @@
 """Tests for profile endpoints"""
 
 from fastapi import status
+from sqlalchemy import event, update
+from app.models.user import User
+from app.services.user_service import data_version_cache, user_cache
 
 
 class TestGetProfile:
@@ -55,3 +58,121 @@ class TestUpdateProfile:
         """Test profile update without authentication"""
         response = client.put("/api/profile", json={"name": "Should Fail"})
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestUserCache:
+    """Test the authenticated-user identity cache"""
+
+    def test_hot_user_skips_database(self, client, auth_headers, db):
+        """Test repeated authenticated requests are served from the cache"""
+        client.get("/api/profile", headers=auth_headers)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            response = client.get("/api/profile", headers=auth_headers)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert statements == []
+        assert user_cache.stats()["hits"] >= 1
+
+    def test_profile_update_invalidates_cache(self, client, auth_headers):
+        """Test a profile update is visible on the next read"""
+        client.get("/api/profile", headers=auth_headers)
+        client.put("/api/profile", headers=auth_headers, json={"name": "Renamed"})
+
+        response = client.get("/api/profile", headers=auth_headers)
+        assert response.json()["name"] == "Renamed"
+
+    def test_cache_counters_exposed(self, client, auth_headers):
+        """Test hit/miss counters are reported at /metrics"""
+        client.get("/api/profile", headers=auth_headers)
+        client.get("/api/profile", headers=auth_headers)
+
+        data = client.get("/metrics").json()["user_cache"]
+        assert data["misses"] >= 1
+        assert data["hits"] >= 1
+
+
+class TestProfileETag:
+    """Test conditional GETs of the profile"""
+
+    def test_not_modified_until_update(self, client, auth_headers):
+        """Test If-None-Match answers 304 until the profile changes"""
+        etag = client.get("/api/profile", headers=auth_headers).headers["ETag"]
+
+        response = client.get(
+            "/api/profile", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+        client.put("/api/profile", headers=auth_headers, json={"name": "Renamed"})
+        response = client.get(
+            "/api/profile", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert response.json()["name"] == "Renamed"
+
+    def test_stale_identity_not_served_under_new_etag(
+        self, client, auth_headers, db, test_user
+    ):
+        """Test a cached identity older than the data version is reloaded"""
+        client.get("/api/profile", headers=auth_headers)
+        # Simulate an update committed by another worker
+        db.execute(
+            update(User)
+            .where(User.id == test_user.id)
+            .values(name="Elsewhere", data_version=User.data_version + 1)
+        )
+        db.commit()
+        data_version_cache.clear()
+
+        response = client.get("/api/profile", headers=auth_headers)
+        assert response.json()["name"] == "Elsewhere"
+
+
+class TestNutritionTargets:
+    """Test calorie and macro targets derived from the profile"""
+
+    def test_targets_from_profile(self, client, auth_headers):
+        """Test Mifflin-St Jeor targets for the test user's profile"""
+        response = client.get("/api/profile/targets", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "bmr": "1648.75",
+            "calories": "2555.56",
+            "protein_g": "112.00",
+            "carbs_g": "335.22",
+            "fats_g": "85.19",
+        }
+
+    def test_profile_update_invalidates_targets(self, client, auth_headers):
+        """Test targets follow a profile update"""
+        client.get("/api/profile/targets", headers=auth_headers)
+        client.put("/api/profile", headers=auth_headers, json={"weight_kg": 80})
+        data = client.get("/api/profile/targets", headers=auth_headers).json()
+        assert data["bmr"] == "1748.75"
+        assert data["protein_g"] == "128.00"
+
+    def test_incomplete_profile(self, client):
+        """Test users without age, height or weight get no targets"""
+        client.post(
+            "/api/auth/register",
+            json={"email": "other@example.com", "password": "password123"},
+        )
+        token = client.post(
+            "/api/auth/login",
+            data={"username": "other@example.com", "password": "password123"},
+        ).json()["access_token"]
+        response = client.get(
+            "/api/profile/targets", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
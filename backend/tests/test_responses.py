@@ -0,0 +1,150 @@
+"""Compatibility tests for the orjson response class"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List, Optional
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, TypeAdapter
+from app.main import app
+from app.routes import auth, nutrition, profile
+from app.schemas.food_log import DailySummaryResponse, FoodLogResponse
+from app.schemas.user import UserResponse
+from app.utils.responses import ORJSONResponse
+
+
+class Sample(BaseModel):
+    """Model covering the value types used by the API's responses"""
+
+    amount: Decimal
+    optional_amount: Optional[Decimal] = None
+    at: datetime
+    day: date
+    tags: List[str] = []
+
+
+@pytest.mark.parametrize(
+    "sample",
+    [
+        Sample(amount=Decimal("95.50"), at=datetime(2026, 1, 25, 12), day=date.today()),
+        Sample(
+            amount=Decimal("0.00"),
+            optional_amount=Decimal("1E+2"),
+            at=datetime(2026, 1, 25, 12, 30, 15, 123456),
+            day=date(2026, 1, 1),
+            tags=["ünïcode", 'quo"te'],
+        ),
+        Sample(
+            amount=Decimal("-3.1"),
+            at=datetime(2026, 1, 25, 12, tzinfo=timezone.utc),
+            day=date(2026, 1, 1),
+        ),
+        Sample(
+            amount=Decimal("7"),
+            at=datetime(
+                2026, 1, 25, 12, tzinfo=timezone(timedelta(hours=5, minutes=30))
+            ),
+            day=date(2026, 1, 1),
+        ),
+    ],
+)
+def test_matches_pydantic_encoding(sample):
+    """Test raw Decimal/datetime values encode exactly as pydantic does"""
+    assert ORJSONResponse(sample.model_dump()).body == sample.model_dump_json().encode()
+
+
+def test_matches_json_ready_content():
+    """Test content already dumped in JSON mode (FastAPI's path) is unchanged"""
+    row = FoodLogResponse(
+        id=1,
+        user_id=1,
+        food_name="Apple",
+        calories=Decimal("95.50"),
+        logged_at=datetime(2026, 1, 25, 12, tzinfo=timezone.utc),
+        created_at=datetime(2026, 1, 25, 12),
+        updated_at=datetime(2026, 1, 25, 12),
+    )
+    adapter = TypeAdapter(List[FoodLogResponse])
+    content = adapter.dump_python([row] * 3, mode="json")
+    assert ORJSONResponse(content).body == adapter.dump_json([row] * 3)
+
+
+def test_rejects_unknown_types():
+    """Test unsupported values fail loudly instead of being stringified"""
+    with pytest.raises(TypeError):
+        ORJSONResponse({"value": object()})
+
+
+class TestAppCompatibility:
+    """Test endpoints answer identical bytes with ORJSONResponse as the default"""
+
+    @pytest.fixture
+    def orjson_client(self, client):
+        """Same routers and dependency overrides, orjson as the default class"""
+        orjson_app = FastAPI(default_response_class=ORJSONResponse)
+        for module in (auth, profile, nutrition):
+            orjson_app.include_router(module.router)
+        orjson_app.dependency_overrides = app.dependency_overrides
+        with TestClient(orjson_app) as test_client:
+            yield test_client
+
+    def test_endpoints_match(self, client, orjson_client, auth_headers):
+        """Test profile, food log and summary payloads are byte-identical"""
+        food_log_id = client.post(
+            "/api/nutrition/food-log",
+            headers=auth_headers,
+            json={
+                "food_name": "Apple",
+                "calories": 95.5,
+                "protein_g": 0.5,
+                "logged_at": "2026-01-25T12:00:00.250000",
+            },
+        ).json()["id"]
+
+        for url in [
+            "/api/profile",
+            "/api/auth/me",
+            "/api/nutrition/food-log",
+            f"/api/nutrition/food-log/{food_log_id}",
+            "/api/nutrition/daily-summary?date=2026-01-25",
+            "/api/nutrition/summary?start=2026-01-20&end=2026-01-26&bucket=day",
+        ]:
+            expected = client.get(url, headers=auth_headers)
+            actual = orjson_client.get(url, headers=auth_headers)
+            assert actual.status_code == expected.status_code == 200, url
+            assert actual.content == expected.content, url
+
+    def test_error_bodies_match(self, client, orjson_client, auth_headers):
+        """Test error payloads are unchanged"""
+        for url in ["/api/nutrition/food-log/999", "/api/nutrition/food-log?cursor=x"]:
+            expected = client.get(url, headers=auth_headers)
+            actual = orjson_client.get(url, headers=auth_headers)
+            assert actual.status_code == expected.status_code
+            assert actual.json() == expected.json()
+
+    def test_models_used_by_the_api(self):
+        """Test summary and user models encode like pydantic"""
+        summary = DailySummaryResponse(
+            date="2026-01-25",
+            total_calories=Decimal("200.00"),
+            total_protein_g=Decimal("1.80"),
+            total_carbs_g=Decimal("52.00"),
+            total_fats_g=Decimal("0.70"),
+            entries_count=2,
+        )
+        user = UserResponse(
+            id=1,
+            email="test@example.com",
+            name="Test",
+            gender="male",
+            height_cm=Decimal("175.00"),
+            activity_level="medium",
+            created_at=datetime(2026, 1, 25, tzinfo=timezone.utc),
+            updated_at=datetime(2026, 1, 25, tzinfo=timezone.utc),
+        )
+        for model in (summary, user):
+            assert (
+                ORJSONResponse(model.model_dump()).body
+                == model.model_dump_json().encode()
+            )
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { getDailySummary } from '../services/nutritionService';
+import { getDashboard } from '../services/nutritionService';
 
 const DashboardPage = () => {
   const [summary, setSummary] = useState(null);
@@ -12,8 +12,8 @@ const DashboardPage = () => {
   const fetchSummary = async () => {
     try {
       const today = new Date().toISOString().split('T')[0];
-      const data = await getDailySummary(today);
-      setSummary(data);
+      const data = await getDashboard(today);
+      setSummary(data.today);
     } catch (error) {
       console.error('Failed to fetch summary:', error);
     } finally {
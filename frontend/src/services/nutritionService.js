@@ -30,3 +30,10 @@ export const getDailySummary = async (date) => {
   });
   return response.data;
 };
+
+export const getDashboard = async (date) => {
+  const response = await api.get('/api/dashboard', {
+    params: { date },
+  });
+  return response.data;
+};